@@ -0,0 +1,142 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+
+from human_evaluation_tool.analytics import MarkingFrame, compute_breakdowns
+from human_evaluation_tool.scoring import DEFAULT_SEVERITY_WEIGHTS
+from human_evaluation_tool.utils import CATEGORY_NAME
+
+
+# Benchmark the vectorised MQM pivots against a loop over marking rows:
+#
+#     poetry run python benchmarks/mqm_breakdowns.py --markings 1000000
+#
+# Both sides start from markings already in memory, so the numbers compare the
+# aggregation alone.
+
+
+def _synthetic_frame(
+    markings: int, systems: int, documents: int, annotators: int, seed: int
+) -> MarkingFrame:
+    rng = np.random.default_rng(seed)
+    categories = tuple(sorted(code for code in CATEGORY_NAME if code != "000"))
+    severities = ("critical", "major", "minor", "not-judgeable")
+    return MarkingFrame(
+        systems=tuple(f"System {index}" for index in range(systems)),
+        documents=tuple(f"Document {index}" for index in range(documents)),
+        annotators=tuple(f"rater{index}@example.com" for index in range(annotators)),
+        categories=categories,
+        severities=severities,
+        system=rng.integers(0, systems, markings),
+        document=rng.integers(0, documents, markings),
+        annotator=rng.integers(0, annotators, markings),
+        category=rng.integers(0, len(categories), markings),
+        severity=rng.integers(0, len(severities), markings),
+        segments=rng.integers(1, 50, (systems, documents, annotators)),
+    )
+
+
+def _naive_breakdowns(
+    rows: list[tuple[int, int, int, int, int]], frame: MarkingFrame
+) -> dict[str, Any]:
+    weights = [DEFAULT_SEVERITY_WEIGHTS[name] for name in frame.severities]
+    cube: defaultdict[tuple[int, int, int], list[float]] = defaultdict(lambda: [0, 0.0])
+    annotator_system: defaultdict[tuple[int, int], list[float]] = defaultdict(
+        lambda: [0, 0.0]
+    )
+    document_system: defaultdict[tuple[int, int], list[float]] = defaultdict(
+        lambda: [0, 0.0]
+    )
+    for system, document, annotator, category, severity in rows:
+        penalty = weights[severity]
+        for cell in (
+            cube[system, category, severity],
+            annotator_system[annotator, system],
+            document_system[document, system],
+        ):
+            cell[0] += 1
+            cell[1] += penalty
+    return {
+        "cube": cube,
+        "annotatorSystem": annotator_system,
+        "documentSystem": document_system,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the vectorised MQM breakdowns against a loop."
+    )
+    parser.add_argument("--markings", type=int, default=1_000_000)
+    parser.add_argument("--systems", type=int, default=8)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--annotators", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frame = _synthetic_frame(
+        args.markings, args.systems, args.documents, args.annotators, args.seed
+    )
+    rows = list(
+        zip(
+            frame.system.tolist(),
+            frame.document.tolist(),
+            frame.annotator.tolist(),
+            frame.category.tolist(),
+            frame.severity.tolist(),
+        )
+    )
+
+    timings: dict[str, list[float]] = {"loop": [], "numpy": []}
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        naive = _naive_breakdowns(rows, frame)
+        timings["loop"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        vectorised = compute_breakdowns(frame)
+        timings["numpy"].append(time.perf_counter() - started)
+
+    errors = vectorised["systemCategorySeverity"]["errors"]
+    for (system, category, severity), (count, _) in naive["cube"].items():
+        assert errors[system][category][severity] == count
+    penalties = vectorised["annotatorSystem"]["penalty"]
+    for (annotator, system), (_, penalty) in naive["annotatorSystem"].items():
+        assert abs(penalties[annotator][system] - penalty) < 1e-6 * max(1, penalty)
+
+    baseline = min(timings["loop"])
+    print(f"{'engine':>6}  {'best [s]':>9}  {'speedup':>7}")
+    for engine, values in timings.items():
+        best = min(values)
+        print(f"{engine:>6}  {best:>9.3f}  {baseline / best:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
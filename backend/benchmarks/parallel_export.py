@@ -0,0 +1,105 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from human_evaluation_tool.export import ResultRecord, render_results
+from human_evaluation_tool.utils import CATEGORY_NAME, SEVERITY_NAME
+
+
+# Benchmark the process-pool export renderer against the serial path:
+#
+#     poetry run python benchmarks/parallel_export.py --records 200000
+#
+# Synthetic records are rendered in memory, so the numbers isolate the CPU-bound
+# highlighting and lookup work from the database round trip.
+
+
+def _synthetic_records(count: int, seed: int) -> list[ResultRecord]:
+    rng = random.Random(seed)
+    categories = list(CATEGORY_NAME)
+    severities = list(SEVERITY_NAME)
+    words = [f"word{index}" for index in range(500)]
+    records: list[ResultRecord] = []
+    annotation_id = 0
+    while len(records) < count:
+        annotation_id += 1
+        source = " ".join(rng.choices(words, k=rng.randint(10, 40)))
+        translation = " ".join(rng.choices(words, k=rng.randint(10, 40)))
+        for _ in range(rng.randint(1, 6)):
+            is_source = rng.random() < 0.3
+            length = len((source if is_source else translation).split(" "))
+            start = rng.randrange(length)
+            records.append(
+                ResultRecord(
+                    annotationId=annotation_id,
+                    markingId=len(records) + 1,
+                    systemName=f"System {annotation_id % 3}",
+                    documentName=f"Document {annotation_id // 100}",
+                    bitextId=annotation_id,
+                    source=source,
+                    email=f"rater{annotation_id % 7}@example.com",
+                    translation=translation,
+                    comment=None,
+                    errorStart=start,
+                    errorEnd=rng.randrange(start, length),
+                    errorCategory=rng.choice(categories),
+                    errorSeverity=rng.choice(severities),
+                    isSource=is_source,
+                )
+            )
+    return records[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the parallel evaluation export renderer."
+    )
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    records = _synthetic_records(args.records, args.seed)
+    baseline: float | None = None
+    expected: list[str] | None = None
+    print(f"{'workers':>7}  {'best [s]':>9}  {'speedup':>7}")
+    for workers in args.workers:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            rows = render_results(records, workers)
+            timings.append(time.perf_counter() - started)
+        if expected is None:
+            expected = rows
+        assert rows == expected, "parallel output differs from the serial output"
+        best = min(timings)
+        baseline = baseline or best
+        print(f"{workers:>7}  {best:>9.3f}  {baseline / best:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
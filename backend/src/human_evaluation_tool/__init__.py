@@ -113,6 +113,16 @@ def create_app(config_override: Mapping[str, Any] | None = None) -> Flask:
     app.config["JWT_SECRET_KEY"] = secret_key
     app.config["JSON_SORT_KEYS"] = False
 
+    from .scoring import severity_weights
+
+    weights = app.config.get("MQM_SEVERITY_WEIGHTS") or {}
+    try:
+        if not isinstance(weights, Mapping):
+            raise ValueError("expected an object of severity weights")
+        severity_weights(weights)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid MQM_SEVERITY_WEIGHTS: {exc}") from exc
+
     explicit_uri_override = "SQLALCHEMY_DATABASE_URI" in override_config
 
     if not explicit_uri_override:
@@ -127,11 +137,16 @@ def create_app(config_override: Mapping[str, Any] | None = None) -> Flask:
     jwt_manager.init_app(app)
     migrate.init_app(app, db)
 
-    from . import auth
+    from . import auth, cli
     from .resources import register_resources
+    from .summaries import register_summary_listener
+    from .tombstones import register_tombstone_listener
 
     auth.register_auth_blueprint(app)
     register_resources(app)
+    cli.register_cli(app)
+    register_tombstone_listener()
+    register_summary_listener()
 
     _maybe_seed_sqlite_sample_data(app)
 
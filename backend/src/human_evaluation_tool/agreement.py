@@ -0,0 +1,413 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import and_, select
+
+from . import db
+from .cache import VersionedCache, evaluation_version
+from .models import Annotation, AnnotationSystem, Bitext, Marking, User
+from .scoring import NO_ERROR_CATEGORY
+from .tokens import token_index
+from .utils import rater_name
+
+
+class AgreementFrame(NamedTuple):
+    """Judgments and markings of an evaluation as NumPy arrays.
+
+    A judgment is one annotator's pass over one unit, a (bitext, system)
+    pair. Judgments are sorted by unit and then annotator; markings point at
+    their judgment by index.
+    """
+
+    annotators: tuple[str, ...]
+    categories: tuple[str, ...]
+    severities: tuple[str, ...]
+    unit: npt.NDArray[np.intp]
+    annotator: npt.NDArray[np.intp]
+    source_length: npt.NDArray[np.int64]
+    target_length: npt.NDArray[np.int64]
+    judgment: npt.NDArray[np.intp]
+    is_source: npt.NDArray[np.bool_]
+    start: npt.NDArray[np.int64]
+    end: npt.NDArray[np.int64]
+    category: npt.NDArray[np.intp]
+    severity: npt.NDArray[np.intp]
+
+
+agreement_cache: VersionedCache[dict[str, Any]] = VersionedCache(maxsize=8)
+
+
+def _unit_keys(bitexts: Any, systems: Any, width: int) -> npt.NDArray[np.int64]:
+    return np.asarray(bitexts, dtype=np.int64) * width + np.asarray(
+        systems, dtype=np.int64
+    )
+
+
+def load_agreement_frame(evaluation_id: int) -> AgreementFrame:
+    """Load the judgments and scored markings of an evaluation."""
+
+    judgment_rows = db.session.execute(
+        select(
+            Annotation.bitextId,
+            AnnotationSystem.systemId,
+            Annotation.userId,
+            User.email,
+            Bitext.source,
+            AnnotationSystem.translation,
+        )
+        .select_from(AnnotationSystem)
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(User, User.id == Annotation.userId)
+        .where(Annotation.evaluationId == evaluation_id)
+        .order_by(
+            Annotation.bitextId,
+            AnnotationSystem.systemId,
+            Annotation.userId,
+            AnnotationSystem.id,
+        )
+    ).all()
+
+    # Keep one judgment per (unit, annotator); token lengths come from the
+    # first judgment of a unit so every annotator is compared on one grid.
+    keys: list[tuple[int, int, int]] = []
+    lengths: list[tuple[int, int]] = []
+    emails: dict[int, str] = {}
+    for bitext_id, system_id, user_id, email, source, translation in judgment_rows:
+        key = (bitext_id, system_id, user_id)
+        if keys and keys[-1] == key:
+            continue
+        if not keys or keys[-1][:2] != key[:2]:
+            unit_length = (
+                len(token_index(source)),
+                len(token_index(translation or "")),
+            )
+        keys.append(key)
+        lengths.append(unit_length)
+        emails[user_id] = email
+
+    user_ids = np.array(sorted(emails), dtype=np.int64)
+    judgments = np.array(keys, dtype=np.int64).reshape(-1, 3)
+    width = int(judgments[:, 1].max(initial=0)) + 1
+    unit_keys = _unit_keys(judgments[:, 0], judgments[:, 1], width)
+    _, unit = np.unique(unit_keys, return_inverse=True)
+    annotator = np.searchsorted(user_ids, judgments[:, 2])
+    judgment_keys = unit.astype(np.int64) * max(1, len(user_ids)) + annotator
+    sizes = np.array(lengths, dtype=np.int64).reshape(-1, 2)
+
+    marking_rows = db.session.execute(
+        select(
+            Annotation.bitextId,
+            Marking.systemId,
+            Annotation.userId,
+            Marking.isSource,
+            Marking.errorStart,
+            Marking.errorEnd,
+            Marking.errorCategory,
+            Marking.errorSeverity,
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .where(
+            Annotation.evaluationId == evaluation_id,
+            Marking.errorCategory != NO_ERROR_CATEGORY,
+            Marking.errorSeverity != "no-error",
+        )
+    ).all()
+    columns = list(zip(*marking_rows)) or [()] * 8
+    marking_units = np.searchsorted(
+        np.unique(unit_keys), _unit_keys(columns[0], columns[1], width)
+    )
+    marking_annotators = np.searchsorted(
+        user_ids, np.asarray(columns[2], dtype=np.int64)
+    )
+    judgment = np.searchsorted(
+        judgment_keys,
+        marking_units.astype(np.int64) * max(1, len(user_ids)) + marking_annotators,
+    )
+    categories, category = np.unique(
+        np.asarray(columns[6], dtype=str), return_inverse=True
+    )
+    severities, severity = np.unique(
+        np.asarray(columns[7], dtype=str), return_inverse=True
+    )
+    return AgreementFrame(
+        annotators=tuple(rater_name(emails[int(user_id)]) for user_id in user_ids),
+        categories=tuple(categories.tolist()),
+        severities=tuple(severities.tolist()),
+        unit=unit.astype(np.intp),
+        annotator=annotator.astype(np.intp),
+        source_length=sizes[:, 0],
+        target_length=sizes[:, 1],
+        judgment=judgment.astype(np.intp),
+        is_source=np.asarray(columns[3], dtype=np.bool_),
+        start=np.asarray(columns[4], dtype=np.int64),
+        end=np.asarray(columns[5], dtype=np.int64),
+        category=category.astype(np.intp),
+        severity=severity.astype(np.intp),
+    )
+
+
+def _ramp(lengths: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    starts = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(starts, lengths)
+
+
+def _run_pairs(
+    same: Any, size: int
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    # Pairs (i, i + d) of a sorted array whose keys match; runs are
+    # contiguous, so no pair exists at distance d + 1 once d finds none.
+    firsts: list[npt.NDArray[np.intp]] = []
+    seconds: list[npt.NDArray[np.intp]] = []
+    distance = 1
+    while distance < size:
+        matches = np.flatnonzero(same(distance))
+        if not len(matches):
+            break
+        firsts.append(matches)
+        seconds.append(matches + distance)
+        distance += 1
+    if not firsts:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def _ratio(numerator: float, denominator: float) -> float | None:
+    return float(numerator / denominator) if denominator else None
+
+
+def _kappa(observed: float, expected: float) -> float | None:
+    if expected >= 1:
+        return None
+    return float((observed - expected) / (1 - expected))
+
+
+def _label_agreement(
+    first: npt.NDArray[np.intp], second: npt.NDArray[np.intp], labels: int
+) -> dict[str, Any]:
+    pairs = len(first)
+    if not pairs:
+        return {"matchedSpans": 0, "agreement": None, "kappa": None}
+    observed = float(np.mean(first == second))
+    shares = np.bincount(np.concatenate([first, second]), minlength=labels) / (
+        2 * pairs
+    )
+    return {
+        "matchedSpans": pairs,
+        "agreement": observed,
+        "kappa": _kappa(observed, float(np.sum(shares**2))),
+    }
+
+
+def compute_agreement(frame: AgreementFrame) -> dict[str, Any]:
+    """Return span, token, severity and category agreement of a frame.
+
+    Only units judged by at least two annotators contribute. Spans match when
+    side, start and end are equal; they are found by sorting rather than by
+    comparing every pair of markings. Token labels (error or not) are built
+    with difference arrays over each judgment's source and target tokens.
+    """
+
+    judgments = len(frame.unit)
+    annotators = len(frame.annotators)
+    first, second = _run_pairs(lambda d: frame.unit[d:] == frame.unit[:-d], judgments)
+    pair_codes, pair_index = np.unique(
+        frame.annotator[first] * annotators + frame.annotator[second],
+        return_inverse=True,
+    )
+    pair_count = len(pair_codes)
+
+    def per_pair(values: Any) -> npt.NDArray[Any]:
+        return np.bincount(pair_index, weights=values, minlength=pair_count)
+
+    # Token labels: one flat array holding every judgment's source and target.
+    lengths = frame.source_length + frame.target_length
+    base = np.cumsum(lengths) - lengths
+    judgment = frame.judgment
+    side_length = np.where(
+        frame.is_source, frame.source_length[judgment], frame.target_length[judgment]
+    )
+    end = np.minimum(frame.end, side_length - 1)
+    valid = (frame.start >= 0) & (frame.start <= end)
+    offset = base[judgment] + np.where(
+        frame.is_source, 0, frame.source_length[judgment]
+    )
+    total = int(lengths.sum())
+    diff = np.bincount(
+        (offset + frame.start)[valid], minlength=total + 1
+    ) - np.bincount((offset + end + 1)[valid], minlength=total + 1)
+    errors = np.cumsum(diff[:total]) > 0
+
+    # Cohen's kappa per annotator pair over the tokens of their shared units.
+    pair_lengths = lengths[first]
+    ramp = _ramp(pair_lengths)
+    both = (
+        errors[np.repeat(base[first], pair_lengths) + ramp]
+        & errors[np.repeat(base[second], pair_lengths) + ramp]
+    )
+    shared_errors = np.bincount(
+        np.repeat(np.arange(len(first)), pair_lengths),
+        weights=both,
+        minlength=len(first),
+    )
+    judgment_errors = np.bincount(
+        np.repeat(np.arange(judgments), lengths), weights=errors, minlength=judgments
+    )
+    tokens = per_pair(pair_lengths)
+    n11 = per_pair(shared_errors)
+    n1_ = per_pair(judgment_errors[first])
+    n_1 = per_pair(judgment_errors[second])
+
+    # Fleiss' kappa over every token rated by two or more annotators.
+    in_pair = np.zeros(judgments, dtype=np.bool_)
+    in_pair[first] = in_pair[second] = True
+    unit_lengths = np.zeros(int(frame.unit.max(initial=-1)) + 1, dtype=np.int64)
+    unit_lengths[frame.unit] = lengths
+    unit_base = np.cumsum(unit_lengths) - unit_lengths
+    rated = np.repeat(in_pair, lengths)
+    items = (np.repeat(unit_base[frame.unit], lengths) + _ramp(lengths))[rated]
+    item_count = int(unit_lengths.sum())
+    raters = np.bincount(items, minlength=item_count)
+    positive = np.bincount(items, weights=errors[rated], minlength=item_count)
+    scored = raters >= 2
+    raters, positive = raters[scored], positive[scored]
+    fleiss = None
+    if len(raters):
+        negative = raters - positive
+        observed = np.mean(
+            (positive * (positive - 1) + negative * (negative - 1))
+            / (raters * (raters - 1))
+        )
+        share = positive.sum() / raters.sum()
+        fleiss = _kappa(float(observed), float(share**2 + (1 - share) ** 2))
+
+    # Exact span matches: dedupe each judgment's spans, then sort by position.
+    spans = np.column_stack([judgment, frame.is_source, frame.start, end])[valid]
+    spans, kept = np.unique(spans.reshape(-1, 4), axis=0, return_index=True)
+    span_judgment = spans[:, 0]
+    span_unit = frame.unit[span_judgment]
+    order = np.lexsort(
+        (
+            frame.annotator[span_judgment],
+            spans[:, 3],
+            spans[:, 2],
+            spans[:, 1],
+            span_unit,
+        )
+    )
+    position = np.column_stack([span_unit, spans[:, 1:]])[order]
+    match_first, match_second = _run_pairs(
+        lambda d: (position[d:] == position[:-d]).all(axis=1), len(position)
+    )
+    match_annotators = frame.annotator[span_judgment[order]]
+    match_pairs = np.searchsorted(
+        pair_codes,
+        match_annotators[match_first] * annotators + match_annotators[match_second],
+    )
+    matches = np.bincount(match_pairs, minlength=pair_count)
+    judgment_spans = np.bincount(span_judgment, minlength=judgments)
+    spans_first = per_pair(judgment_spans[first])
+    spans_second = per_pair(judgment_spans[second])
+    kept_order = np.flatnonzero(valid)[kept][order]
+
+    shared_units = np.bincount(pair_index, minlength=pair_count)
+    pairs = []
+    cohen: list[float] = []
+    for index, code in enumerate(pair_codes.tolist()):
+        count = tokens[index]
+        kappa = None
+        if count:
+            p1, p2 = n1_[index] / count, n_1[index] / count
+            agree = (count - n1_[index] - n_1[index] + 2 * n11[index]) / count
+            kappa = _kappa(agree, p1 * p2 + (1 - p1) * (1 - p2))
+        if kappa is not None:
+            cohen.append(kappa)
+        pairs.append(
+            {
+                "annotators": [
+                    frame.annotators[code // annotators],
+                    frame.annotators[code % annotators],
+                ],
+                "units": int(shared_units[index]),
+                "spans": [int(spans_first[index]), int(spans_second[index])],
+                "matches": int(matches[index]),
+                "precision": _ratio(matches[index], spans_second[index]),
+                "recall": _ratio(matches[index], spans_first[index]),
+                "f1": _ratio(
+                    2 * matches[index], spans_first[index] + spans_second[index]
+                ),
+                "tokens": int(count),
+                "cohenKappa": kappa,
+            }
+        )
+
+    matched_first = kept_order[match_first]
+    matched_second = kept_order[match_second]
+    return {
+        "annotators": list(frame.annotators),
+        "units": int(np.unique(frame.unit[first]).size),
+        "spans": {
+            "matches": int(matches.sum()),
+            "f1": _ratio(2 * matches.sum(), spans_first.sum() + spans_second.sum()),
+        },
+        "tokens": {
+            "items": int(scored.sum()),
+            "fleissKappa": fleiss,
+            "meanCohenKappa": float(np.mean(cohen)) if cohen else None,
+        },
+        "severity": _label_agreement(
+            frame.severity[matched_first],
+            frame.severity[matched_second],
+            len(frame.severities),
+        ),
+        "category": _label_agreement(
+            frame.category[matched_first],
+            frame.category[matched_second],
+            len(frame.categories),
+        ),
+        "pairs": pairs,
+    }
+
+
+def evaluation_agreement(evaluation_id: int) -> dict[str, Any]:
+    """Return :func:`compute_agreement`, recomputing only when markings change."""
+
+    version = evaluation_version(evaluation_id)
+    agreement = agreement_cache.get((evaluation_id,), version)
+    if agreement is None:
+        agreement = compute_agreement(load_agreement_frame(evaluation_id))
+        agreement_cache.set((evaluation_id,), version, agreement)
+    return agreement
@@ -0,0 +1,443 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final, Mapping, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import and_, func, select
+
+from . import db
+from .cache import VersionedCache, evaluation_version
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Document,
+    Marking,
+    System,
+    User,
+)
+from .scoring import NO_ERROR_CATEGORY, severity_weights
+from .tokens import token_index
+from .utils import CATEGORY_NAME, SEVERITY_NAME, rater_name
+
+
+DEFAULT_POSITION_BINS: Final[int] = 10
+MAX_POSITION_BINS: Final[int] = 100
+# Spans of this many tokens or more share the last span-length bucket.
+SPAN_LENGTH_LIMIT: Final[int] = 20
+SIDES: Final[tuple[str, str]] = ("source", "target")
+
+
+class MarkingFrame(NamedTuple):
+    """Markings of an evaluation as integer codes into the label tuples.
+
+    ``segments[s, d, a]`` counts the annotation system rows of system ``s`` in
+    document ``d`` judged by annotator ``a``.
+    """
+
+    systems: tuple[str, ...]
+    documents: tuple[str, ...]
+    annotators: tuple[str, ...]
+    categories: tuple[str, ...]
+    severities: tuple[str, ...]
+    system: npt.NDArray[np.intp]
+    document: npt.NDArray[np.intp]
+    annotator: npt.NDArray[np.intp]
+    category: npt.NDArray[np.intp]
+    severity: npt.NDArray[np.intp]
+    segments: npt.NDArray[np.int64]
+
+
+class PositionFrame(NamedTuple):
+    """Marked spans of an evaluation with the token length of their segment.
+
+    ``length`` is the token count of the source or of the system translation,
+    whichever side the span was marked on.
+    """
+
+    systems: tuple[str, ...]
+    categories: tuple[str, ...]
+    system: npt.NDArray[np.intp]
+    category: npt.NDArray[np.intp]
+    is_source: npt.NDArray[np.bool_]
+    start: npt.NDArray[np.int64]
+    end: npt.NDArray[np.int64]
+    length: npt.NDArray[np.int64]
+
+
+# Frames keyed by evaluation id; weights are applied per request.
+frame_cache: VersionedCache[MarkingFrame] = VersionedCache(maxsize=4)
+# Position results keyed by evaluation id and bin count.
+position_cache: VersionedCache[dict[str, Any]] = VersionedCache(maxsize=8)
+
+
+def _labels(
+    rows: Sequence[Any], id_index: int
+) -> tuple[npt.NDArray[np.int64], tuple[str, ...]]:
+    names = {row[id_index]: row[id_index + 1] for row in rows}
+    ids = np.array(sorted(names), dtype=np.int64)
+    return ids, tuple(names[int(row_id)] for row_id in ids)
+
+
+def _codes(ids: npt.NDArray[np.int64], values: Any) -> npt.NDArray[np.intp]:
+    return np.searchsorted(ids, np.asarray(values, dtype=np.int64)).astype(np.intp)
+
+
+def load_marking_frame(evaluation_id: int) -> MarkingFrame:
+    """Load the scored markings and segment counts of an evaluation."""
+
+    segment_rows = db.session.execute(
+        select(
+            AnnotationSystem.systemId,
+            System.name,
+            Bitext.documentId,
+            Document.name,
+            Annotation.userId,
+            User.email,
+            func.count(AnnotationSystem.id),
+        )
+        .select_from(AnnotationSystem)
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .join(System, System.id == AnnotationSystem.systemId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(Document, Document.id == Bitext.documentId)
+        .join(User, User.id == Annotation.userId)
+        .where(Annotation.evaluationId == evaluation_id)
+        .group_by(
+            AnnotationSystem.systemId,
+            System.name,
+            Bitext.documentId,
+            Document.name,
+            Annotation.userId,
+            User.email,
+        )
+    ).all()
+    system_ids, systems = _labels(segment_rows, 0)
+    document_ids, documents = _labels(segment_rows, 2)
+    annotator_ids, emails = _labels(segment_rows, 4)
+    annotators = tuple(rater_name(email) for email in emails)
+
+    segments = np.zeros((len(systems), len(documents), len(annotators)), np.int64)
+    if segment_rows:
+        columns = list(zip(*segment_rows))
+        np.add.at(
+            segments,
+            (
+                _codes(system_ids, columns[0]),
+                _codes(document_ids, columns[2]),
+                _codes(annotator_ids, columns[4]),
+            ),
+            np.asarray(columns[6], dtype=np.int64),
+        )
+
+    marking_rows = db.session.execute(
+        select(
+            Marking.systemId,
+            Bitext.documentId,
+            Annotation.userId,
+            Marking.errorCategory,
+            Marking.errorSeverity,
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(Document, Document.id == Bitext.documentId)
+        .join(User, User.id == Annotation.userId)
+        .where(
+            Annotation.evaluationId == evaluation_id,
+            Marking.errorCategory != NO_ERROR_CATEGORY,
+            Marking.errorSeverity != "no-error",
+        )
+    ).all()
+    columns = list(zip(*marking_rows)) or [()] * 5
+    categories, category = np.unique(
+        np.asarray(columns[3], dtype=str), return_inverse=True
+    )
+    severities, severity = np.unique(
+        np.asarray(columns[4], dtype=str), return_inverse=True
+    )
+    return MarkingFrame(
+        systems=systems,
+        documents=documents,
+        annotators=annotators,
+        categories=tuple(categories.tolist()),
+        severities=tuple(severities.tolist()),
+        system=_codes(system_ids, columns[0]),
+        document=_codes(document_ids, columns[1]),
+        annotator=_codes(annotator_ids, columns[2]),
+        category=category.astype(np.intp),
+        severity=severity.astype(np.intp),
+        segments=segments,
+    )
+
+
+def cached_marking_frame(evaluation_id: int) -> MarkingFrame:
+    """Return :func:`load_marking_frame`, reloading only when markings change."""
+
+    version = evaluation_version(evaluation_id)
+    frame = frame_cache.get((evaluation_id,), version)
+    if frame is None:
+        frame = load_marking_frame(evaluation_id)
+        frame_cache.set((evaluation_id,), version, frame)
+    return frame
+
+
+def pivot(
+    codes: tuple[npt.NDArray[np.intp], ...],
+    shape: tuple[int, ...],
+    weights: npt.NDArray[np.float64] | None = None,
+) -> npt.NDArray[Any]:
+    """Count (or sum ``weights``) per cell of the ``shape`` grid in one pass."""
+
+    size = int(np.prod(shape))
+    if size == 0:
+        return np.zeros(shape, dtype=np.int64 if weights is None else np.float64)
+    flat = np.ravel_multi_index(codes, shape)
+    return np.bincount(flat, weights=weights, minlength=size).reshape(shape)
+
+
+def _scores(
+    penalty: npt.NDArray[np.float64], segments: npt.NDArray[np.int64]
+) -> npt.NDArray[np.float64]:
+    return np.divide(penalty, segments, out=np.zeros_like(penalty), where=segments > 0)
+
+
+def _segment_pivot(
+    frame: MarkingFrame,
+    rows: npt.NDArray[np.intp],
+    segments: npt.NDArray[np.int64],
+    penalty: npt.NDArray[np.float64],
+) -> dict[str, Any]:
+    shape = segments.shape
+    errors = pivot((rows, frame.system), shape)
+    penalties = pivot((rows, frame.system), shape, penalty)
+    return {
+        "segments": segments.tolist(),
+        "errors": errors.tolist(),
+        "penalty": penalties.tolist(),
+        "score": _scores(penalties, segments).tolist(),
+    }
+
+
+def compute_breakdowns(
+    frame: MarkingFrame, weights: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """Return the multi-axis MQM pivots of a frame.
+
+    The pivots are system × category × severity, annotator × system and
+    document × system. Cells are nested lists indexed like the label lists,
+    and scores are penalty per segment as in :mod:`.scoring`.
+    """
+
+    weights = severity_weights(weights)
+    severity_weight = np.array(
+        [weights.get(name, 0.0) for name in frame.severities], dtype=np.float64
+    )
+    penalty = severity_weight[frame.severity]
+    system_category_severity = (frame.system, frame.category, frame.severity)
+    cube_shape = (len(frame.systems), len(frame.categories), len(frame.severities))
+
+    return {
+        "weights": weights,
+        "systems": list(frame.systems),
+        "documents": list(frame.documents),
+        "annotators": list(frame.annotators),
+        "categories": [
+            {"category": code, "name": CATEGORY_NAME.get(code, code)}
+            for code in frame.categories
+        ],
+        "severities": [SEVERITY_NAME.get(name, name) for name in frame.severities],
+        "systemCategorySeverity": {
+            "errors": pivot(system_category_severity, cube_shape).tolist(),
+            "penalty": pivot(system_category_severity, cube_shape, penalty).tolist(),
+        },
+        "annotatorSystem": _segment_pivot(
+            frame, frame.annotator, frame.segments.sum(axis=1).T, penalty
+        ),
+        "documentSystem": _segment_pivot(
+            frame, frame.document, frame.segments.sum(axis=2).T, penalty
+        ),
+    }
+
+
+def evaluation_breakdowns(
+    evaluation_id: int, weights: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """Return :func:`compute_breakdowns` for an evaluation's cached frame."""
+
+    return compute_breakdowns(cached_marking_frame(evaluation_id), weights)
+
+
+def load_position_frame(evaluation_id: int) -> PositionFrame:
+    """Load the scored markings of an evaluation with their segment lengths."""
+
+    judgment_rows = db.session.execute(
+        select(AnnotationSystem.id, Bitext.source, AnnotationSystem.translation)
+        .select_from(AnnotationSystem)
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .where(Annotation.evaluationId == evaluation_id)
+        .order_by(AnnotationSystem.id)
+    ).all()
+    judgment_ids = np.array([row[0] for row in judgment_rows], dtype=np.int64)
+    lengths = np.array(
+        [
+            (len(token_index(source)), len(token_index(translation or "")))
+            for _, source, translation in judgment_rows
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    marking_rows = db.session.execute(
+        select(
+            AnnotationSystem.id,
+            Marking.systemId,
+            System.name,
+            Marking.errorCategory,
+            Marking.isSource,
+            Marking.errorStart,
+            Marking.errorEnd,
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .join(System, System.id == Marking.systemId)
+        .where(
+            Annotation.evaluationId == evaluation_id,
+            Marking.errorCategory != NO_ERROR_CATEGORY,
+            Marking.errorSeverity != "no-error",
+        )
+    ).all()
+    system_ids, systems = _labels(marking_rows, 1)
+    columns = list(zip(*marking_rows)) or [()] * 7
+    categories, category = np.unique(
+        np.asarray(columns[3], dtype=str), return_inverse=True
+    )
+    is_source = np.asarray(columns[4], dtype=np.bool_)
+    judgment = _codes(judgment_ids, columns[0])
+    return PositionFrame(
+        systems=systems,
+        categories=tuple(categories.tolist()),
+        system=_codes(system_ids, columns[1]),
+        category=category.astype(np.intp),
+        is_source=is_source,
+        start=np.asarray(columns[5], dtype=np.int64),
+        end=np.asarray(columns[6], dtype=np.int64),
+        length=np.where(is_source, lengths[judgment, 0], lengths[judgment, 1]),
+    )
+
+
+def compute_positions(
+    frame: PositionFrame, bins: int = DEFAULT_POSITION_BINS
+) -> dict[str, Any]:
+    """Return error-position histograms and span-length distributions.
+
+    A span's position is the midpoint of its tokens divided by the segment
+    length, so 0 is the start and 1 the end of the sentence. Positions are
+    counted into ``bins`` equal-width bins per system or category and side.
+    Span lengths are in tokens, with longer spans clipped into the last of
+    :data:`SPAN_LENGTH_LIMIT` buckets. Spans outside their segment are only
+    counted as ``skipped``.
+    """
+
+    valid = (frame.start >= 0) & (frame.start <= frame.end) & (frame.end < frame.length)
+    system = frame.system[valid]
+    category = frame.category[valid]
+    side = (~frame.is_source[valid]).astype(np.intp)
+    start, end, length = frame.start[valid], frame.end[valid], frame.length[valid]
+
+    midpoint = (start + end + 1) / (2 * length)
+    position = np.minimum((midpoint * bins).astype(np.intp), bins - 1)
+    span = end - start + 1
+    span_bucket = (np.minimum(span, SPAN_LENGTH_LIMIT) - 1).astype(np.intp)
+
+    system_count, category_count = len(frame.systems), len(frame.categories)
+    positions = pivot(
+        (system, category, side, position), (system_count, category_count, 2, bins)
+    )
+    spans = pivot(
+        (system, category, span_bucket),
+        (system_count, category_count, SPAN_LENGTH_LIMIT),
+    )
+    span_total = pivot(
+        (system, category), (system_count, category_count), span.astype(np.float64)
+    )
+    span_count = spans.sum(axis=2)
+
+    def _mean(axis: int) -> list[float | None]:
+        totals, counts = span_total.sum(axis=axis), span_count.sum(axis=axis)
+        return [
+            float(total / count) if count else None
+            for total, count in zip(totals, counts)
+        ]
+
+    return {
+        "bins": bins,
+        "edges": np.linspace(0.0, 1.0, bins + 1).tolist(),
+        "sides": list(SIDES),
+        "systems": list(frame.systems),
+        "categories": [
+            {"category": code, "name": CATEGORY_NAME.get(code, code)}
+            for code in frame.categories
+        ],
+        "skipped": int((~valid).sum()),
+        "positions": {
+            "system": positions.sum(axis=1).tolist(),
+            "category": positions.sum(axis=0).tolist(),
+        },
+        "spanLengths": {
+            "lengths": list(range(1, SPAN_LENGTH_LIMIT + 1)),
+            "system": spans.sum(axis=1).tolist(),
+            "category": spans.sum(axis=0).tolist(),
+            "systemMean": _mean(1),
+            "categoryMean": _mean(0),
+        },
+    }
+
+
+def evaluation_positions(
+    evaluation_id: int, bins: int = DEFAULT_POSITION_BINS
+) -> dict[str, Any]:
+    """Return :func:`compute_positions`, recomputing only when markings change."""
+
+    version = evaluation_version(evaluation_id)
+    positions = position_cache.get((evaluation_id, bins), version)
+    if positions is None:
+        positions = compute_positions(load_position_frame(evaluation_id), bins)
+        position_cache.set((evaluation_id, bins), version, positions)
+    return positions
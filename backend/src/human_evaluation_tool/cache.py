@@ -0,0 +1,183 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from sqlalchemy import FromClause, Select, func, select, true
+
+from . import db
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Document,
+    Marking,
+    System,
+    User,
+)
+
+
+_V = TypeVar("_V")
+
+EvaluationVersion = tuple[Any, ...]
+
+# Every cache created through ``VersionedCache`` registers itself here so that a
+# single ``invalidate_evaluation`` call reaches all of them.
+_registry: list[VersionedCache[Any]] = []
+
+
+class VersionedCache(Generic[_V]):
+    """Bounded LRU cache whose entries are only valid for a content version.
+
+    Keys are tuples whose first element is the evaluation id the entry was
+    computed for, so entries can be dropped per evaluation. Besides the entry
+    count, the cache can be bounded by a total ``max_weight`` measured with
+    ``weigh``; a value heavier than the whole budget is not cached at all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_weight: int | None = None,
+        weigh: Callable[[_V], int] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weight = 0
+        self._entries: OrderedDict[
+            tuple[Hashable, ...], tuple[EvaluationVersion, _V, int]
+        ] = OrderedDict()
+        self._lock = Lock()
+        _registry.append(self)
+
+    def get(self, key: tuple[Hashable, ...], version: EvaluationVersion) -> _V | None:
+        """Return the cached value for ``key`` if it was stored at ``version``."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(
+        self, key: tuple[Hashable, ...], version: EvaluationVersion, value: _V
+    ) -> None:
+        """Store ``value`` for ``key`` at ``version``, evicting the oldest entries."""
+
+        weight = self.weigh(value) if self.weigh is not None else 0
+        with self._lock:
+            self._discard(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._entries[key] = (version, value, weight)
+            self.weight += weight
+            while len(self._entries) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: tuple[Hashable, ...]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+
+    def invalidate(self, evaluation_id: int) -> None:
+        """Drop every entry computed for ``evaluation_id``."""
+
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == evaluation_id]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def invalidate_evaluation(*evaluation_ids: int | None) -> None:
+    """Invalidate cached results for the given evaluations in every cache."""
+
+    for evaluation_id in evaluation_ids:
+        if evaluation_id is None:
+            continue
+        for cache in _registry:
+            cache.invalidate(evaluation_id)
+
+
+def clear_caches() -> None:
+    """Empty every registered cache."""
+
+    for cache in _registry:
+        cache.clear()
+
+
+def evaluation_version(evaluation_id: int) -> EvaluationVersion:
+    """Return a cheap content version for an evaluation's export data.
+
+    The version combines the latest ``updatedAt`` and the row count of the
+    evaluation's annotations, annotation systems and markings with the latest
+    ``updatedAt`` of the systems, bitexts, documents and users that results
+    rows denormalise, and is computed in a single statement.
+    """
+
+    annotation_ids = select(Annotation.id).where(
+        Annotation.evaluationId == evaluation_id
+    )
+    bitext_ids = select(Annotation.bitextId).where(
+        Annotation.evaluationId == evaluation_id
+    )
+    user_ids = select(Annotation.userId).where(Annotation.evaluationId == evaluation_id)
+    system_ids = select(AnnotationSystem.systemId).where(
+        AnnotationSystem.annotationId.in_(annotation_ids)
+    )
+    document_ids = select(Bitext.documentId).where(Bitext.id.in_(bitext_ids))
+
+    stats: list[Select[Any]] = [
+        select(func.max(Annotation.updatedAt), func.count(Annotation.id)).where(
+            Annotation.evaluationId == evaluation_id
+        ),
+        select(
+            func.max(AnnotationSystem.updatedAt), func.count(AnnotationSystem.id)
+        ).where(AnnotationSystem.annotationId.in_(annotation_ids)),
+        select(func.max(Marking.updatedAt), func.count(Marking.id)).where(
+            Marking.annotationId.in_(annotation_ids)
+        ),
+        select(func.max(System.updatedAt)).where(System.id.in_(system_ids)),
+        select(func.max(Bitext.updatedAt)).where(Bitext.id.in_(bitext_ids)),
+        select(func.max(Document.updatedAt)).where(Document.id.in_(document_ids)),
+        select(func.max(User.updatedAt)).where(User.id.in_(user_ids)),
+    ]
+
+    subqueries = [stmt.subquery() for stmt in stats]
+    joined: FromClause = subqueries[0]
+    for subquery in subqueries[1:]:
+        joined = joined.join(subquery, true())
+    row = db.session.execute(select(*subqueries).select_from(joined)).one()
+    return tuple(row)
@@ -0,0 +1,175 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from .agreement import AgreementFrame, load_agreement_frame
+from .cache import VersionedCache, evaluation_version
+from .utils import SEVERITY_NAME
+
+
+DEFAULT_Z_THRESHOLD: Final[float] = 3.0
+
+calibration_cache: VersionedCache[dict[str, Any]] = VersionedCache(maxsize=8)
+
+
+def _z_scores(
+    observed: npt.NDArray[np.float64],
+    expected: npt.NDArray[np.float64],
+    variance: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    z: npt.NDArray[np.float64] = np.divide(
+        observed - expected,
+        np.sqrt(variance),
+        out=np.full(observed.shape, np.nan),
+        where=variance > 0,
+    )
+    return z
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def compute_calibration(
+    frame: AgreementFrame, threshold: float = DEFAULT_Z_THRESHOLD
+) -> dict[str, Any]:
+    """Compare each annotator's marking rate and severity mix with their peers.
+
+    Only units judged by two or more annotators count. For every judgment,
+    the expected marking counts are the mean counts of the other annotators
+    on the same unit, summed per annotator into a users × severities matrix.
+    ``rateZ`` is the Poisson deviation of the annotator's total markings from
+    that expectation. Severity z-scores compare the annotator's severity
+    shares with the expected (smoothed) shares, scaled to their own number of
+    markings, so they flag a different mix rather than a different rate. Annotators
+    with any ``|z| > threshold`` are flagged as outliers.
+    """
+
+    users, severities = len(frame.annotators), len(frame.severities)
+    units = int(frame.unit.max(initial=-1)) + 1
+    judges = np.bincount(frame.unit, minlength=units)
+    shared = judges[frame.unit] >= 2
+
+    # unit × severity totals, and every marking's share of its unit's peers.
+    marking_unit = frame.unit[frame.judgment]
+    marking_user = frame.annotator[frame.judgment]
+    counted = judges[marking_unit] >= 2
+    unit_totals = np.bincount(
+        marking_unit[counted] * severities + frame.severity[counted],
+        minlength=units * severities,
+    ).reshape(units, severities)
+    peers = np.maximum(judges - 1, 1).astype(np.float64)
+
+    observed = np.bincount(
+        marking_user[counted] * severities + frame.severity[counted],
+        minlength=users * severities,
+    ).reshape(users, severities)
+    # Leave-one-out expectation: the unit total per judgment, minus the
+    # annotator's own markings, divided by the number of peers.
+    expected = np.zeros((users, severities))
+    np.add.at(
+        expected,
+        frame.annotator[shared],
+        unit_totals[frame.unit[shared]] / peers[frame.unit[shared], None],
+    )
+    np.add.at(
+        expected,
+        (marking_user[counted], frame.severity[counted]),
+        -1.0 / peers[marking_unit[counted]],
+    )
+    expected = np.maximum(expected, 0.0)
+    segments = np.bincount(frame.annotator[shared], minlength=users)
+
+    totals, expected_totals = observed.sum(axis=1), expected.sum(axis=1)
+    rate_z = _z_scores(totals.astype(np.float64), expected_totals, expected_totals)
+    # Half a pseudo-marking per severity keeps a severity the peers never
+    # used from having a zero share, which would make any use of it
+    # infinitely unlikely.
+    shares = (expected + 0.5) / (expected_totals[:, None] + 0.5 * severities)
+    scaled = shares * totals[:, None]
+    severity_z = _z_scores(observed.astype(np.float64), scaled, scaled * (1 - shares))
+
+    names = [SEVERITY_NAME.get(name, name) for name in frame.severities]
+    annotators = []
+    for user in range(users):
+        flags = []
+        if rate_z[user] > threshold:
+            flags.append("over-marking")
+        elif rate_z[user] < -threshold:
+            flags.append("under-marking")
+        flags.extend(
+            f"severity:{names[index]}"
+            for index in np.flatnonzero(
+                np.abs(np.nan_to_num(severity_z[user])) > threshold
+            )
+        )
+        annotators.append(
+            {
+                "annotator": frame.annotators[user],
+                "segments": int(segments[user]),
+                "markings": int(totals[user]),
+                "expectedMarkings": float(expected_totals[user]),
+                "rate": float(totals[user] / segments[user])
+                if segments[user]
+                else None,
+                "expectedRate": (
+                    float(expected_totals[user] / segments[user])
+                    if segments[user]
+                    else None
+                ),
+                "rateZ": _optional(rate_z[user]),
+                "severities": {
+                    "observed": observed[user].tolist(),
+                    "expected": scaled[user].tolist(),
+                    "z": [_optional(value) for value in severity_z[user]],
+                },
+                "flags": flags,
+                "outlier": bool(flags),
+            }
+        )
+
+    return {
+        "threshold": threshold,
+        "severities": names,
+        "sharedUnits": int((judges >= 2).sum()),
+        "annotators": annotators,
+    }
+
+
+def evaluation_calibration(
+    evaluation_id: int, threshold: float = DEFAULT_Z_THRESHOLD
+) -> dict[str, Any]:
+    """Return :func:`compute_calibration`, recomputing only when markings change."""
+
+    version = evaluation_version(evaluation_id)
+    calibration = calibration_cache.get((evaluation_id, threshold), version)
+    if calibration is None:
+        calibration = compute_calibration(
+            load_agreement_frame(evaluation_id), threshold
+        )
+        calibration_cache.set((evaluation_id, threshold), version, calibration)
+    return calibration
@@ -0,0 +1,205 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+
+from . import db
+from .analytics import evaluation_breakdowns
+from .columnar import evaluation_columns, write_columns
+from .export import DEFAULT_STREAM_BATCH_SIZE, RESULT_FORMATS, stream_results
+from .models import Evaluation
+from .scoring import configured_weights
+from .summaries import rebuild_summaries, summary_drift
+from .throughput import DEFAULT_IDLE_SECONDS, evaluation_throughput
+from .tombstones import prune_tombstones
+
+
+def _require_evaluation(evaluation_id: int) -> Evaluation:
+    evaluation = db.session.get(Evaluation, evaluation_id)
+    if evaluation is None:
+        raise click.ClickException(f"Evaluation {evaluation_id} not found")
+    return evaluation
+
+
+@click.command("export-results")
+@click.argument("evaluation_id", type=int)
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--format",
+    "result_format",
+    type=click.Choice(["npz", *RESULT_FORMATS]),
+    default="npz",
+    show_default=True,
+    help="Columnar NumPy archive or one of the results endpoint formats.",
+)
+@with_appcontext
+def export_results_command(
+    evaluation_id: int, output: Path, result_format: str
+) -> None:
+    """Export the results of an evaluation to OUTPUT."""
+
+    _require_evaluation(evaluation_id)
+    if result_format == "npz":
+        write_columns(output, evaluation_columns(evaluation_id))
+    else:
+        batch_size = current_app.config.get(
+            "EXPORT_STREAM_BATCH_SIZE", DEFAULT_STREAM_BATCH_SIZE
+        )
+        with output.open("w", encoding="utf-8") as handle:
+            handle.writelines(stream_results(evaluation_id, result_format, batch_size))
+    click.echo(f"Wrote {output}")
+
+
+@click.command("evaluation-breakdowns")
+@click.argument("evaluation_id", type=int)
+@click.option(
+    "--weights",
+    default="",
+    help="Severity weight overrides such as major:5,minor:1.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the JSON pivots to a file instead of standard output.",
+)
+@with_appcontext
+def evaluation_breakdowns_command(
+    evaluation_id: int, weights: str, output: Path | None
+) -> None:
+    """Print the MQM pivot tables of an evaluation as JSON."""
+
+    _require_evaluation(evaluation_id)
+    try:
+        overrides = configured_weights(weights)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--weights") from exc
+
+    document = json.dumps(evaluation_breakdowns(evaluation_id, overrides), indent=2)
+    if output is None:
+        click.echo(document)
+    else:
+        output.write_text(document + "\n", encoding="utf-8")
+        click.echo(f"Wrote {output}")
+
+
+@click.command("annotator-throughput")
+@click.argument("evaluation_id", type=int)
+@click.option(
+    "--from",
+    "start",
+    type=click.DateTime(),
+    help="Only count activity at or after this time.",
+)
+@click.option(
+    "--to",
+    "end",
+    type=click.DateTime(),
+    help="Only count activity before this time.",
+)
+@click.option(
+    "--idle",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds between actions that count as idle time.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the JSON statistics to a file instead of standard output.",
+)
+@with_appcontext
+def annotator_throughput_command(
+    evaluation_id: int,
+    start: datetime | None,
+    end: datetime | None,
+    idle: float | None,
+    output: Path | None,
+) -> None:
+    """Print per-annotator timing and throughput of an evaluation as JSON."""
+
+    _require_evaluation(evaluation_id)
+    if idle is None:
+        idle = current_app.config.get("THROUGHPUT_IDLE_SECONDS", DEFAULT_IDLE_SECONDS)
+    statistics = evaluation_throughput(evaluation_id, start, end, float(idle))
+    document = json.dumps(statistics, indent=2)
+    if output is None:
+        click.echo(document)
+    else:
+        output.write_text(document + "\n", encoding="utf-8")
+        click.echo(f"Wrote {output}")
+
+
+@click.command("prune-tombstones")
+@click.option(
+    "--days",
+    type=click.IntRange(min=0),
+    default=90,
+    show_default=True,
+    help="Keep tombstones newer than this many days.",
+)
+@with_appcontext
+def prune_tombstones_command(days: int) -> None:
+    """Delete tombstones that incremental clients no longer need."""
+
+    removed = prune_tombstones(datetime.now() - timedelta(days=days))
+    click.echo(f"Removed {removed} tombstones")
+
+
+@click.command("rebuild-summaries")
+@click.argument("evaluation_ids", nargs=-1, type=int)
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Only report drift between the stored and recomputed summaries.",
+)
+@with_appcontext
+def rebuild_summaries_command(evaluation_ids: tuple[int, ...], check: bool) -> None:
+    """Recompute the marking summary and progress counters."""
+
+    ids = list(evaluation_ids) or None
+    if check:
+        drift = summary_drift(ids)
+        for line in drift:
+            click.echo(line)
+        if drift:
+            raise click.ClickException(f"Found {len(drift)} drifted summary rows")
+        click.echo("Summaries are up to date")
+        return
+
+    rows = rebuild_summaries(ids)
+    click.echo(f"Rebuilt {rows} summary rows")
+
+
+def register_cli(app: Flask) -> None:
+    """Attach the maintenance commands to the ``flask`` CLI."""
+
+    app.cli.add_command(export_results_command)
+    app.cli.add_command(evaluation_breakdowns_command)
+    app.cli.add_command(annotator_throughput_command)
+    app.cli.add_command(prune_tombstones_command)
+    app.cli.add_command(rebuild_summaries_command)
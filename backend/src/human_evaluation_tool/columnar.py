@@ -0,0 +1,177 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Final, Iterable, Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+from .export import ResultRecord, iter_result_records
+from .utils import CATEGORY_NAME, SEVERITY_NAME, rater_name
+
+
+COLUMNAR_MIMETYPE: Final[str] = "application/octet-stream"
+
+# Integer columns copied straight from the export records.
+INTEGER_COLUMNS: Final[dict[str, type[np.integer[Any]]]] = {
+    "markingId": np.int64,
+    "annotationId": np.int64,
+    "bitextId": np.int64,
+    "errorStart": np.int32,
+    "errorEnd": np.int32,
+}
+
+# String columns stored dictionary encoded as ``<name>_codes`` into the UTF-8
+# dictionary ``<name>_data`` split by ``<name>_offsets``.
+DICTIONARY_COLUMNS: Final[tuple[str, ...]] = (
+    "system",
+    "document",
+    "rater",
+    "category",
+    "severity",
+    "source",
+    "translation",
+    "comment",
+)
+
+
+def _string_values(record: ResultRecord) -> tuple[str, ...]:
+    return (
+        record.systemName,
+        record.documentName,
+        rater_name(record.email),
+        CATEGORY_NAME[record.errorCategory],
+        SEVERITY_NAME[record.errorSeverity],
+        record.source,
+        record.translation or "",
+        record.comment or "",
+    )
+
+
+def _pack_strings(
+    values: Iterable[str],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return data, offsets
+
+
+def build_columns(records: Iterable[ResultRecord]) -> dict[str, npt.NDArray[Any]]:
+    """Convert export records into typed, dictionary-encoded NumPy columns."""
+
+    integers: dict[str, list[int]] = {name: [] for name in INTEGER_COLUMNS}
+    is_source: list[bool] = []
+    dictionaries: list[dict[str, int]] = [{} for _ in DICTIONARY_COLUMNS]
+    codes: list[list[int]] = [[] for _ in DICTIONARY_COLUMNS]
+
+    for record in records:
+        for name, column in integers.items():
+            column.append(getattr(record, name))
+        is_source.append(record.isSource)
+        for dictionary, column, value in zip(
+            dictionaries, codes, _string_values(record)
+        ):
+            column.append(dictionary.setdefault(value, len(dictionary)))
+
+    columns: dict[str, npt.NDArray[Any]] = {
+        name: np.asarray(integers[name], dtype=dtype)
+        for name, dtype in INTEGER_COLUMNS.items()
+    }
+    columns["isSource"] = np.asarray(is_source, dtype=np.bool_)
+    for name, dictionary, column in zip(DICTIONARY_COLUMNS, dictionaries, codes):
+        columns[f"{name}_codes"] = np.asarray(column, dtype=np.int32)
+        data, offsets = _pack_strings(dictionary)
+        columns[f"{name}_data"] = data
+        columns[f"{name}_offsets"] = offsets
+    return columns
+
+
+def evaluation_columns(evaluation_id: int) -> dict[str, npt.NDArray[Any]]:
+    """Return the columnar export of an evaluation built on the results joins."""
+
+    return build_columns(iter_result_records(evaluation_id))
+
+
+def write_columns(
+    file: str | Path | IO[bytes], columns: Mapping[str, npt.NDArray[Any]]
+) -> None:
+    """Write columns as an uncompressed ``.npz`` archive.
+
+    Members are stored rather than deflated so :func:`load_columns` can map
+    them straight from disk.
+    """
+
+    np.savez(file, **columns)  # type: ignore[arg-type]
+
+
+def load_columns(path: str | Path) -> dict[str, npt.NDArray[Any]]:
+    """Memory-map every column of an archive written by :func:`write_columns`."""
+
+    columns: dict[str, npt.NDArray[Any]] = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as handle:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Column {info.filename} is compressed")
+            # The local file header repeats the name and may carry a different
+            # extra field than the central directory, so read its lengths.
+            handle.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(handle.read(4), dtype="<u2")
+            handle.seek(info.header_offset + 30 + int(name_length + extra_length))
+            if np.lib.format.read_magic(handle) == (1, 0):
+                header = np.lib.format.read_array_header_1_0(handle)
+            else:
+                header = np.lib.format.read_array_header_2_0(handle)
+            shape, fortran_order, dtype = header
+            name = info.filename.removesuffix(".npy")
+            if 0 in shape:
+                columns[name] = np.empty(shape, dtype=dtype)
+                continue
+            columns[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=handle.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return columns
+
+
+def decode_dictionary(
+    columns: Mapping[str, npt.NDArray[Any]], name: str
+) -> tuple[npt.NDArray[np.int32], list[str]]:
+    """Return the codes and decoded values of a dictionary-encoded column.
+
+    The pair maps directly onto ``pandas.Categorical.from_codes``.
+    """
+
+    data = bytes(columns[f"{name}_data"])
+    offsets = columns[f"{name}_offsets"]
+    values = [
+        data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])
+    ]
+    return columns[f"{name}_codes"], values
@@ -0,0 +1,131 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from flask import Response, jsonify, request
+from flask.typing import ResponseReturnValue
+from sqlalchemy import Select, func
+from sqlalchemy.orm import InstrumentedAttribute
+from werkzeug.http import is_resource_modified
+
+from . import db
+
+
+class Validators(NamedTuple):
+    """HTTP cache validators of a resource or collection."""
+
+    etag: str
+    last_modified: datetime | None
+    rows: int
+
+
+def _stamp(moment: datetime | None) -> str:
+    return "" if moment is None else moment.strftime("%Y%m%d%H%M%S%f")
+
+
+def compute_validators(
+    stmt: Select[Any],
+    key: InstrumentedAttribute[int],
+    related: Sequence[InstrumentedAttribute[Any]] = (),
+    variant: str = "",
+) -> Validators:
+    """Derive validators for the rows of ``stmt`` with one aggregate query.
+
+    The ETag combines the row count, the largest ``key`` and the latest
+    ``updatedAt`` of the rows and of each many-to-one ``related`` object they
+    serialise, so inserts, edits and deletes all change it. For a single row
+    this is its id and ``updatedAt``. ``variant`` describes the
+    representation served from those rows (projection, page, …) and is
+    hashed into the ETag so that different representations never share
+    one. No row is loaded.
+    """
+
+    columns = [func.count(key), func.max(key), func.max(key.class_.updatedAt)]
+    for attribute in related:
+        stmt = stmt.join(attribute)
+        columns.append(func.max(attribute.property.mapper.class_.updatedAt))
+    row = db.session.execute(stmt.with_only_columns(*columns)).one()
+    count, last_key, *moments = row
+
+    known = [moment for moment in moments if moment is not None]
+    last_modified = max(known) if known else None
+    parts = [str(count), str(last_key or 0), *(_stamp(moment) for moment in moments)]
+    if variant:
+        parts.append(hashlib.sha256(variant.encode()).hexdigest()[:16])
+    return Validators(etag="-".join(parts), last_modified=last_modified, rows=count)
+
+
+def not_modified(validators: Validators) -> bool:
+    """Return whether the request's conditional headers match ``validators``.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since``.
+    """
+
+    last_modified = validators.last_modified
+    return not is_resource_modified(
+        request.environ,
+        etag=validators.etag,
+        last_modified=None if last_modified is None else last_modified.astimezone(),
+    )
+
+
+def with_validators(response: Response, validators: Validators) -> Response:
+    """Attach the ``ETag`` and ``Last-Modified`` headers to ``response``."""
+
+    response.set_etag(validators.etag)
+    if validators.last_modified is not None:
+        response.last_modified = validators.last_modified.astimezone()
+    return response
+
+
+def not_modified_response(validators: Validators) -> Response:
+    """Return an empty ``304`` response carrying ``validators``."""
+
+    return with_validators(Response(status=304), validators)
+
+
+def resource_response(
+    stmt: Select[Any],
+    key: InstrumentedAttribute[int],
+    not_found: str,
+    related: Sequence[InstrumentedAttribute[Any]] = (),
+) -> ResponseReturnValue:
+    """Serve the single row selected by ``stmt`` with conditional GET.
+
+    The validators are checked before the row is loaded, so a matching
+    ``If-None-Match`` or ``If-Modified-Since`` costs one aggregate query and
+    an empty ``304`` response.
+    """
+
+    validators = compute_validators(stmt, key, related)
+    if validators.rows == 0:
+        return {"message": not_found}, 404
+    if not_modified(validators):
+        return not_modified_response(validators)
+
+    row = db.session.execute(stmt).scalar_one()
+    return with_validators(jsonify(row.to_dict()), validators), 200
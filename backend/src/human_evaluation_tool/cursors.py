@@ -0,0 +1,82 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+
+def encode_time_cursor(moment: datetime) -> str:
+    """Return an opaque, URL-safe cursor for ``moment``."""
+
+    encoded = urlsafe_b64encode(moment.isoformat().encode("ascii"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_time_cursor(value: str) -> datetime:
+    """Parse an opaque cursor or an ISO 8601 timestamp.
+
+    Timezone-aware timestamps are converted to the server's local time, which
+    is how ``createdAt``/``updatedAt`` are stored. Raises :class:`ValueError`
+    for anything else.
+    """
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            decoded = urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+        except (binascii.Error, UnicodeError) as exc:
+            raise ValueError(f"Invalid cursor: {value}") from exc
+        moment = datetime.fromisoformat(decoded)
+
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def encode_id_cursor(key: int) -> str:
+    """Return an opaque, URL-safe cursor for the primary key ``key``."""
+
+    encoded = urlsafe_b64encode(f"id:{key}".encode("ascii"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_id_cursor(value: str) -> int:
+    """Parse an opaque id cursor or a plain primary key.
+
+    Raises :class:`ValueError` for anything else.
+    """
+
+    if not value.isdigit():
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            decoded = urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+        except (binascii.Error, UnicodeError) as exc:
+            raise ValueError(f"Invalid cursor: {value}") from exc
+        prefix, _, key = decoded.partition(":")
+        if prefix != "id" or not key.isdigit():
+            raise ValueError(f"Invalid cursor: {value}")
+        return int(key)
+    return int(value)
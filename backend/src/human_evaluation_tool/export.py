@@ -0,0 +1,358 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Final, Iterator, NamedTuple, Sequence
+
+from sqlalchemy import Select, and_, or_, select
+
+from . import db
+from .cache import VersionedCache, evaluation_version
+from .cursors import encode_time_cursor
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Document,
+    Marking,
+    System,
+    Tombstone,
+    User,
+)
+from .tokens import highlight_span
+from .utils import CATEGORY_NAME, SEVERITY_NAME, rater_name
+
+
+RESULT_COLUMNS: Final[tuple[str, ...]] = (
+    "system",
+    "doc",
+    "docSegId",
+    "globalSegId",
+    "rater",
+    "source",
+    "target",
+    "category",
+    "severity",
+    "comment",
+)
+
+RESULT_FORMATS: Final[dict[str, str]] = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "tsv": "text/tab-separated-values; charset=utf-8",
+}
+
+DEFAULT_STREAM_BATCH_SIZE: Final[int] = 1000
+
+# Below this many records per worker, process start-up and pickling cost more
+# than rendering the rows on the request thread.
+MIN_RECORDS_PER_WORKER: Final[int] = 5000
+
+# Each worker receives a few annotation ranges so a slow range does not leave
+# the other processes idle at the end of the export.
+CHUNKS_PER_WORKER: Final[int] = 4
+
+# Incremental cursors trail the response time so rows written by transactions
+# still in flight are sent again on the next pull rather than skipped.
+CURSOR_OVERLAP: Final[timedelta] = timedelta(seconds=5)
+
+# Memory budget of the rendered rows kept per worker process. Evaluations
+# whose rows alone exceed it are rendered on every request instead.
+RESULTS_CACHE_MAX_BYTES: Final[int] = 64 * 1024 * 1024
+
+
+def _rows_size(rows: list[str]) -> int:
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) for row in rows)
+
+
+# Rendered rows of recently exported evaluations, keyed by ``(evaluation_id,)``.
+results_cache: VersionedCache[list[str]] = VersionedCache(
+    maxsize=8, max_weight=RESULTS_CACHE_MAX_BYTES, weigh=_rows_size
+)
+
+
+class ResultRecord(NamedTuple):
+    """Flat projection of a marking joined with everything its TSV row needs."""
+
+    annotationId: int
+    markingId: int
+    systemName: str
+    documentName: str
+    bitextId: int
+    source: str
+    email: str
+    translation: str | None
+    comment: str | None
+    errorStart: int
+    errorEnd: int
+    errorCategory: str
+    errorSeverity: str
+    isSource: bool
+
+
+def results_statement(evaluation_id: int) -> Select[Any]:
+    """Build the single joined query backing the evaluation results export."""
+
+    return (
+        select(
+            Annotation.id.label("annotationId"),
+            Marking.id.label("markingId"),
+            System.name.label("systemName"),
+            Document.name.label("documentName"),
+            Bitext.id.label("bitextId"),
+            Bitext.source,
+            User.email,
+            AnnotationSystem.translation,
+            Annotation.comment,
+            Marking.errorStart,
+            Marking.errorEnd,
+            Marking.errorCategory,
+            Marking.errorSeverity,
+            Marking.isSource,
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .join(System, System.id == Marking.systemId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(Document, Document.id == Bitext.documentId)
+        .join(User, User.id == Annotation.userId)
+        .where(Annotation.evaluationId == evaluation_id)
+        .order_by(Annotation.id, Marking.id)
+    )
+
+
+def result_fields(record: ResultRecord) -> list[str]:
+    """Return the export columns of a record in :data:`RESULT_COLUMNS` order."""
+
+    translation = record.translation or ""
+    if record.isSource:
+        source = highlight_span(record.source, record.errorStart, record.errorEnd)
+        target = translation.replace("\n", "<br>")
+    else:
+        source = record.source.replace("\n", "<br>")
+        target = highlight_span(translation, record.errorStart, record.errorEnd)
+
+    return [
+        record.systemName,
+        record.documentName,
+        str(record.bitextId),
+        str(record.bitextId),
+        rater_name(record.email),
+        source,
+        target,
+        CATEGORY_NAME[record.errorCategory],
+        SEVERITY_NAME[record.errorSeverity],
+        record.comment or "",
+    ]
+
+
+def render_result_row(record: ResultRecord) -> str:
+    """Render a single export record as a newline-terminated TSV row."""
+
+    return "\t".join(result_fields(record)) + "\n"
+
+
+def iter_result_records(
+    evaluation_id: int, batch_size: int | None = None
+) -> Iterator[ResultRecord]:
+    """Yield export records for an evaluation in annotation/marking order.
+
+    When ``batch_size`` is given the rows are fetched through a server-side
+    cursor in partitions of that size instead of being buffered up front.
+    """
+
+    stmt = results_statement(evaluation_id)
+    if batch_size is not None:
+        stmt = stmt.execution_options(yield_per=batch_size)
+    for row in db.session.execute(stmt):
+        yield ResultRecord._make(row)
+
+
+def _render_chunk(rows: Sequence[tuple[Any, ...]]) -> list[str]:
+    # Plain tuples pickle several times faster than ``ResultRecord`` instances,
+    # so records cross the process boundary as tuples and are rebuilt here.
+    return [render_result_row(ResultRecord._make(row)) for row in rows]
+
+
+def split_annotation_ranges(
+    records: Sequence[ResultRecord], chunks: int
+) -> list[Sequence[ResultRecord]]:
+    """Split ordered records into ``chunks`` contiguous annotation-id ranges.
+
+    Boundaries only fall between annotations, so every annotation's markings
+    are rendered by the same worker.
+    """
+
+    if chunks <= 1 or len(records) <= 1:
+        return [records]
+
+    target = -(-len(records) // chunks)
+    ranges: list[Sequence[ResultRecord]] = []
+    start = 0
+    while start < len(records):
+        end = min(start + target, len(records))
+        while (
+            end < len(records)
+            and records[end].annotationId == records[end - 1].annotationId
+        ):
+            end += 1
+        ranges.append(records[start:end])
+        start = end
+    return ranges
+
+
+def render_results(records: Sequence[ResultRecord], workers: int = 1) -> list[str]:
+    """Render records to TSV rows, in order, using up to ``workers`` processes."""
+
+    workers = min(workers, len(records) // MIN_RECORDS_PER_WORKER)
+    if workers <= 1:
+        return [render_result_row(record) for record in records]
+
+    ranges = [
+        [tuple(record) for record in annotation_range]
+        for annotation_range in split_annotation_ranges(
+            records, workers * CHUNKS_PER_WORKER
+        )
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(chain.from_iterable(executor.map(_render_chunk, ranges)))
+
+
+def evaluation_results(evaluation_id: int, workers: int = 1) -> list[str]:
+    """Return the TSV rows of an evaluation using a fixed number of queries."""
+
+    return render_results(list(iter_result_records(evaluation_id)), workers)
+
+
+def cached_evaluation_results(evaluation_id: int, workers: int = 1) -> list[str]:
+    """Return the TSV rows of an evaluation, rebuilding them only on change."""
+
+    version = evaluation_version(evaluation_id)
+    results = results_cache.get((evaluation_id,), version)
+    if results is None:
+        results = evaluation_results(evaluation_id, workers)
+        results_cache.set((evaluation_id,), version, results)
+    return results
+
+
+def stream_results(
+    evaluation_id: int,
+    result_format: str,
+    batch_size: int | None = None,
+) -> Iterator[str]:
+    """Yield the export of an evaluation chunk by chunk in ``result_format``.
+
+    ``json`` produces the same array as :func:`evaluation_results`, ``tsv``
+    the raw rows and ``ndjson`` one object per row keyed by
+    :data:`RESULT_COLUMNS`.
+    """
+
+    records = iter_result_records(evaluation_id, batch_size=batch_size)
+    if result_format == "tsv":
+        for record in records:
+            yield render_result_row(record)
+    elif result_format == "ndjson":
+        for record in records:
+            fields = dict(zip(RESULT_COLUMNS, result_fields(record)))
+            yield json.dumps(fields) + "\n"
+    else:
+        separator = "["
+        for record in records:
+            yield separator + json.dumps(render_result_row(record))
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
+
+def incremental_results(evaluation_id: int, since: datetime) -> dict[str, Any]:
+    """Return the export rows and deletions of an evaluation since ``since``.
+
+    A row is resent when its marking, annotation or annotation system changed.
+    ``deleted`` lists marking ids whose rows left the export (including
+    markings hidden by a deleted annotation system) and deleted annotation ids.
+    The markings of a deleted annotation are not listed separately, so
+    consumers drop every row with one of those ``annotationId`` values. They
+    apply ``deleted`` before upserting ``rows`` by ``markingId``.
+    """
+
+    cursor = encode_time_cursor(datetime.now() - CURSOR_OVERLAP)
+
+    changed = results_statement(evaluation_id).where(
+        or_(
+            Marking.updatedAt > since,
+            Annotation.updatedAt > since,
+            AnnotationSystem.updatedAt > since,
+        )
+    )
+    rows = []
+    for row in db.session.execute(changed):
+        record = ResultRecord._make(row)
+        rows.append(
+            {
+                "markingId": record.markingId,
+                "annotationId": record.annotationId,
+                **dict(zip(RESULT_COLUMNS, result_fields(record))),
+            }
+        )
+
+    recent = and_(Tombstone.evaluationId == evaluation_id, Tombstone.deletedAt > since)
+    tombstones = db.session.execute(
+        select(Tombstone.entity, Tombstone.entityId).where(recent)
+    ).all()
+    hidden = db.session.execute(
+        select(Marking.id).join(
+            Tombstone,
+            and_(
+                Tombstone.entity == "annotation_system",
+                Tombstone.annotationId == Marking.annotationId,
+                Tombstone.systemId == Marking.systemId,
+                recent,
+            ),
+        )
+    ).scalars()
+
+    deleted_markings = {
+        entity_id for entity, entity_id in tombstones if entity == "marking"
+    }
+    deleted_markings.update(hidden)
+    deleted_annotations = {
+        entity_id for entity, entity_id in tombstones if entity == "annotation"
+    }
+    return {
+        "rows": rows,
+        "deleted": {
+            "markings": sorted(deleted_markings),
+            "annotations": sorted(deleted_annotations),
+        },
+        "cursor": cursor,
+    }
@@ -0,0 +1,294 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import socket
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Final
+
+import numpy as np
+from flask import Flask, current_app
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import db
+from .columnar import COLUMNAR_MIMETYPE, evaluation_columns
+from .export import DEFAULT_STREAM_BATCH_SIZE, stream_results
+from .models import ExportJob
+
+
+DEFAULT_JOB_WORKERS: Final = 2
+DEFAULT_JOB_HEARTBEAT: Final = 30
+DEFAULT_JOB_TIMEOUT: Final = 300
+ACTIVE_STATUSES: Final = frozenset({"queued", "running"})
+
+# Text exports are gzip-compressed; the npz archive deflates its own members.
+ARTIFACT_SUFFIXES: Final[dict[str, str]] = {
+    "json": ".json.gz",
+    "ndjson": ".ndjson.gz",
+    "tsv": ".tsv.gz",
+    "npz": ".npz",
+}
+ARTIFACT_MIMETYPES: Final[dict[str, str]] = {
+    "json": "application/gzip",
+    "ndjson": "application/gzip",
+    "tsv": "application/gzip",
+    "npz": COLUMNAR_MIMETYPE,
+}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+_futures: dict[int, Future[None]] = {}
+_heartbeat: Thread | None = None
+
+
+def _current_time() -> datetime:
+    return datetime.now()
+
+
+def _get_executor(app: Flask) -> ThreadPoolExecutor:
+    global _executor, _heartbeat
+    with _executor_lock:
+        if _executor is None:
+            workers = int(app.config.get("EXPORT_JOB_WORKERS", DEFAULT_JOB_WORKERS))
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="export-job"
+            )
+        if _heartbeat is None:
+            interval = app.config.get("EXPORT_JOB_HEARTBEAT", DEFAULT_JOB_HEARTBEAT)
+            _heartbeat = Thread(
+                target=_beat,
+                args=(app, float(interval)),
+                name="export-job-heartbeat",
+                daemon=True,
+            )
+            _heartbeat.start()
+        return _executor
+
+
+def process_owner() -> str:
+    """Return the owner recorded on jobs run by this process, ``host:pid``."""
+
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_is_gone(owner: str | None) -> bool:
+    """Return whether ``owner`` is a process on this host that has exited.
+
+    Owners on other hosts cannot be checked and count as alive; their
+    heartbeat decides.
+    """
+
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def touch_jobs(job_ids: list[int]) -> None:
+    """Bump ``updatedAt`` of the queued or running jobs in ``job_ids``."""
+
+    if not job_ids:
+        return
+    db.session.execute(
+        update(ExportJob)
+        .where(ExportJob.id.in_(job_ids), ExportJob.status.in_(ACTIVE_STATUSES))
+        .values(updatedAt=_current_time())
+    )
+    db.session.commit()
+
+
+def _beat(app: Flask, interval: float) -> None:
+    # Heartbeats run on their own session, so they never commit underneath
+    # a job's open server-side cursor.
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                touch_jobs(list(_futures))
+            except SQLAlchemyError:
+                db.session.rollback()
+                app.logger.exception("Export job heartbeat failed")
+
+
+def export_directory() -> Path:
+    """Return the directory export artifacts are written to."""
+
+    configured = current_app.config.get("EXPORT_DIRECTORY")
+    if configured:
+        return Path(configured)
+    return Path(current_app.instance_path) / "exports"
+
+
+def artifact_path(job: ExportJob) -> Path | None:
+    """Return the artifact of a finished job, or ``None`` if it has none."""
+
+    if job.fileName is None:
+        return None
+    return export_directory() / job.fileName
+
+
+def write_artifact(
+    evaluation_id: int,
+    result_format: str,
+    path: Path,
+    batch_size: int | None = None,
+) -> int:
+    """Write the export of an evaluation to ``path`` and return its size.
+
+    The file is written next to ``path`` and renamed into place, so a partial
+    artifact is never visible under the final name.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.part")
+    try:
+        if result_format == "npz":
+            columns = evaluation_columns(evaluation_id)
+            with partial.open("wb") as handle:
+                np.savez_compressed(handle, **columns)  # type: ignore[arg-type]
+        else:
+            with gzip.open(partial, "wt", encoding="utf-8") as text:
+                text.writelines(
+                    stream_results(evaluation_id, result_format, batch_size)
+                )
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+
+def _artifact_name(job: ExportJob) -> str:
+    return (
+        f"evaluation-{job.evaluationId}-export-{job.id}{ARTIFACT_SUFFIXES[job.format]}"
+    )
+
+
+def _run_export_job(app: Flask, job_id: int) -> None:
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None:
+            return
+        file_name = _artifact_name(job)
+        path = export_directory() / file_name
+        batch_size = app.config.get(
+            "EXPORT_STREAM_BATCH_SIZE", DEFAULT_STREAM_BATCH_SIZE
+        )
+        try:
+            job.status = "running"
+            job.owner = process_owner()
+            job.updatedAt = _current_time()
+            db.session.commit()
+
+            error: str | None = None
+            size = 0
+            try:
+                size = write_artifact(job.evaluationId, job.format, path, batch_size)
+            except Exception as exc:
+                db.session.rollback()
+                error = str(exc) or type(exc).__name__
+                app.logger.exception("Export job %s failed", job_id)
+
+            db.session.refresh(job)
+            if job.status != "running":
+                # The job was expired meanwhile; nothing refers to the artifact.
+                remove_artifacts([path])
+                return
+            if error is None:
+                job.status = "finished"
+                job.fileName = file_name
+                job.size = size
+            else:
+                job.status = "failed"
+                job.error = error
+            job.finishedAt = job.updatedAt = _current_time()
+            db.session.commit()
+        except SQLAlchemyError:
+            # The job row is gone (its evaluation was deleted while the job
+            # ran) or could not be updated; nothing refers to the artifact.
+            db.session.rollback()
+            remove_artifacts([path])
+            app.logger.exception("Export job %s could not be recorded", job_id)
+
+
+def submit_export_job(job_id: int) -> Future[None]:
+    """Run a queued export job on the background worker pool."""
+
+    app: Flask = current_app._get_current_object()  # type: ignore[attr-defined]
+    future = _get_executor(app).submit(_run_export_job, app, job_id)
+    _futures[job_id] = future
+    future.add_done_callback(lambda _: _futures.pop(job_id, None))
+    return future
+
+
+def expire_stale_jobs(jobs: Iterable[ExportJob]) -> None:
+    """Mark queued or running jobs whose worker has gone away as failed.
+
+    Every process bumps ``updatedAt`` of the jobs it owns every
+    ``EXPORT_JOB_HEARTBEAT`` seconds. A job that this process does not own
+    is stale when its owner is a process on this host that has exited, or
+    when its heartbeat is older than ``EXPORT_JOB_TIMEOUT`` seconds. Any
+    partial artifact is removed.
+    """
+
+    timeout = current_app.config.get("EXPORT_JOB_TIMEOUT", DEFAULT_JOB_TIMEOUT)
+    now = _current_time()
+    cutoff = now - timedelta(seconds=float(timeout))
+    stale = [
+        job
+        for job in jobs
+        if job.status in ACTIVE_STATUSES
+        and job.id not in _futures
+        and (_owner_is_gone(job.owner) or job.updatedAt < cutoff)
+    ]
+    if not stale:
+        return
+    for job in stale:
+        job.status = "failed"
+        job.error = "Export job was interrupted"
+        job.finishedAt = job.updatedAt = now
+    db.session.commit()
+    remove_artifacts(
+        export_directory() / f"{_artifact_name(job)}.part" for job in stale
+    )
+
+
+def remove_artifacts(paths: Iterable[Path | None]) -> None:
+    """Delete export artifacts, ignoring files that are already gone."""
+
+    for path in paths:
+        if path is not None:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,178 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from sqlalchemy import select
+
+from . import db
+from .models import Evaluation, MarkingSummary, System, SystemSegments
+from .scoring import NO_ERROR_CATEGORY, severity_weights
+from .utils import SEVERITY_NAME
+
+
+RollupKey = tuple[int, int]
+
+
+def _empty_row() -> dict[str, Any]:
+    return {"segments": 0, "errors": {}, "penalty": 0.0, "score": 0.0}
+
+
+def _merge(total: dict[str, Any], row: dict[str, Any]) -> None:
+    total["segments"] += row["segments"]
+    total["penalty"] += row["penalty"]
+    for name, count in row["errors"].items():
+        total["errors"][name] = total["errors"].get(name, 0) + count
+
+
+def _finish(row: dict[str, Any]) -> dict[str, Any]:
+    row["score"] = row["penalty"] / row["segments"] if row["segments"] else 0.0
+    return row
+
+
+def _rank(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Lower scores rank first and ties share a rank.
+    rows.sort(key=lambda row: (row["score"], row["id"]))
+    for index, row in enumerate(rows):
+        tied = index and row["score"] == rows[index - 1]["score"]
+        row["rank"] = rows[index - 1]["rank"] if tied else index + 1
+    return rows
+
+
+def evaluation_rollups(
+    weights: Mapping[str, float], system_id: int | None = None
+) -> dict[RollupKey, dict[str, Any]]:
+    """Return MQM penalty rollups per (evaluation, system).
+
+    Rollups are read from the maintained ``system_segments`` and
+    ``marking_summary`` tables, so the cost grows with the number of
+    evaluations and systems rather than markings.
+    """
+
+    segment_statement = select(
+        SystemSegments.evaluationId, SystemSegments.systemId, SystemSegments.segments
+    ).where(SystemSegments.segments != 0)
+    marking_statement = select(
+        MarkingSummary.evaluationId,
+        MarkingSummary.systemId,
+        MarkingSummary.errorSeverity,
+        MarkingSummary.count,
+    ).where(
+        MarkingSummary.count != 0,
+        MarkingSummary.errorCategory != NO_ERROR_CATEGORY,
+        MarkingSummary.errorSeverity != "no-error",
+    )
+    if system_id is not None:
+        evaluation_ids = select(SystemSegments.evaluationId).where(
+            SystemSegments.systemId == system_id, SystemSegments.segments != 0
+        )
+        segment_statement = segment_statement.where(
+            SystemSegments.evaluationId.in_(evaluation_ids)
+        )
+        marking_statement = marking_statement.where(
+            MarkingSummary.evaluationId.in_(evaluation_ids)
+        )
+
+    rollups: dict[RollupKey, dict[str, Any]] = {}
+    for evaluation_id, row_system_id, segments in db.session.execute(segment_statement):
+        rollups[(evaluation_id, row_system_id)] = {
+            **_empty_row(),
+            "segments": segments,
+        }
+    for evaluation_id, row_system_id, severity, count in db.session.execute(
+        marking_statement
+    ):
+        row = rollups.setdefault((evaluation_id, row_system_id), _empty_row())
+        name = SEVERITY_NAME.get(severity, severity)
+        row["errors"][name] = row["errors"].get(name, 0) + count
+        row["penalty"] += count * weights.get(severity, 0.0)
+    return {key: _finish(row) for key, row in rollups.items()}
+
+
+def _names(model: Any, ids: set[int]) -> dict[int, str]:
+    rows = db.session.execute(select(model.id, model.name).where(model.id.in_(ids)))
+    return {row_id: name for row_id, name in rows}
+
+
+def leaderboard(weights: Mapping[str, float] | None = None) -> dict[str, Any]:
+    """Rank every system by its MQM score pooled over all evaluations."""
+
+    weights = severity_weights(weights)
+    totals: dict[int, dict[str, Any]] = {}
+    for (_, system_id), row in evaluation_rollups(weights).items():
+        total = totals.setdefault(system_id, {**_empty_row(), "evaluations": 0})
+        _merge(total, row)
+        total["evaluations"] += 1
+
+    names = _names(System, set(totals))
+    systems = [
+        {"id": system_id, "name": names.get(system_id, ""), **_finish(total)}
+        for system_id, total in totals.items()
+    ]
+    return {"weights": weights, "systems": _rank(systems)}
+
+
+def system_leaderboard(
+    system_id: int, weights: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """Return a system's scores and rank in every evaluation it appears in."""
+
+    weights = severity_weights(weights)
+    by_evaluation: dict[int, list[dict[str, Any]]] = {}
+    for (evaluation_id, row_system_id), row in evaluation_rollups(
+        weights, system_id
+    ).items():
+        by_evaluation.setdefault(evaluation_id, []).append({"id": row_system_id, **row})
+
+    names = _names(Evaluation, set(by_evaluation))
+    total = _empty_row()
+    evaluations = []
+    for evaluation_id, rows in by_evaluation.items():
+        ranked = _rank(rows)
+        own = next((row for row in ranked if row["id"] == system_id), None)
+        if own is None:
+            continue
+        _merge(total, own)
+        evaluations.append(
+            {
+                "id": evaluation_id,
+                "name": names.get(evaluation_id, ""),
+                "segments": own["segments"],
+                "errors": own["errors"],
+                "penalty": own["penalty"],
+                "score": own["score"],
+                "rank": own["rank"],
+                "systems": len(ranked),
+            }
+        )
+    evaluations.sort(key=lambda row: row["id"])
+    return {
+        "weights": weights,
+        "system": {
+            "id": system_id,
+            "name": _names(System, {system_id}).get(system_id, ""),
+            "evaluations": len(evaluations),
+            **_finish(total),
+        },
+        "evaluations": evaluations,
+    }
@@ -24,8 +24,13 @@ from .annotation_system import AnnotationSystem
 from .bitext import Bitext
 from .document import Document
 from .evaluation import Evaluation
+from .evaluation_progress import EvaluationProgress
+from .export_job import ExportJob
 from .marking import Marking
+from .marking_summary import MarkingSummary
 from .system import System
+from .system_segments import SystemSegments
+from .tombstone import Tombstone
 from .user import User
 
 
@@ -35,7 +40,12 @@ __all__ = [
     "Bitext",
     "Document",
     "Evaluation",
+    "EvaluationProgress",
+    "ExportJob",
     "Marking",
+    "MarkingSummary",
     "System",
+    "SystemSegments",
+    "Tombstone",
     "User",
 ]
@@ -25,7 +25,15 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    Mapped,
+    joinedload,
+    mapped_column,
+    raiseload,
+    relationship,
+)
+from sqlalchemy.orm.interfaces import ORMOption
 
 from .. import Base
 
@@ -50,7 +58,7 @@ class Annotation(Base):
     isAnnotated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     comment: Mapped[str | None] = mapped_column(Text)
     createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
 
     user: Mapped["User"] = relationship("User", back_populates="annotations")
     evaluation: Mapped["Evaluation"] = relationship(
@@ -64,6 +72,29 @@ class Annotation(Base):
         "Marking", back_populates="annotation", cascade="all, delete-orphan"
     )
 
+    @classmethod
+    def dict_relationships(cls) -> tuple[InstrumentedAttribute[Any], ...]:
+        """Return the many-to-one relationships that :meth:`to_dict` embeds."""
+
+        return (cls.evaluation, cls.bitext)
+
+    @classmethod
+    def dict_loader_options(cls, strict: bool = False) -> list[ORMOption]:
+        """Return loader options that let :meth:`to_dict` run without queries.
+
+        The evaluation and bitext are joined into the annotation query. With
+        ``strict`` every other relationship raises on access instead of
+        lazy-loading, so an N+1 introduced by a later change fails loudly.
+        """
+
+        options: list[ORMOption] = [
+            joinedload(attribute, innerjoin=True)
+            for attribute in cls.dict_relationships()
+        ]
+        if strict:
+            options.append(raiseload("*"))
+        return options
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "id": self.id,
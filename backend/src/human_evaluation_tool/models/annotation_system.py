@@ -45,7 +45,7 @@ class AnnotationSystem(Base):
     systemId: Mapped[int] = mapped_column(ForeignKey("system.id"), nullable=False)
     translation: Mapped[str | None] = mapped_column(Text)
     createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
 
     annotation: Mapped["Annotation"] = relationship(
         "Annotation", back_populates="annotation_systems"
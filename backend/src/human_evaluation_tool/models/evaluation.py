@@ -32,6 +32,7 @@ from .. import Base
 
 if TYPE_CHECKING:  # pragma: no cover
     from .annotation import Annotation
+    from .export_job import ExportJob
 
 
 class Evaluation(Base):
@@ -47,6 +48,9 @@ class Evaluation(Base):
     annotations: Mapped[list["Annotation"]] = relationship(
         "Annotation", back_populates="evaluation", cascade="all, delete-orphan"
     )
+    export_jobs: Mapped[list["ExportJob"]] = relationship(
+        "ExportJob", back_populates="evaluation", cascade="all, delete-orphan"
+    )
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -0,0 +1,47 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .. import Base
+
+
+class EvaluationProgress(Base):
+    __tablename__ = "evaluation_progress"
+
+    evaluationId: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=False
+    )
+    annotations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    annotated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "evaluationId": self.evaluationId,
+            "annotations": self.annotations,
+            "annotated": self.annotated,
+            "pending": self.annotations - self.annotated,
+        }
@@ -0,0 +1,71 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .. import Base
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .evaluation import Evaluation
+
+
+class ExportJob(Base):
+    __tablename__ = "export_job"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    evaluationId: Mapped[int] = mapped_column(
+        ForeignKey("evaluation.id"), nullable=False, index=True
+    )
+    format: Mapped[str] = mapped_column(String(10), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    fileName: Mapped[str | None] = mapped_column(String(255))
+    size: Mapped[int | None] = mapped_column(BigInteger)
+    error: Mapped[str | None] = mapped_column(Text)
+    owner: Mapped[str | None] = mapped_column(String(255))
+    createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finishedAt: Mapped[datetime | None] = mapped_column(DateTime)
+
+    evaluation: Mapped["Evaluation"] = relationship(
+        "Evaluation", back_populates="export_jobs"
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "evaluationId": self.evaluationId,
+            "format": self.format,
+            "status": self.status,
+            "fileName": self.fileName,
+            "size": self.size,
+            "error": self.error,
+            "owner": self.owner,
+            "createdAt": self.createdAt,
+            "updatedAt": self.updatedAt,
+            "finishedAt": self.finishedAt,
+        }
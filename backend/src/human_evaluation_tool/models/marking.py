@@ -49,7 +49,7 @@ class Marking(Base):
     errorSeverity: Mapped[str] = mapped_column(String(20), nullable=False)
     isSource: Mapped[bool] = mapped_column(Boolean, nullable=False)
     createdAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updatedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
 
     annotation: Mapped["Annotation"] = relationship(
         "Annotation", back_populates="markings"
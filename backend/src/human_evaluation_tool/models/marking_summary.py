@@ -0,0 +1,48 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .. import Base
+
+
+class MarkingSummary(Base):
+    __tablename__ = "marking_summary"
+
+    evaluationId: Mapped[int] = mapped_column(Integer, primary_key=True)
+    systemId: Mapped[int] = mapped_column(Integer, primary_key=True)
+    errorCategory: Mapped[str] = mapped_column(String(20), primary_key=True)
+    errorSeverity: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "evaluationId": self.evaluationId,
+            "systemId": self.systemId,
+            "errorCategory": self.errorCategory,
+            "errorSeverity": self.errorSeverity,
+            "count": self.count,
+        }
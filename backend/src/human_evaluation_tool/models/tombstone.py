@@ -0,0 +1,55 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .. import Base
+
+
+class Tombstone(Base):
+    __tablename__ = "tombstone"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    entityId: Mapped[int] = mapped_column(Integer, nullable=False)
+    evaluationId: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    userId: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    annotationId: Mapped[int] = mapped_column(Integer, nullable=False)
+    systemId: Mapped[int | None] = mapped_column(Integer)
+    deletedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "entity": self.entity,
+            "entityId": self.entityId,
+            "evaluationId": self.evaluationId,
+            "userId": self.userId,
+            "annotationId": self.annotationId,
+            "systemId": self.systemId,
+            "deletedAt": self.deletedAt,
+        }
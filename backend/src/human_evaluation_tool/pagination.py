@@ -0,0 +1,285 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+from urllib.parse import urlencode
+
+from flask import Response, current_app, jsonify, request
+from flask.typing import ResponseReturnValue
+from sqlalchemy import Select, inspect
+from sqlalchemy.orm import InstrumentedAttribute
+
+from . import db
+from .conditional import (
+    compute_validators,
+    not_modified,
+    not_modified_response,
+    with_validators,
+)
+from .cursors import decode_id_cursor, encode_id_cursor
+
+
+DEFAULT_PAGE_LIMIT = 1000
+
+# Columns that must never leave the server, whatever a client asks for.
+HIDDEN_FIELDS = frozenset({"password"})
+
+
+class Page(NamedTuple):
+    """The slice of a collection requested by a client."""
+
+    after: int | None
+    limit: int | None
+
+
+def request_page() -> Page:
+    """Read ``?after=`` and ``?limit=`` from the current request.
+
+    Without ``?limit=`` the page is capped at ``PAGINATION_MAX_LIMIT`` rows,
+    unless ``PAGINATION_LEGACY_UNBOUNDED`` is set and no ``?after=`` is given,
+    in which case every row is returned as before pagination existed.
+
+    Raises :class:`ValueError` with a client-facing message for malformed
+    values and for limits outside ``1..PAGINATION_MAX_LIMIT``.
+    """
+
+    max_limit = int(current_app.config.get("PAGINATION_MAX_LIMIT", DEFAULT_PAGE_LIMIT))
+    after_value = request.args.get("after")
+    limit_value = request.args.get("limit")
+
+    after = None
+    if after_value is not None:
+        try:
+            after = decode_id_cursor(after_value)
+        except ValueError:
+            raise ValueError("Invalid cursor") from None
+
+    if limit_value is None:
+        legacy = current_app.config.get("PAGINATION_LEGACY_UNBOUNDED", False)
+        if legacy and after is None:
+            return Page(after=None, limit=None)
+        return Page(after=after, limit=max_limit)
+
+    try:
+        limit = int(limit_value)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= max_limit:
+        raise ValueError("Invalid limit")
+    return Page(after=after, limit=limit)
+
+
+def request_fields(model: Any) -> list[str] | None:
+    """Read the ``?fields=`` projection for ``model`` from the current request.
+
+    Returns the requested column names, or ``None`` when the argument is
+    absent. Raises :class:`ValueError` for an empty list and for names that
+    are not columns of ``model``; ``HIDDEN_FIELDS`` are never projectable.
+    """
+
+    value = request.args.get("fields")
+    if value is None:
+        return None
+
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",")))
+    fields = [name for name in fields if name]
+    if not fields:
+        raise ValueError("Invalid fields")
+    columns = set(inspect(model).column_attrs.keys()) - HIDDEN_FIELDS
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def request_ids(value: Any) -> list[int]:
+    """Validate a batch of primary keys from ``?ids=`` or a lookup body.
+
+    ``value`` is a comma-separated string or a JSON list. Duplicates are
+    dropped and the request order is kept. Raises :class:`ValueError` for
+    malformed ids and for more than ``PAGINATION_MAX_LIMIT`` of them.
+    """
+
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(",")]
+        if not all(part.isdigit() for part in value):
+            raise ValueError("Invalid ids")
+        value = [int(part) for part in value]
+    if (
+        not isinstance(value, list)
+        or not value
+        or any(type(item) is not int or item < 0 for item in value)
+    ):
+        raise ValueError("Invalid ids")
+
+    ids = list(dict.fromkeys(value))
+    max_limit = int(current_app.config.get("PAGINATION_MAX_LIMIT", DEFAULT_PAGE_LIMIT))
+    if len(ids) > max_limit:
+        raise ValueError("Too many ids")
+    return ids
+
+
+def _select_fields(
+    stmt: Select[Any], key: InstrumentedAttribute[int], fields: list[str] | None
+) -> Select[Any]:
+    if fields is None:
+        return stmt
+    columns = [getattr(key.class_, name) for name in fields]
+    return stmt.with_only_columns(key, *columns)
+
+
+def _keyed_items(
+    stmt: Select[Any], key: InstrumentedAttribute[int], fields: list[str] | None
+) -> list[tuple[int, dict[str, Any]]]:
+    result = db.session.execute(stmt)
+    if fields is None:
+        return [(getattr(row, key.key), row.to_dict()) for row in result.scalars()]
+    return [(row[0], dict(zip(fields, row[1:]))) for row in result]
+
+
+def fetch_items(
+    stmt: Select[Any],
+    key: InstrumentedAttribute[int],
+    page: Page,
+    fields: list[str] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Execute ``stmt`` for ``page`` ordered by ``key``.
+
+    The page continues strictly after the key of the previous page's last
+    row, so pages stay stable while rows are inserted or deleted and deep
+    pages cost the same as the first one. Without ``fields`` the rows are
+    loaded as ORM objects and serialised with ``to_dict``. With ``fields``
+    only ``key`` and those columns are selected, and the rows are returned
+    as plain dictionaries without hydrating any objects.
+
+    Returns the items and the cursor of the next page, or ``None`` when the
+    collection is exhausted. One extra row is read to tell the two apart.
+    """
+
+    stmt = _select_fields(stmt, key, fields).order_by(key)
+    if page.after is not None:
+        stmt = stmt.where(key > page.after)
+    if page.limit is not None:
+        stmt = stmt.limit(page.limit + 1)
+
+    keyed = _keyed_items(stmt, key, fields)
+    if page.limit is None or len(keyed) <= page.limit:
+        return [item for _, item in keyed], None
+    keyed = keyed[: page.limit]
+    return [item for _, item in keyed], encode_id_cursor(keyed[-1][0])
+
+
+def fetch_by_ids(
+    stmt: Select[Any],
+    key: InstrumentedAttribute[int],
+    ids: list[int],
+    fields: list[str] | None = None,
+) -> dict[str, list[Any]]:
+    """Resolve ``ids`` against ``stmt`` with a single ``IN`` query.
+
+    Returns the found ``items`` in the order of ``ids`` and the ``missing``
+    ids, which includes ids that exist but are filtered out by ``stmt``.
+    """
+
+    stmt = _select_fields(stmt, key, fields).where(key.in_(ids))
+    found = dict(_keyed_items(stmt, key, fields))
+    return {
+        "items": [found[item_id] for item_id in ids if item_id in found],
+        "missing": [item_id for item_id in ids if item_id not in found],
+    }
+
+
+def collection_response(
+    stmt: Select[Any],
+    key: InstrumentedAttribute[int],
+    related: Sequence[InstrumentedAttribute[Any]] = (),
+) -> ResponseReturnValue:
+    """Serve a collection endpoint backed by ``stmt``.
+
+    ``?ids=`` returns the listed rows as a lookup result, otherwise a keyset
+    page is returned. Both honour ``?fields=``; invalid arguments are
+    reported with ``422``. The response carries an ETag for the whole
+    filtered collection, varied by the projection, page and ids requested,
+    and a matching conditional request gets ``304`` before any row is
+    loaded; ``related`` names the many-to-one objects the rows serialise.
+    Collections send no ``Last-Modified``: a delete does not move the latest
+    ``updatedAt``, so ``If-Modified-Since`` could not notice it.
+    """
+
+    try:
+        fields = request_fields(key.class_)
+        ids_value = request.args.get("ids")
+        ids = None if ids_value is None else request_ids(ids_value)
+        page = request_page()
+    except ValueError as exc:
+        return {"message": str(exc)}, 422
+
+    scope = stmt if ids is None else stmt.where(key.in_(ids))
+    variant = json.dumps([fields, ids, page.after, page.limit])
+    validators = compute_validators(scope, key, related, variant)
+    validators = validators._replace(last_modified=None)
+    if not_modified(validators):
+        return not_modified_response(validators)
+
+    if ids is not None:
+        response = jsonify(fetch_by_ids(stmt, key, ids, fields))
+    else:
+        items, next_cursor = fetch_items(stmt, key, page, fields)
+        response = page_response(items, next_cursor)
+    return with_validators(response, validators), 200
+
+
+def lookup_response(
+    stmt: Select[Any], key: InstrumentedAttribute[int]
+) -> ResponseReturnValue:
+    """Serve a ``POST …/lookup`` endpoint for id lists too long for a URL.
+
+    The JSON body is ``{"ids": [...]}``; ``?fields=`` works as on the
+    collection itself.
+    """
+
+    data = request.get_json(silent=True) or {}
+    try:
+        fields = request_fields(key.class_)
+        ids = request_ids(data.get("ids") if isinstance(data, dict) else None)
+    except ValueError as exc:
+        return {"message": str(exc)}, 422
+    return jsonify(fetch_by_ids(stmt, key, ids, fields)), 200
+
+
+def page_response(items: list[Any], next_cursor: str | None) -> Response:
+    """Return ``items`` as a JSON list with the next-page headers.
+
+    When more rows follow, ``X-Next-Cursor`` carries the opaque cursor and
+    ``Link`` the URL of the next page with every other argument preserved.
+    """
+
+    response = jsonify(items)
+    if next_cursor is not None:
+        args = {**request.args.to_dict(), "after": next_cursor}
+        url = f"{request.path}?{urlencode(args)}"
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{url}>; rel="next"'
+    return response
@@ -0,0 +1,231 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final, Mapping, NamedTuple
+
+from sqlalchemy import ColumnElement, Select, and_, func, select
+
+from . import db
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Document,
+    Marking,
+    System,
+    User,
+)
+from .scoring import penalty_expression, severity_weights
+from .utils import rater_name
+
+
+DEFAULT_QUERY_LIMIT: Final[int] = 1000
+MEASURES: Final[tuple[str, ...]] = ("count", "penalty", "segments")
+
+
+class Dimension(NamedTuple):
+    """A group-by dimension: output columns, filter column and needed joins.
+
+    ``value_type`` is the Python type filter values must have, so that a
+    mismatched value is rejected before it reaches the database.
+    """
+
+    columns: tuple[tuple[str, Any], ...]
+    filter: Any
+    joins: tuple[str, ...]
+    value_type: type
+
+
+DIMENSIONS: Final[dict[str, Dimension]] = {
+    "evaluation": Dimension(
+        (("evaluationId", Annotation.evaluationId),),
+        Annotation.evaluationId,
+        ("annotation",),
+        int,
+    ),
+    "system": Dimension(
+        (("systemId", Marking.systemId), ("system", System.name)),
+        Marking.systemId,
+        ("system",),
+        int,
+    ),
+    "document": Dimension(
+        (("documentId", Bitext.documentId), ("document", Document.name)),
+        Bitext.documentId,
+        ("annotation", "bitext", "document"),
+        int,
+    ),
+    "user": Dimension(
+        (("userId", Annotation.userId), ("user", User.email)),
+        Annotation.userId,
+        ("annotation", "user"),
+        int,
+    ),
+    "category": Dimension(
+        (("category", Marking.errorCategory),), Marking.errorCategory, (), str
+    ),
+    "severity": Dimension(
+        (("severity", Marking.errorSeverity),), Marking.errorSeverity, (), str
+    ),
+    "isSource": Dimension(
+        (("isSource", Marking.isSource),), Marking.isSource, (), bool
+    ),
+    "nativeLanguage": Dimension(
+        (("nativeLanguage", User.nativeLanguage),),
+        User.nativeLanguage,
+        ("annotation", "user"),
+        str,
+    ),
+}
+
+# The only joins a query may use, applied in this order from ``marking``.
+_JOINS: Final[dict[str, tuple[Any, ColumnElement[bool]]]] = {
+    "annotation": (Annotation, Annotation.id == Marking.annotationId),
+    "segment": (
+        AnnotationSystem,
+        and_(
+            AnnotationSystem.annotationId == Marking.annotationId,
+            AnnotationSystem.systemId == Marking.systemId,
+        ),
+    ),
+    "system": (System, System.id == Marking.systemId),
+    "bitext": (Bitext, Bitext.id == Annotation.bitextId),
+    "document": (Document, Document.id == Bitext.documentId),
+    "user": (User, User.id == Annotation.userId),
+}
+
+
+def _names(value: Any, field: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{field} must be a list of names")
+    return value
+
+
+def _filter(name: str, value: Any) -> ColumnElement[bool]:
+    dimension = DIMENSIONS[name]
+    column: ColumnElement[Any] = dimension.filter
+    values = value if isinstance(value, list) else [value]
+    # ``type() is`` rather than ``isinstance`` so ``True`` is not taken as an id.
+    if not values or not all(type(item) is dimension.value_type for item in values):
+        raise ValueError(
+            f"Invalid filter value for {name}: "
+            f"expected {dimension.value_type.__name__}"
+        )
+    return column.in_(values)
+
+
+def compile_query(
+    spec: Mapping[str, Any], weights: Mapping[str, float] | None = None
+) -> tuple[Select[Any], list[str]]:
+    """Compile a query spec into one ``GROUP BY`` statement and its column keys.
+
+    ``spec`` holds ``groupBy`` (dimension names), ``filters`` (dimension name
+    to a value or list of values), ``measures`` (``count``, ``penalty`` and
+    ``segments``), an optional ``orderBy`` measure or output column, prefixed
+    with ``-`` for descending order, and an optional ``limit``. Raises
+    :class:`ValueError` for anything outside the allow-lists.
+    """
+
+    group_by = _names(spec.get("groupBy", []), "groupBy")
+    measures = _names(spec.get("measures", ["count"]), "measures")
+    filters = spec.get("filters", {})
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object")
+    unknown = [name for name in (*group_by, *filters) if name not in DIMENSIONS]
+    unknown += [name for name in measures if name not in MEASURES]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(set(unknown)))}")
+    if not measures:
+        raise ValueError("At least one measure is required")
+
+    labels: list[Any] = []
+    # Like the scores endpoint, only markings with a scored output count, so
+    # every measure sees the same rows whether or not ``segments`` is asked for.
+    joins: set[str] = {"segment"}
+    for name in dict.fromkeys(group_by):
+        dimension = DIMENSIONS[name]
+        labels.extend(column.label(key) for key, column in dimension.columns)
+        joins.update(dimension.joins)
+    conditions = []
+    for name, value in filters.items():
+        conditions.append(_filter(name, value))
+        joins.update(DIMENSIONS[name].joins)
+
+    aggregates: list[Any] = []
+    for name in dict.fromkeys(measures):
+        if name == "count":
+            aggregates.append(func.count(Marking.id).label("count"))
+        elif name == "penalty":
+            penalty = penalty_expression(severity_weights(weights))
+            aggregates.append(func.coalesce(func.sum(penalty), 0.0).label("penalty"))
+        else:
+            aggregates.append(
+                func.count(func.distinct(AnnotationSystem.id)).label("segments")
+            )
+
+    statement = select(*labels, *aggregates).select_from(Marking)
+    for name, (target, onclause) in _JOINS.items():
+        if name in joins:
+            statement = statement.join(target, onclause)
+    statement = statement.where(*conditions).group_by(*labels)
+
+    keys = [label.key for label in (*labels, *aggregates)]
+    order_by = spec.get("orderBy")
+    if order_by is None:
+        statement = statement.order_by(*labels)
+    else:
+        if not isinstance(order_by, str) or order_by.lstrip("-") not in keys:
+            raise ValueError("orderBy must name a measure or output column")
+        column = dict(zip(keys, (*labels, *aggregates)))[order_by.lstrip("-")]
+        statement = statement.order_by(
+            column.desc() if order_by.startswith("-") else column, *labels
+        )
+    return statement, keys
+
+
+def _labelled(row: dict[str, Any]) -> dict[str, Any]:
+    if "user" in row:
+        row["user"] = rater_name(row["user"])
+    return row
+
+
+def run_query(
+    spec: Mapping[str, Any],
+    weights: Mapping[str, float] | None = None,
+    max_rows: int = DEFAULT_QUERY_LIMIT,
+) -> dict[str, Any]:
+    """Run :func:`compile_query` and return its rows as plain dictionaries."""
+
+    limit = spec.get("limit", max_rows)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, max_rows)
+    statement, keys = compile_query(spec, weights)
+
+    # One extra row tells whether the result was cut off.
+    rows = db.session.execute(statement.limit(limit + 1)).all()
+    return {
+        "columns": keys,
+        "rows": [_labelled(dict(zip(keys, row))) for row in rows[:limit]],
+        "truncated": len(rows) > limit,
+    }
@@ -23,18 +23,34 @@ from __future__ import annotations
 
 from flask import Flask
 
-from . import annotation, bitext, document, evaluation, marking, system, user
+from . import (
+    analytics,
+    annotation,
+    bitext,
+    document,
+    evaluation,
+    export_job,
+    leaderboard,
+    marking,
+    sync,
+    system,
+    user,
+)
 
 
 def register_resources(app: Flask) -> None:
     """Register all resource blueprints with the Flask app."""
 
     for blueprint in (
+        analytics.bp,
         annotation.bp,
         bitext.bp,
         document.bp,
         evaluation.bp,
+        export_job.bp,
+        leaderboard.bp,
         marking.bp,
+        sync.bp,
         system.bp,
         user.bp,
     ):
@@ -0,0 +1,59 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, current_app, jsonify, request
+from flask.typing import ResponseReturnValue
+from flask_jwt_extended import jwt_required
+
+from ..queries import DEFAULT_QUERY_LIMIT, run_query
+from ..scoring import configured_weights, severity_weights
+
+
+bp = Blueprint("analytics", __name__)
+
+
+@bp.post("/api/analytics/query")
+@jwt_required()
+def query_markings() -> ResponseReturnValue:
+    """Run an allow-listed group-by query over markings.
+
+    The JSON body is the spec described in :func:`..queries.compile_query`,
+    plus optional ``weights`` overriding the configured severity weights.
+    """
+
+    spec = request.get_json(silent=True)
+    if not isinstance(spec, dict):
+        return {"message": "Query spec must be a JSON object"}, 422
+
+    try:
+        weights = severity_weights({**configured_weights(), **spec.get("weights", {})})
+    except (TypeError, ValueError):
+        return {"message": "Invalid weights"}, 422
+    max_rows = int(
+        current_app.config.get("ANALYTICS_QUERY_MAX_ROWS", DEFAULT_QUERY_LIMIT)
+    )
+    try:
+        result = run_query(spec, weights, max_rows)
+    except ValueError as exc:
+        return {"message": str(exc)}, 422
+    return jsonify(result), 200
@@ -24,14 +24,26 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask.typing import ResponseReturnValue
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.interfaces import ORMOption
 
 from .. import db
-from ..models import Annotation, Bitext, Evaluation, User
+from ..cache import invalidate_evaluation
+from ..conditional import resource_response
+from ..models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+from ..pagination import collection_response, lookup_response
 
 
 bp = Blueprint("annotations", __name__)
@@ -41,6 +53,20 @@ def _current_time() -> datetime:
     return datetime.now()
 
 
+def _annotation_loader_options() -> list[ORMOption]:
+    return Annotation.dict_loader_options(
+        strict=current_app.config.get("STRICT_RELATIONSHIP_LOADING", False)
+    )
+
+
+def _user_annotations(user_id: int) -> Select[tuple[Annotation]]:
+    return (
+        select(Annotation)
+        .options(*_annotation_loader_options())
+        .filter_by(userId=user_id)
+    )
+
+
 def _validate_required_fields(data: dict[str, Any], fields: list[str]) -> bool:
     return all(field in data for field in fields)
 
@@ -58,18 +84,31 @@ def _validate_foreign_keys(data: dict[str, Any]) -> tuple[bool, str | None]:
 @bp.get("/api/annotations")
 @jwt_required()
 def read_annotations() -> ResponseReturnValue:
-    """Return all annotations for the authenticated user."""
+    """Return a page of the authenticated user's annotations.
+
+    ``?ids=`` returns the listed annotations instead; ids of other users'
+    annotations are reported as missing.
+    """
 
     identity = get_jwt_identity()
     if identity is None:
         return {"message": "Missing user identity"}, 401
 
-    annotations = (
-        db.session.execute(select(Annotation).filter_by(userId=int(identity)))
-        .scalars()
-        .all()
+    return collection_response(
+        _user_annotations(int(identity)), Annotation.id, Annotation.dict_relationships()
     )
-    return jsonify([annotation.to_dict() for annotation in annotations]), 200
+
+
+@bp.post("/api/annotations/lookup")
+@jwt_required()
+def lookup_annotations() -> ResponseReturnValue:
+    """Return the user's annotations whose ids are listed in the JSON body."""
+
+    identity = get_jwt_identity()
+    if identity is None:
+        return {"message": "Missing user identity"}, 401
+
+    return lookup_response(_user_annotations(int(identity)), Annotation.id)
 
 
 @bp.post("/api/annotations")
@@ -99,6 +138,7 @@ def create_annotation() -> ResponseReturnValue:
         )
         db.session.add(annotation)
         db.session.commit()
+        invalidate_evaluation(annotation.evaluationId)
         return jsonify(annotation.to_dict()), 201
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -110,10 +150,66 @@ def create_annotation() -> ResponseReturnValue:
 def read_annotation(annotation_id: int) -> ResponseReturnValue:
     """Return a single annotation."""
 
-    annotation = db.session.get(Annotation, annotation_id)
+    stmt = (
+        select(Annotation)
+        .options(*_annotation_loader_options())
+        .filter_by(id=annotation_id)
+    )
+    return resource_response(
+        stmt, Annotation.id, "Annotation not found", Annotation.dict_relationships()
+    )
+
+
+@bp.get("/api/annotations/<int:annotation_id>/bundle")
+@jwt_required()
+def read_annotation_bundle(annotation_id: int) -> ResponseReturnValue:
+    """Return everything the annotate page needs for one annotation.
+
+    The annotation (with its evaluation and bitext), the bitexts of its
+    document, its system outputs with system names and its markings are read
+    with four queries, regardless of how many rows each part has.
+    """
+
+    annotation = db.session.execute(
+        select(Annotation)
+        .options(*_annotation_loader_options())
+        .filter_by(id=annotation_id)
+    ).scalar_one_or_none()
     if annotation is None:
         return {"message": "Annotation not found"}, 404
-    return jsonify(annotation.to_dict()), 200
+
+    identity = get_jwt_identity()
+    if identity is None or annotation.userId != int(identity):
+        return {"message": "Unauthorized"}, 401
+
+    bitexts = db.session.execute(
+        select(Bitext)
+        .filter_by(documentId=annotation.bitext.documentId)
+        .order_by(Bitext.id)
+    ).scalars()
+    systems = db.session.execute(
+        select(AnnotationSystem, System.name)
+        .join(System, System.id == AnnotationSystem.systemId)
+        .filter(AnnotationSystem.annotationId == annotation_id)
+        .order_by(AnnotationSystem.id)
+    )
+    markings = db.session.execute(
+        select(Marking).filter_by(annotationId=annotation_id).order_by(Marking.id)
+    ).scalars()
+    return (
+        jsonify(
+            {
+                "annotation": annotation.to_dict(),
+                "bitexts": [bitext.to_dict() for bitext in bitexts],
+                "systems": [
+                    {**annotation_system.to_dict(), "name": name}
+                    for annotation_system, name in systems
+                ],
+                "markings": [marking.to_dict() for marking in markings],
+            }
+        ),
+        200,
+    )
 
 
 @bp.put("/api/annotations/<int:annotation_id>")
@@ -134,6 +230,7 @@ def update_annotation(annotation_id: int) -> ResponseReturnValue:
     if not valid:
         return {"message": error_message}, 422
 
+    previous_evaluation_id = annotation.evaluationId
     try:
         annotation.userId = data["userId"]
         annotation.evaluationId = data["evaluationId"]
@@ -144,6 +241,7 @@ def update_annotation(annotation_id: int) -> ResponseReturnValue:
             annotation.comment = data["comment"]
         annotation.updatedAt = _current_time()
         db.session.commit()
+        invalidate_evaluation(previous_evaluation_id, annotation.evaluationId)
         return jsonify(annotation.to_dict()), 200
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -159,9 +257,11 @@ def delete_annotation(annotation_id: int) -> ResponseReturnValue:
     if annotation is None:
         return {"message": "Annotation not found"}, 404
 
+    evaluation_id = annotation.evaluationId
     try:
         db.session.delete(annotation)
         db.session.commit()
+        invalidate_evaluation(evaluation_id)
         return jsonify({}), 204
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -30,7 +30,9 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import db
+from ..conditional import resource_response
 from ..models import Bitext, Document
+from ..pagination import collection_response, lookup_response
 
 
 bp = Blueprint("bitexts", __name__)
@@ -43,10 +45,17 @@ def _current_time() -> datetime:
 @bp.get("/api/bitexts")
 @jwt_required()
 def read_bitexts() -> ResponseReturnValue:
-    """Return all bitexts."""
+    """Return a page of bitexts, or the bitexts listed in ``?ids=``."""
 
-    bitexts = db.session.execute(select(Bitext)).scalars().all()
-    return jsonify([bitext.to_dict() for bitext in bitexts]), 200
+    return collection_response(select(Bitext), Bitext.id)
+
+
+@bp.post("/api/bitexts/lookup")
+@jwt_required()
+def lookup_bitexts() -> ResponseReturnValue:
+    """Return the bitexts whose ids are listed in the JSON body."""
+
+    return lookup_response(select(Bitext), Bitext.id)
 
 
 @bp.post("/api/bitexts")
@@ -84,10 +93,8 @@ def create_bitext() -> ResponseReturnValue:
 def read_bitext(bitext_id: int) -> ResponseReturnValue:
     """Return a single bitext."""
 
-    bitext = db.session.get(Bitext, bitext_id)
-    if bitext is None:
-        return {"message": "Bitext not found"}, 404
-    return jsonify(bitext.to_dict()), 200
+    stmt = select(Bitext).filter_by(id=bitext_id)
+    return resource_response(stmt, Bitext.id, "Bitext not found")
 
 
 @bp.put("/api/bitexts/<int:bitext_id>")
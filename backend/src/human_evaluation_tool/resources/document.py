@@ -30,7 +30,9 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import db
+from ..conditional import resource_response
 from ..models import Bitext, Document
+from ..pagination import collection_response, lookup_response
 
 
 bp = Blueprint("documents", __name__)
@@ -43,10 +45,17 @@ def _current_time() -> datetime:
 @bp.get("/api/documents")
 @jwt_required()
 def read_documents() -> ResponseReturnValue:
-    """Return all documents."""
+    """Return a page of documents, or the documents listed in ``?ids=``."""
 
-    documents = db.session.execute(select(Document)).scalars().all()
-    return jsonify([document.to_dict() for document in documents]), 200
+    return collection_response(select(Document), Document.id)
+
+
+@bp.post("/api/documents/lookup")
+@jwt_required()
+def lookup_documents() -> ResponseReturnValue:
+    """Return the documents whose ids are listed in the JSON body."""
+
+    return lookup_response(select(Document), Document.id)
 
 
 @bp.post("/api/documents")
@@ -74,26 +83,20 @@ def create_document() -> ResponseReturnValue:
 def read_document(document_id: int) -> ResponseReturnValue:
     """Return a single document."""
 
-    document = db.session.get(Document, document_id)
-    if document is None:
-        return {"message": "Document not found"}, 404
-    return jsonify(document.to_dict()), 200
+    stmt = select(Document).filter_by(id=document_id)
+    return resource_response(stmt, Document.id, "Document not found")
 
 
 @bp.get("/api/documents/<int:document_id>/bitexts")
 @jwt_required()
 def read_document_bitexts(document_id: int) -> ResponseReturnValue:
-    """Return all bitexts for a document."""
+    """Return a page of the bitexts of a document."""
 
     if db.session.get(Document, document_id) is None:
         return {"message": "Document not found"}, 404
 
-    bitexts = (
-        db.session.execute(select(Bitext).filter_by(documentId=document_id))
-        .scalars()
-        .all()
-    )
-    return jsonify([bitext.to_dict() for bitext in bitexts]), 200
+    stmt = select(Bitext).filter_by(documentId=document_id)
+    return collection_response(stmt, Bitext.id)
 
 
 @bp.put("/api/documents/<int:document_id>")
@@ -22,26 +22,54 @@ Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable
-
-from flask import Blueprint, jsonify, request
+from io import BytesIO
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    send_file,
+    stream_with_context,
+)
 from flask.typing import ResponseReturnValue
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import db
-from ..models import (
-    Annotation,
-    AnnotationSystem,
-    Bitext,
-    Document,
-    Evaluation,
-    Marking,
-    System,
-    User,
+from ..agreement import evaluation_agreement
+from ..analytics import (
+    DEFAULT_POSITION_BINS,
+    MAX_POSITION_BINS,
+    evaluation_breakdowns,
+    evaluation_positions,
+)
+from ..cache import invalidate_evaluation
+from ..calibration import DEFAULT_Z_THRESHOLD, evaluation_calibration
+from ..columnar import COLUMNAR_MIMETYPE, evaluation_columns, write_columns
+from ..conditional import resource_response
+from ..cursors import decode_time_cursor
+from ..export import (
+    DEFAULT_STREAM_BATCH_SIZE,
+    RESULT_FORMATS,
+    cached_evaluation_results,
+    incremental_results,
+    stream_results,
+)
+from ..export_jobs import artifact_path, remove_artifacts
+from ..models import Annotation, Evaluation
+from ..pagination import collection_response, lookup_response
+from ..scoring import cached_evaluation_scores, configured_weights
+from ..significance import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_SAMPLES,
+    DEFAULT_SEED,
+    cached_compare_systems,
 )
-from ..utils import CATEGORY_NAME, SEVERITY_NAME
+from ..summaries import evaluation_summary
+from ..throughput import DEFAULT_IDLE_SECONDS, evaluation_throughput
 
 
 bp = Blueprint("evaluations", __name__)
@@ -51,22 +79,58 @@ def _current_time() -> datetime:
     return datetime.now()
 
 
+def _is_truthy(value: str | None) -> bool:
+    return value is not None and value.lower() in {"1", "true", "yes"}
+
+
+def _system_pair(value: str | None) -> tuple[int, int]:
+    parts = (value or "").split(",")
+    if len(parts) != 2:
+        raise ValueError("Expected two system ids")
+    first, second = (int(part) for part in parts)
+    if first == second:
+        raise ValueError("Expected two different systems")
+    return first, second
+
+
+def _time_range() -> tuple[datetime | None, datetime | None]:
+    bounds = [request.args.get("from"), request.args.get("to")]
+    start, end = (
+        None if bound is None else decode_time_cursor(bound) for bound in bounds
+    )
+    if start is not None and end is not None and start > end:
+        raise ValueError("Range ends before it starts")
+    return start, end
+
+
 def _annotations_for_evaluation(
     evaluation_id: int, user_id: int | None
-) -> Iterable[Annotation]:
-    stmt = select(Annotation).filter_by(evaluationId=evaluation_id)
+) -> Select[tuple[Annotation]]:
+    strict = current_app.config.get("STRICT_RELATIONSHIP_LOADING", False)
+    stmt = (
+        select(Annotation)
+        .options(*Annotation.dict_loader_options(strict=strict))
+        .filter_by(evaluationId=evaluation_id)
+    )
     if user_id is not None:
         stmt = stmt.filter_by(userId=user_id)
-    return db.session.execute(stmt).scalars().all()
+    return stmt
 
 
 @bp.get("/api/evaluations")
 @jwt_required()
 def read_evaluations() -> ResponseReturnValue:
-    """Return all evaluations."""
+    """Return a page of evaluations, or the evaluations listed in ``?ids=``."""
+
+    return collection_response(select(Evaluation), Evaluation.id)
 
-    evaluations = db.session.execute(select(Evaluation)).scalars().all()
-    return jsonify([evaluation.to_dict() for evaluation in evaluations]), 200
+
+@bp.post("/api/evaluations/lookup")
+@jwt_required()
+def lookup_evaluations() -> ResponseReturnValue:
+    """Return the evaluations whose ids are listed in the JSON body."""
+
+    return lookup_response(select(Evaluation), Evaluation.id)
 
 
 @bp.post("/api/evaluations")
@@ -107,16 +171,14 @@ def create_evaluation() -> ResponseReturnValue:
 def read_evaluation(evaluation_id: int) -> ResponseReturnValue:
     """Return a specific evaluation."""
 
-    evaluation = db.session.get(Evaluation, evaluation_id)
-    if evaluation is None:
-        return {"message": "Evaluation not found"}, 404
-    return jsonify(evaluation.to_dict()), 200
+    stmt = select(Evaluation).filter_by(id=evaluation_id)
+    return resource_response(stmt, Evaluation.id, "Evaluation not found")
 
 
 @bp.get("/api/evaluations/<int:evaluation_id>/annotations")
 @jwt_required()
 def read_evaluation_annotations(evaluation_id: int) -> ResponseReturnValue:
-    """Return annotations for a specific evaluation and the current user."""
+    """Return a page of an evaluation's annotations for the current user."""
 
     evaluation = db.session.get(Evaluation, evaluation_id)
     if evaluation is None:
@@ -124,80 +186,247 @@ def read_evaluation_annotations(evaluation_id: int) -> ResponseReturnValue:
 
     identity = get_jwt_identity()
     user_id = int(identity) if identity is not None else None
-    annotations = _annotations_for_evaluation(evaluation_id, user_id)
-    return jsonify([annotation.to_dict() for annotation in annotations]), 200
+    stmt = _annotations_for_evaluation(evaluation_id, user_id)
+    return collection_response(stmt, Annotation.id, Annotation.dict_relationships())
 
 
 @bp.get("/api/evaluations/<int:evaluation_id>/results")
 @jwt_required()
 def read_evaluation_results(evaluation_id: int) -> ResponseReturnValue:
-    """Return TSV formatted evaluation results."""
+    """Return TSV formatted evaluation results.
+
+    ``?format=`` selects ``json`` (default), ``tsv``, ``ndjson`` or the
+    columnar ``npz`` archive and ``?stream=1`` sends the text formats as a
+    chunked response read from a server-side cursor so worker memory stays
+    flat for large evaluations. ``?since=<cursor>`` returns only the rows and
+    deletions recorded after the cursor, plus the cursor for the next pull.
+    """
 
     if db.session.get(Evaluation, evaluation_id) is None:
         return {"message": "Evaluation not found"}, 404
 
-    annotations = (
-        db.session.execute(select(Annotation).filter_by(evaluationId=evaluation_id))
-        .scalars()
-        .all()
-    )
+    since = request.args.get("since")
+    if since is not None:
+        try:
+            since_time = decode_time_cursor(since)
+        except ValueError:
+            return {"message": "Invalid cursor"}, 422
+        return jsonify(incremental_results(evaluation_id, since_time)), 200
+
+    result_format = request.args.get("format", "json")
+    if result_format == "npz":
+        buffer = BytesIO()
+        write_columns(buffer, evaluation_columns(evaluation_id))
+        buffer.seek(0)
+        return send_file(
+            buffer,
+            mimetype=COLUMNAR_MIMETYPE,
+            as_attachment=True,
+            download_name=f"evaluation-{evaluation_id}.npz",
+        )
+
+    if result_format not in RESULT_FORMATS:
+        return {"message": "Invalid format"}, 422
 
-    results: list[str] = []
-    for annotation in annotations:
-        bitext = db.session.get(Bitext, annotation.bitextId)
-        user = db.session.get(User, annotation.userId)
-        if bitext is None or user is None:
-            continue
-        document = db.session.get(Document, bitext.documentId)
-        if document is None:
-            continue
-        markings = (
-            db.session.execute(select(Marking).filter_by(annotationId=annotation.id))
-            .scalars()
-            .all()
+    if _is_truthy(request.args.get("stream")):
+        batch_size = current_app.config.get(
+            "EXPORT_STREAM_BATCH_SIZE", DEFAULT_STREAM_BATCH_SIZE
+        )
+        chunks = stream_results(evaluation_id, result_format, batch_size)
+        return Response(
+            stream_with_context(chunks), mimetype=RESULT_FORMATS[result_format]
         )
 
-        for marking in markings:
-            annotation_system = db.session.execute(
-                select(AnnotationSystem).filter_by(
-                    annotationId=annotation.id, systemId=marking.systemId
-                )
-            ).scalar_one_or_none()
-            system = db.session.get(System, marking.systemId)
-
-            if annotation_system is None or system is None:
-                continue
-
-            row: list[str] = []
-            row.append(system.name)
-            row.append(document.name)
-            row.append(str(bitext.id))
-            row.append(str(bitext.id))
-            row.append(user.email.split("@")[0])
-
-            translation_text = annotation_system.translation or ""
-            if marking.isSource:
-                source = bitext.source.replace("\n", "<br>").split(" ")
-                source.insert(marking.errorStart, "<v>")
-                source.insert(marking.errorEnd + 2, "</v>")
-                row.append(" ".join(source))
-                row.append(translation_text.replace("\n", "<br>"))
-            else:
-                translation = translation_text.replace("\n", "<br>").split(" ")
-                translation.insert(marking.errorStart, "<v>")
-                translation.insert(marking.errorEnd + 2, "</v>")
-                row.append(bitext.source.replace("\n", "<br>"))
-                row.append(" ".join(translation))
-
-            row.append(CATEGORY_NAME[marking.errorCategory])
-            row.append(SEVERITY_NAME[marking.errorSeverity])
-            row.append(annotation.comment or "")
-
-            results.append("\t".join(row) + "\n")
+    if result_format == "ndjson":
+        body = "".join(stream_results(evaluation_id, result_format))
+        return Response(body, mimetype=RESULT_FORMATS[result_format])
 
+    workers = int(current_app.config.get("EXPORT_PROCESSES", 1))
+    results = cached_evaluation_results(evaluation_id, workers)
+    if result_format == "tsv":
+        return Response("".join(results), mimetype=RESULT_FORMATS[result_format])
     return jsonify(results), 200
 
 
+@bp.get("/api/evaluations/<int:evaluation_id>/scores")
+@jwt_required()
+def read_evaluation_scores(evaluation_id: int) -> ResponseReturnValue:
+    """Return MQM scores per system, document, annotator and category.
+
+    Severity weights come from the ``MQM_SEVERITY_WEIGHTS`` config key and can
+    be overridden per request with ``?weights=major:5,minor:1``.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        weights = configured_weights(request.args.get("weights", ""))
+    except ValueError:
+        return {"message": "Invalid weights"}, 422
+
+    return jsonify(cached_evaluation_scores(evaluation_id, weights)), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/breakdowns")
+@jwt_required()
+def read_evaluation_breakdowns(evaluation_id: int) -> ResponseReturnValue:
+    """Return MQM pivot tables of an evaluation.
+
+    Accepts the same ``?weights=`` overrides as the scores endpoint.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        weights = configured_weights(request.args.get("weights", ""))
+    except ValueError:
+        return {"message": "Invalid weights"}, 422
+
+    return jsonify(evaluation_breakdowns(evaluation_id, weights)), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/positions")
+@jwt_required()
+def read_evaluation_positions(evaluation_id: int) -> ResponseReturnValue:
+    """Return error-position histograms and span-length distributions.
+
+    ``?bins=`` sets the number of position bins (default 10).
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        bins = int(request.args.get("bins", DEFAULT_POSITION_BINS))
+    except ValueError:
+        bins = 0
+    if not 1 <= bins <= MAX_POSITION_BINS:
+        return {"message": "Invalid bins"}, 422
+
+    return jsonify(evaluation_positions(evaluation_id, bins)), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/throughput")
+@jwt_required()
+def read_evaluation_throughput(evaluation_id: int) -> ResponseReturnValue:
+    """Return per-annotator timing and throughput estimates.
+
+    ``?from=`` and ``?to=`` limit the ISO 8601 time range (``to`` exclusive)
+    and ``?idle=`` overrides the idle threshold in seconds.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        start, end = _time_range()
+    except ValueError:
+        return {"message": "Invalid date range"}, 422
+    default_idle = current_app.config.get(
+        "THROUGHPUT_IDLE_SECONDS", DEFAULT_IDLE_SECONDS
+    )
+    try:
+        idle_seconds = float(request.args.get("idle", default_idle))
+    except ValueError:
+        idle_seconds = 0.0
+    if not idle_seconds > 0:
+        return {"message": "Invalid idle threshold"}, 422
+
+    result = evaluation_throughput(evaluation_id, start, end, idle_seconds)
+    return jsonify(result), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/significance")
+@jwt_required()
+def read_evaluation_significance(evaluation_id: int) -> ResponseReturnValue:
+    """Compare two systems with a paired bootstrap over segments.
+
+    ``?systems=<id>,<id>`` is required; ``samples``, ``seed``, ``confidence``
+    and ``weights`` are optional. Results are cached per evaluation version.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        system_ids = _system_pair(request.args.get("systems"))
+    except ValueError:
+        return {"message": "Invalid systems"}, 422
+    max_samples = int(current_app.config.get("SIGNIFICANCE_MAX_SAMPLES", 100_000))
+    try:
+        samples = int(request.args.get("samples", DEFAULT_SAMPLES))
+    except ValueError:
+        samples = 0
+    if not 1 <= samples <= max_samples:
+        return {"message": "Invalid samples"}, 422
+    try:
+        seed = int(request.args.get("seed", DEFAULT_SEED))
+    except ValueError:
+        seed = -1
+    if seed < 0:
+        return {"message": "Invalid seed"}, 422
+    try:
+        confidence = float(request.args.get("confidence", DEFAULT_CONFIDENCE))
+    except ValueError:
+        confidence = 0.0
+    if not 0 < confidence < 1:
+        return {"message": "Invalid confidence"}, 422
+    try:
+        weights = configured_weights(request.args.get("weights", ""))
+    except ValueError:
+        return {"message": "Invalid weights"}, 422
+
+    result = cached_compare_systems(
+        evaluation_id, system_ids, samples, seed, confidence, weights
+    )
+    return jsonify(result), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/agreement")
+@jwt_required()
+def read_evaluation_agreement(evaluation_id: int) -> ResponseReturnValue:
+    """Return inter-annotator agreement over units judged by several raters."""
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    return jsonify(evaluation_agreement(evaluation_id)), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/summary")
+@jwt_required()
+def read_evaluation_summary(evaluation_id: int) -> ResponseReturnValue:
+    """Return progress and marking counts from the maintained summary tables."""
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    return jsonify(evaluation_summary(evaluation_id)), 200
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/calibration")
+@jwt_required()
+def read_evaluation_calibration(evaluation_id: int) -> ResponseReturnValue:
+    """Return annotator marking-rate and severity z-scores against their peers.
+
+    ``?threshold=`` sets the ``|z|`` above which an annotator is flagged.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    try:
+        threshold = float(request.args.get("threshold", DEFAULT_Z_THRESHOLD))
+    except ValueError:
+        threshold = 0.0
+    if not threshold > 0:
+        return {"message": "Invalid threshold"}, 422
+
+    return jsonify(evaluation_calibration(evaluation_id, threshold)), 200
+
+
 @bp.put("/api/evaluations/<int:evaluation_id>")
 @jwt_required()
 def update_evaluation(evaluation_id: int) -> ResponseReturnValue:
@@ -243,8 +472,11 @@ def delete_evaluation(evaluation_id: int) -> ResponseReturnValue:
         return {"message": "Evaluation not found"}, 404
 
     try:
+        artifacts = [artifact_path(job) for job in evaluation.export_jobs]
         db.session.delete(evaluation)
         db.session.commit()
+        invalidate_evaluation(evaluation_id)
+        remove_artifacts(artifacts)
         return jsonify({}), 204
     except SQLAlchemyError as exc:
         db.session.rollback()
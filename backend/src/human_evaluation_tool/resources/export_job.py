@@ -0,0 +1,191 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from flask import Blueprint, jsonify, request, send_file, url_for
+from flask.typing import ResponseReturnValue
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .. import db
+from ..export_jobs import (
+    ACTIVE_STATUSES,
+    ARTIFACT_MIMETYPES,
+    ARTIFACT_SUFFIXES,
+    artifact_path,
+    expire_stale_jobs,
+    process_owner,
+    remove_artifacts,
+    submit_export_job,
+)
+from ..models import Evaluation, ExportJob
+
+
+bp = Blueprint("export_jobs", __name__)
+
+EXPORT_JOB_PATH = "/api/evaluations/<int:evaluation_id>/exports/<int:job_id>"
+
+
+def _current_time() -> datetime:
+    return datetime.now()
+
+
+def _get_job(evaluation_id: int, job_id: int) -> ExportJob | None:
+    job = db.session.get(ExportJob, job_id)
+    if job is None or job.evaluationId != evaluation_id:
+        return None
+    return job
+
+
+def _job_payload(job: ExportJob) -> dict[str, Any]:
+    payload = job.to_dict()
+    payload["url"] = url_for(
+        "export_jobs.read_export_job", evaluation_id=job.evaluationId, job_id=job.id
+    )
+    if job.status == "finished":
+        payload["downloadUrl"] = url_for(
+            "export_jobs.download_export_job",
+            evaluation_id=job.evaluationId,
+            job_id=job.id,
+        )
+    return payload
+
+
+@bp.get("/api/evaluations/<int:evaluation_id>/exports")
+@jwt_required()
+def read_export_jobs(evaluation_id: int) -> ResponseReturnValue:
+    """Return the export jobs of an evaluation, newest first."""
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    jobs = (
+        db.session.execute(
+            select(ExportJob)
+            .filter_by(evaluationId=evaluation_id)
+            .order_by(ExportJob.id.desc())
+        )
+        .scalars()
+        .all()
+    )
+    expire_stale_jobs(jobs)
+    return jsonify([_job_payload(job) for job in jobs]), 200
+
+
+@bp.post("/api/evaluations/<int:evaluation_id>/exports")
+@jwt_required()
+def create_export_job(evaluation_id: int) -> ResponseReturnValue:
+    """Queue a background export of an evaluation's results.
+
+    The job runs on a worker pool inside this process and the request returns
+    ``202`` immediately; poll the job until it is ``finished`` or ``failed``.
+    """
+
+    if db.session.get(Evaluation, evaluation_id) is None:
+        return {"message": "Evaluation not found"}, 404
+
+    data = request.get_json(silent=True) or {}
+    result_format = data.get("format", "json")
+    if result_format not in ARTIFACT_SUFFIXES:
+        return {"message": "Invalid format"}, 422
+
+    try:
+        now = _current_time()
+        job = ExportJob(
+            evaluationId=evaluation_id,
+            format=result_format,
+            status="queued",
+            owner=process_owner(),
+            createdAt=now,
+            updatedAt=now,
+        )
+        db.session.add(job)
+        db.session.commit()
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        return {"message": str(exc)}, 500
+
+    payload = _job_payload(job)
+    submit_export_job(job.id)
+    return jsonify(payload), 202, {"Location": payload["url"]}
+
+
+@bp.get(EXPORT_JOB_PATH)
+@jwt_required()
+def read_export_job(evaluation_id: int, job_id: int) -> ResponseReturnValue:
+    """Return the status of an export job."""
+
+    job = _get_job(evaluation_id, job_id)
+    if job is None:
+        return {"message": "Export job not found"}, 404
+    expire_stale_jobs([job])
+    return jsonify(_job_payload(job)), 200
+
+
+@bp.get(f"{EXPORT_JOB_PATH}/download")
+@jwt_required()
+def download_export_job(evaluation_id: int, job_id: int) -> ResponseReturnValue:
+    """Send the artifact of a finished export job, honouring Range requests."""
+
+    job = _get_job(evaluation_id, job_id)
+    if job is None:
+        return {"message": "Export job not found"}, 404
+    if job.status != "finished":
+        return {"message": "Export job is not finished"}, 409
+
+    path = artifact_path(job)
+    if path is None or not path.is_file():
+        return {"message": "Export artifact not found"}, 404
+    return send_file(
+        path,
+        mimetype=ARTIFACT_MIMETYPES[job.format],
+        as_attachment=True,
+        download_name=path.name,
+        conditional=True,
+    )
+
+
+@bp.delete(EXPORT_JOB_PATH)
+@jwt_required()
+def delete_export_job(evaluation_id: int, job_id: int) -> ResponseReturnValue:
+    """Delete an export job and its artifact."""
+
+    job = _get_job(evaluation_id, job_id)
+    if job is None:
+        return {"message": "Export job not found"}, 404
+    expire_stale_jobs([job])
+    if job.status in ACTIVE_STATUSES:
+        return {"message": "Export job is still running"}, 409
+
+    path = artifact_path(job)
+    try:
+        db.session.delete(job)
+        db.session.commit()
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        return {"message": str(exc)}, 500
+    remove_artifacts([path])
+    return jsonify({}), 204
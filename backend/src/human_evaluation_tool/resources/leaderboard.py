@@ -0,0 +1,63 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, request
+from flask.typing import ResponseReturnValue
+from flask_jwt_extended import jwt_required
+
+from .. import db
+from ..leaderboard import leaderboard, system_leaderboard
+from ..models import System
+from ..scoring import configured_weights
+
+
+bp = Blueprint("leaderboard", __name__)
+
+
+@bp.get("/api/leaderboard")
+@jwt_required()
+def read_leaderboard() -> ResponseReturnValue:
+    """Rank all systems by MQM score across every evaluation."""
+
+    try:
+        weights = configured_weights(request.args.get("weights", ""))
+    except ValueError:
+        return {"message": "Invalid weights"}, 422
+
+    return jsonify(leaderboard(weights)), 200
+
+
+@bp.get("/api/systems/<int:system_id>/leaderboard")
+@jwt_required()
+def read_system_leaderboard(system_id: int) -> ResponseReturnValue:
+    """Return a system's MQM score and rank in each evaluation it appears in."""
+
+    if db.session.get(System, system_id) is None:
+        return {"message": "System not found"}, 404
+
+    try:
+        weights = configured_weights(request.args.get("weights", ""))
+    except ValueError:
+        return {"message": "Invalid weights"}, 422
+
+    return jsonify(system_leaderboard(system_id, weights)), 200
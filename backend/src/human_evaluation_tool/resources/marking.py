@@ -22,6 +22,7 @@ Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
 from flask import Blueprint, jsonify, request
 from flask.typing import ResponseReturnValue
@@ -30,7 +31,11 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import db
-from ..models import Annotation, Marking, System
+from ..cache import invalidate_evaluation
+from ..conditional import resource_response
+from ..models import Annotation, AnnotationSystem, Bitext, Marking, System
+from ..pagination import collection_response
+from ..tokens import is_valid_span
 
 
 MARKING_RESOURCE_PATH = (
@@ -64,6 +69,33 @@ def _require_system(system_id: int) -> ResponseReturnValue | None:
     return None
 
 
+def _validate_span(
+    annotation: Annotation, system_id: int, data: dict[str, Any]
+) -> ResponseReturnValue | None:
+    start, end = data["errorStart"], data["errorEnd"]
+    if not all(type(value) is int for value in (start, end)):
+        return {"message": "Invalid error span"}, 422
+
+    text: str | None
+    if data["isSource"]:
+        bitext = db.session.get(Bitext, annotation.bitextId)
+        text = bitext.source if bitext is not None else None
+    else:
+        annotation_system = db.session.execute(
+            select(AnnotationSystem).filter_by(
+                annotationId=annotation.id, systemId=system_id
+            )
+        ).scalar_one_or_none()
+        text = annotation_system.translation if annotation_system else None
+
+    # A span must be checked against its segment, so the segment must exist.
+    if text is None:
+        return {"message": "Segment not found"}, 422
+    if not is_valid_span(text, start, end):
+        return {"message": "Invalid error span"}, 422
+    return None
+
+
 def _get_marking(annotation_id: int, system_id: int, marking_id: int) -> Marking | None:
     return db.session.execute(
         select(Marking).filter_by(
@@ -75,19 +107,15 @@ def _get_marking(annotation_id: int, system_id: int, marking_id: int) -> Marking
 @bp.get("/api/annotations/<int:annotation_id>/markings")
 @jwt_required()
 def read_markings(annotation_id: int) -> ResponseReturnValue:
-    """Return markings for an annotation."""
+    """Return a page of the markings of an annotation."""
 
     annotation_or_error = _require_annotation(annotation_id)
     if not isinstance(annotation_or_error, Annotation):
         return annotation_or_error
     annotation = annotation_or_error
 
-    markings = (
-        db.session.execute(select(Marking).filter_by(annotationId=annotation.id))
-        .scalars()
-        .all()
-    )
-    return jsonify([marking.to_dict() for marking in markings]), 200
+    stmt = select(Marking).filter_by(annotationId=annotation.id)
+    return collection_response(stmt, Marking.id)
 
 
 @bp.post("/api/annotations/<int:annotation_id>/systems/<int:system_id>/markings")
@@ -115,6 +143,10 @@ def create_marking(annotation_id: int, system_id: int) -> ResponseReturnValue:
     if any(field not in data for field in required_fields):
         return {"message": "Missing required field"}, 422
 
+    span_error = _validate_span(annotation, system_id, data)
+    if span_error is not None:
+        return span_error
+
     try:
         now = _current_time()
         marking = Marking(
@@ -130,6 +162,7 @@ def create_marking(annotation_id: int, system_id: int) -> ResponseReturnValue:
         )
         db.session.add(marking)
         db.session.commit()
+        invalidate_evaluation(annotation.evaluationId)
         return jsonify(marking.to_dict()), 201
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -152,10 +185,10 @@ def read_marking(
     if system_error is not None:
         return system_error
 
-    marking = _get_marking(annotation.id, system_id, marking_id)
-    if marking is None:
-        return {"message": "Marking not found"}, 404
-    return jsonify(marking.to_dict()), 200
+    stmt = select(Marking).filter_by(
+        id=marking_id, annotationId=annotation.id, systemId=system_id
+    )
+    return resource_response(stmt, Marking.id, "Marking not found")
 
 
 @bp.put(MARKING_RESOURCE_PATH)
@@ -190,6 +223,10 @@ def update_marking(
     if any(field not in data for field in required_fields):
         return {"message": "Missing required field"}, 422
 
+    span_error = _validate_span(annotation, system_id, data)
+    if span_error is not None:
+        return span_error
+
     try:
         marking.errorStart = data["errorStart"]
         marking.errorEnd = data["errorEnd"]
@@ -198,6 +235,7 @@ def update_marking(
         marking.isSource = bool(data["isSource"])
         marking.updatedAt = _current_time()
         db.session.commit()
+        invalidate_evaluation(annotation.evaluationId)
         return jsonify(marking.to_dict()), 200
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -226,6 +264,7 @@ def delete_marking(
     try:
         db.session.delete(marking)
         db.session.commit()
+        invalidate_evaluation(annotation.evaluationId)
         return jsonify({}), 204
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -0,0 +1,54 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, request
+from flask.typing import ResponseReturnValue
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from ..cursors import decode_time_cursor
+from ..sync import user_changes
+
+
+bp = Blueprint("sync", __name__)
+
+
+@bp.get("/api/sync")
+@jwt_required()
+def read_sync() -> ResponseReturnValue:
+    """Return the current user's annotation data changed since ``?since=``.
+
+    Without a cursor the full state is returned. Every response carries the
+    cursor to pass on the next call.
+    """
+
+    identity = get_jwt_identity()
+    if identity is None:
+        return {"message": "Missing user identity"}, 401
+
+    since = request.args.get("since")
+    try:
+        since_time = None if since is None else decode_time_cursor(since)
+    except ValueError:
+        return {"message": "Invalid cursor"}, 422
+
+    return jsonify(user_changes(int(identity), since_time)), 200
@@ -30,7 +30,10 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import db
+from ..cache import invalidate_evaluation
+from ..conditional import resource_response
 from ..models import Annotation, AnnotationSystem, System
+from ..pagination import collection_response, lookup_response
 
 
 bp = Blueprint("systems", __name__)
@@ -40,6 +43,11 @@ def _current_time() -> datetime:
     return datetime.now()
 
 
+def _evaluation_id_for_annotation(annotation_id: int) -> int | None:
+    annotation = db.session.get(Annotation, annotation_id)
+    return annotation.evaluationId if annotation is not None else None
+
+
 def _get_annotation_system(
     annotation_id: int, system_id: int
 ) -> AnnotationSystem | None:
@@ -53,10 +61,17 @@ def _get_annotation_system(
 @bp.get("/api/systems")
 @jwt_required()
 def read_systems() -> ResponseReturnValue:
-    """Return all systems."""
+    """Return a page of systems, or the systems listed in ``?ids=``."""
+
+    return collection_response(select(System), System.id)
+
 
-    systems = db.session.execute(select(System)).scalars().all()
-    return jsonify([system.to_dict() for system in systems]), 200
+@bp.post("/api/systems/lookup")
+@jwt_required()
+def lookup_systems() -> ResponseReturnValue:
+    """Return the systems whose ids are listed in the JSON body."""
+
+    return lookup_response(select(System), System.id)
 
 
 @bp.post("/api/systems")
@@ -90,10 +105,8 @@ def create_system() -> ResponseReturnValue:
 def read_system(system_id: int) -> ResponseReturnValue:
     """Return a specific system."""
 
-    system = db.session.get(System, system_id)
-    if system is None:
-        return {"message": "System not found"}, 404
-    return jsonify(system.to_dict()), 200
+    stmt = select(System).filter_by(id=system_id)
+    return resource_response(stmt, System.id, "System not found")
 
 
 @bp.put("/api/systems/<int:system_id>")
@@ -146,19 +159,13 @@ def delete_system(system_id: int) -> ResponseReturnValue:
 @bp.get("/api/annotations/<int:annotation_id>/systems")
 @jwt_required()
 def read_annotation_systems(annotation_id: int) -> ResponseReturnValue:
-    """Return systems linked to an annotation."""
+    """Return a page of the systems linked to an annotation."""
 
     if db.session.get(Annotation, annotation_id) is None:
         return {"message": "Annotation not found"}, 404
 
-    systems = (
-        db.session.execute(
-            select(AnnotationSystem).filter_by(annotationId=annotation_id)
-        )
-        .scalars()
-        .all()
-    )
-    return jsonify([system.to_dict() for system in systems]), 200
+    stmt = select(AnnotationSystem).filter_by(annotationId=annotation_id)
+    return collection_response(stmt, AnnotationSystem.id)
 
 
 @bp.post("/api/annotations/<int:annotation_id>/systems")
@@ -166,7 +173,8 @@ def read_annotation_systems(annotation_id: int) -> ResponseReturnValue:
 def create_annotation_system(annotation_id: int) -> ResponseReturnValue:
     """Add a new system record for an annotation."""
 
-    if db.session.get(Annotation, annotation_id) is None:
+    annotation = db.session.get(Annotation, annotation_id)
+    if annotation is None:
         return {"message": "Annotation not found"}, 404
 
     data = request.get_json(silent=True) or {}
@@ -191,6 +199,7 @@ def create_annotation_system(annotation_id: int) -> ResponseReturnValue:
         )
         db.session.add(annotation_system)
         db.session.commit()
+        invalidate_evaluation(annotation.evaluationId)
         return jsonify(annotation_system.to_dict()), 201
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -202,10 +211,10 @@ def create_annotation_system(annotation_id: int) -> ResponseReturnValue:
 def read_annotation_system(annotation_id: int, system_id: int) -> ResponseReturnValue:
     """Return a specific annotation system entry."""
 
-    annotation_system = _get_annotation_system(annotation_id, system_id)
-    if annotation_system is None:
-        return {"message": "System not found"}, 404
-    return jsonify(annotation_system.to_dict()), 200
+    stmt = select(AnnotationSystem).filter_by(
+        annotationId=annotation_id, systemId=system_id
+    )
+    return resource_response(stmt, AnnotationSystem.id, "System not found")
 
 
 @bp.put("/api/annotations/<int:annotation_id>/systems/<int:system_id>")
@@ -225,6 +234,7 @@ def update_annotation_system(annotation_id: int, system_id: int) -> ResponseRetu
         annotation_system.translation = data["translation"]
         annotation_system.updatedAt = _current_time()
         db.session.commit()
+        invalidate_evaluation(_evaluation_id_for_annotation(annotation_id))
         return jsonify(annotation_system.to_dict()), 200
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -243,6 +253,7 @@ def delete_annotation_system(annotation_id: int, system_id: int) -> ResponseRetu
     try:
         db.session.delete(annotation_system)
         db.session.commit()
+        invalidate_evaluation(_evaluation_id_for_annotation(annotation_id))
         return jsonify({}), 204
     except SQLAlchemyError as exc:
         db.session.rollback()
@@ -30,7 +30,9 @@ from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
 
 from .. import bcrypt, db
+from ..conditional import resource_response
 from ..models import User
+from ..pagination import collection_response, lookup_response
 
 
 bp = Blueprint("users", __name__)
@@ -47,10 +49,17 @@ def _select_all_users() -> Select[tuple[User]]:
 @bp.get("/api/users")
 @jwt_required()
 def read_users() -> ResponseReturnValue:
-    """Return all users."""
+    """Return a page of users, or the users listed in ``?ids=``."""
 
-    users = db.session.execute(_select_all_users()).scalars().all()
-    return jsonify([user.to_dict() for user in users]), 200
+    return collection_response(_select_all_users(), User.id)
+
+
+@bp.post("/api/users/lookup")
+@jwt_required()
+def lookup_users() -> ResponseReturnValue:
+    """Return the users whose ids are listed in the JSON body."""
+
+    return lookup_response(_select_all_users(), User.id)
 
 
 @bp.post("/api/users")
@@ -91,10 +100,8 @@ def create_user() -> ResponseReturnValue:
 def read_user(user_id: int) -> ResponseReturnValue:
     """Return a specific user."""
 
-    user = db.session.get(User, user_id)
-    if user is None:
-        return {"message": "User not found"}, 404
-    return jsonify(user.to_dict()), 200
+    stmt = select(User).filter_by(id=user_id)
+    return resource_response(stmt, User.id, "User not found")
 
 
 @bp.put("/api/users/<int:user_id>")
@@ -0,0 +1,255 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from typing import Any, Final
+
+from flask import current_app
+from sqlalchemy import ColumnElement, Select, and_, case, func, select
+
+from . import db
+from .cache import VersionedCache, evaluation_version
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Document,
+    Marking,
+    System,
+    User,
+)
+from .utils import CATEGORY_NAME, SEVERITY_NAME, rater_name
+
+
+NO_ERROR_CATEGORY: Final = "000"
+
+# Penalty per marking by severity. "not-judgeable" markings are counted but
+# weigh nothing unless a deployment overrides their weight. Markings with the
+# no-error category or severity are never scored, so they have no weight.
+DEFAULT_SEVERITY_WEIGHTS: Final[dict[str, float]] = {
+    "minor": 1.0,
+    "major": 5.0,
+    "critical": 10.0,
+    "not-judgeable": 0.0,
+}
+
+# Scores keyed by evaluation id and the weights they were computed with.
+scores_cache: VersionedCache[dict[str, Any]] = VersionedCache(maxsize=32)
+
+_DIMENSIONS: Final = {
+    "systems": (System.id, System.name),
+    "documents": (Document.id, Document.name),
+    "annotators": (User.id, User.email),
+}
+
+
+def severity_weights(overrides: Mapping[str, Any] | None = None) -> dict[str, float]:
+    """Return the default weights updated with ``overrides``.
+
+    Raises :class:`ValueError` for unknown or unscored severities and for
+    weights that are not finite non-negative numbers.
+    """
+
+    weights = dict(DEFAULT_SEVERITY_WEIGHTS)
+    for severity, weight in (overrides or {}).items():
+        if severity not in SEVERITY_NAME:
+            raise ValueError(f"Unknown severity: {severity}")
+        if severity == "no-error":
+            raise ValueError("no-error markings are never penalised")
+        try:
+            value = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight for {severity}: {weight}") from None
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"Invalid weight for {severity}: {weight}")
+        weights[severity] = value
+    return weights
+
+
+def parse_weights(value: str) -> dict[str, float]:
+    """Parse comma-separated ``severity:weight`` overrides, e.g. ``major:5``."""
+
+    overrides: dict[str, float] = {}
+    for pair in filter(None, value.split(",")):
+        severity, separator, weight = pair.partition(":")
+        if not separator:
+            raise ValueError(f"Invalid weight: {pair}")
+        overrides[severity.strip()] = float(weight)
+    severity_weights(overrides)
+    return overrides
+
+
+def configured_weights(value: str = "") -> dict[str, float]:
+    """Return the ``MQM_SEVERITY_WEIGHTS`` config updated with ``value``.
+
+    ``value`` holds per-request overrides in :func:`parse_weights` syntax;
+    the result is passed on as ``weights`` overrides. The merged weights are
+    validated like :func:`severity_weights`, so a bad config value raises
+    :class:`ValueError` as well.
+    """
+
+    weights = dict(current_app.config.get("MQM_SEVERITY_WEIGHTS") or {})
+    weights.update(parse_weights(value))
+    severity_weights(weights)
+    return weights
+
+
+def penalty_expression(weights: Mapping[str, float]) -> ColumnElement[Any]:
+    """Return the SQL penalty of a marking under ``weights``."""
+
+    return case(
+        (Marking.errorCategory == NO_ERROR_CATEGORY, 0.0),
+        *((Marking.errorSeverity == name, weight) for name, weight in weights.items()),
+        else_=0.0,
+    )
+
+
+def _segments_statement(evaluation_id: int, *columns: Any) -> Select[Any]:
+    return (
+        select(*columns, func.count(AnnotationSystem.id))
+        .select_from(AnnotationSystem)
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .join(System, System.id == AnnotationSystem.systemId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(Document, Document.id == Bitext.documentId)
+        .join(User, User.id == Annotation.userId)
+        .where(Annotation.evaluationId == evaluation_id)
+        .group_by(*columns)
+    )
+
+
+def _penalties_statement(
+    evaluation_id: int, weights: Mapping[str, float], *columns: Any
+) -> Select[Any]:
+    return (
+        select(
+            *columns,
+            Marking.errorSeverity,
+            func.count(Marking.id),
+            func.sum(penalty_expression(weights)),
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .join(System, System.id == Marking.systemId)
+        .join(Bitext, Bitext.id == Annotation.bitextId)
+        .join(Document, Document.id == Bitext.documentId)
+        .join(User, User.id == Annotation.userId)
+        .where(
+            Annotation.evaluationId == evaluation_id,
+            Marking.errorCategory != NO_ERROR_CATEGORY,
+            Marking.errorSeverity != "no-error",
+        )
+        .group_by(*columns, Marking.errorSeverity)
+    )
+
+
+def _score_row(segments: int) -> dict[str, Any]:
+    return {"segments": segments, "penalty": 0.0, "score": 0.0, "errors": {}}
+
+
+def _add_penalty(row: dict[str, Any], severity: str, count: int, penalty: Any) -> None:
+    name = SEVERITY_NAME.get(severity, severity)
+    row["errors"][name] = row["errors"].get(name, 0) + count
+    row["penalty"] += float(penalty or 0)
+
+
+def _finish(row: dict[str, Any]) -> dict[str, Any]:
+    row["score"] = row["penalty"] / row["segments"] if row["segments"] else 0.0
+    return row
+
+
+def evaluation_scores(
+    evaluation_id: int, weights: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """Return MQM penalty scores of an evaluation, overall and per breakdown.
+
+    A segment is one system output judged by one annotator (an annotation
+    system row). Scores are the summed marking penalties divided by the
+    number of segments in the group; lower is better. Category scores are
+    divided by all segments of the evaluation.
+    """
+
+    weights = severity_weights(weights)
+    scores: dict[str, Any] = {"weights": weights}
+    overall = _score_row(0)
+
+    for dimension, (id_column, name_column) in _DIMENSIONS.items():
+        rows: dict[int, dict[str, Any]] = {}
+        for row_id, name, segments in db.session.execute(
+            _segments_statement(evaluation_id, id_column, name_column)
+        ):
+            if dimension == "annotators":
+                name = rater_name(name)
+            rows[row_id] = {"id": row_id, "name": name, **_score_row(segments)}
+        for row_id, severity, count, penalty in db.session.execute(
+            _penalties_statement(evaluation_id, weights, id_column)
+        ):
+            _add_penalty(rows[row_id], severity, count, penalty)
+            if dimension == "systems":
+                _add_penalty(overall, severity, count, penalty)
+        if dimension == "systems":
+            overall["segments"] = sum(row["segments"] for row in rows.values())
+        scores[dimension] = [_finish(row) for row in rows.values()]
+
+    categories: dict[str, dict[str, Any]] = {}
+    for category, severity, count, penalty in db.session.execute(
+        _penalties_statement(evaluation_id, weights, Marking.errorCategory)
+    ):
+        row = categories.setdefault(
+            category,
+            {
+                "category": category,
+                "name": CATEGORY_NAME.get(category, category),
+                **_score_row(overall["segments"]),
+            },
+        )
+        _add_penalty(row, severity, count, penalty)
+
+    scores["overall"] = _finish(overall)
+    scores["categories"] = [
+        _finish(categories[category]) for category in sorted(categories)
+    ]
+    return scores
+
+
+def cached_evaluation_scores(
+    evaluation_id: int, weights: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """Return :func:`evaluation_scores`, recomputing only when markings change."""
+
+    weights = severity_weights(weights)
+    key = (evaluation_id, *sorted(weights.items()))
+    version = evaluation_version(evaluation_id)
+    scores = scores_cache.get(key, version)
+    if scores is None:
+        scores = evaluation_scores(evaluation_id, weights)
+        scores_cache.set(key, version, scores)
+    return scores
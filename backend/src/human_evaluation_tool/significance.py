@@ -0,0 +1,226 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final, Mapping
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import and_, func, select
+
+from . import db
+from .cache import VersionedCache, evaluation_version
+from .models import Annotation, AnnotationSystem, Marking, System
+from .scoring import NO_ERROR_CATEGORY, penalty_expression, severity_weights
+
+
+DEFAULT_SAMPLES: Final = 1000
+DEFAULT_SEED: Final = 0
+DEFAULT_CONFIDENCE: Final = 0.95
+
+# Upper bound on resampled penalties materialised at once; larger requests are
+# drawn in several index matrices of this many cells.
+BOOTSTRAP_CHUNK_CELLS: Final = 4_000_000
+
+significance_cache: VersionedCache[dict[str, Any]] = VersionedCache(maxsize=32)
+
+
+def segment_penalties(
+    evaluation_id: int,
+    system_ids: tuple[int, int],
+    weights: Mapping[str, float] | None = None,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """Return the bitexts judged for both systems and their mean penalties.
+
+    The penalty of a segment is the marking penalty averaged over the
+    annotators who judged that system output. Column ``i`` of the returned
+    matrix belongs to ``system_ids[i]``.
+    """
+
+    weights = severity_weights(weights)
+    in_systems = AnnotationSystem.systemId.in_(system_ids)
+    units = db.session.execute(
+        select(
+            Annotation.bitextId,
+            AnnotationSystem.systemId,
+            func.count(AnnotationSystem.id),
+        )
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .where(Annotation.evaluationId == evaluation_id, in_systems)
+        .group_by(Annotation.bitextId, AnnotationSystem.systemId)
+    ).all()
+    penalties = db.session.execute(
+        select(
+            Annotation.bitextId,
+            Marking.systemId,
+            func.sum(penalty_expression(weights)),
+        )
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .join(
+            AnnotationSystem,
+            and_(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            ),
+        )
+        .where(
+            Annotation.evaluationId == evaluation_id,
+            in_systems,
+            Marking.errorCategory != NO_ERROR_CATEGORY,
+            Marking.errorSeverity != "no-error",
+        )
+        .group_by(Annotation.bitextId, Marking.systemId)
+    ).all()
+
+    bitext_ids = np.unique(np.array([row[0] for row in units], dtype=np.int64))
+    counts = np.zeros((len(bitext_ids), 2), dtype=np.int64)
+    totals = np.zeros((len(bitext_ids), 2), dtype=np.float64)
+    column = {system_id: index for index, system_id in enumerate(system_ids)}
+    for bitext_id, system_id, count in units:
+        counts[np.searchsorted(bitext_ids, bitext_id), column[system_id]] = count
+    for bitext_id, system_id, penalty in penalties:
+        totals[np.searchsorted(bitext_ids, bitext_id), column[system_id]] = float(
+            penalty or 0
+        )
+
+    paired = (counts > 0).all(axis=1)
+    return bitext_ids[paired], totals[paired] / counts[paired]
+
+
+def paired_bootstrap(
+    penalties: npt.NDArray[np.float64],
+    samples: int = DEFAULT_SAMPLES,
+    seed: int | None = DEFAULT_SEED,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> dict[str, Any]:
+    """Resample segments with replacement and compare two systems' mean penalties.
+
+    Each resample is a row of a ``(samples, segments)`` index matrix, so both
+    systems see the same segments. ``pValue`` is the two-sided share of
+    resamples in which the sign of the difference is not preserved.
+    """
+
+    segments = len(penalties)
+    rng = np.random.default_rng(seed)
+    means = np.empty((samples, 2), dtype=np.float64)
+    chunk = max(1, BOOTSTRAP_CHUNK_CELLS // max(1, segments))
+    for start in range(0, samples, chunk):
+        stop = min(samples, start + chunk)
+        indexes = rng.integers(0, segments, size=(stop - start, segments))
+        means[start:stop] = penalties[indexes].mean(axis=1)
+
+    deltas = means[:, 0] - means[:, 1]
+    tail = (1 - confidence) / 2
+    bounds = [tail, 1 - tail]
+    p_value = 2 * min(np.mean(deltas <= 0), np.mean(deltas >= 0))
+    return {
+        "scores": penalties.mean(axis=0).tolist(),
+        "intervals": np.quantile(means, bounds, axis=0).T.tolist(),
+        "delta": float(penalties[:, 0].mean() - penalties[:, 1].mean()),
+        "deltaInterval": np.quantile(deltas, bounds).tolist(),
+        "pValue": float(min(1.0, p_value)),
+    }
+
+
+def compare_systems(
+    evaluation_id: int,
+    system_ids: tuple[int, int],
+    samples: int = DEFAULT_SAMPLES,
+    seed: int | None = DEFAULT_SEED,
+    confidence: float = DEFAULT_CONFIDENCE,
+    weights: Mapping[str, float] | None = None,
+) -> dict[str, Any]:
+    """Run a paired bootstrap between two systems of an evaluation.
+
+    When no segment was judged for both systems the scores, intervals and
+    p-value are ``None``.
+    """
+
+    weights = severity_weights(weights)
+    bitext_ids, penalties = segment_penalties(evaluation_id, system_ids, weights)
+    names: dict[int, str] = {
+        row.id: row.name
+        for row in db.session.execute(
+            select(System.id, System.name).where(System.id.in_(system_ids))
+        )
+    }
+    result: dict[str, Any] = {
+        "segments": len(bitext_ids),
+        "samples": samples,
+        "seed": seed,
+        "confidence": confidence,
+        "weights": weights,
+    }
+    stats: dict[str, Any]
+    if len(bitext_ids):
+        stats = paired_bootstrap(penalties, samples, seed, confidence)
+    else:
+        stats = {
+            "scores": [None, None],
+            "intervals": [None, None],
+            "delta": None,
+            "deltaInterval": None,
+            "pValue": None,
+        }
+    result["systems"] = [
+        {
+            "id": system_id,
+            "name": names.get(system_id),
+            "score": score,
+            "interval": interval,
+        }
+        for system_id, score, interval in zip(
+            system_ids, stats.pop("scores"), stats.pop("intervals")
+        )
+    ]
+    result.update(stats)
+    return result
+
+
+def cached_compare_systems(
+    evaluation_id: int,
+    system_ids: tuple[int, int],
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED,
+    confidence: float = DEFAULT_CONFIDENCE,
+    weights: Mapping[str, float] | None = None,
+) -> dict[str, Any]:
+    """Return :func:`compare_systems`, recomputing only when markings change."""
+
+    weights = severity_weights(weights)
+    key = (
+        evaluation_id,
+        *system_ids,
+        samples,
+        seed,
+        confidence,
+        *sorted(weights.items()),
+    )
+    version = evaluation_version(evaluation_id)
+    result = significance_cache.get(key, version)
+    if result is None:
+        result = compare_systems(
+            evaluation_id, system_ids, samples, seed, confidence, weights
+        )
+        significance_cache.set(key, version, result)
+    return result
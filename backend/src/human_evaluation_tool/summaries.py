@@ -0,0 +1,625 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    Connection,
+    Table,
+    case,
+    delete,
+    event,
+    func,
+    inspect,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import db
+from .models import (
+    Annotation,
+    AnnotationSystem,
+    Evaluation,
+    EvaluationProgress,
+    Marking,
+    MarkingSummary,
+    SystemSegments,
+)
+
+
+SummaryKey = tuple[int, int, str, str]
+SegmentKey = tuple[int, int]
+OutputKey = tuple[int, int]
+ProgressCounts = tuple[int, int]
+
+
+class Summaries(NamedTuple):
+    """Counter rows keyed like the summary tables."""
+
+    markings: dict[SummaryKey, int]
+    segments: dict[SegmentKey, int]
+    progress: dict[int, ProgressCounts]
+
+
+_MARKING_KEY = ("systemId", "errorCategory", "errorSeverity")
+
+
+def _previous(session: Session, instance: Any, name: str) -> Any:
+    history = inspect(instance).attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if not history.added:
+        return getattr(instance, name)
+    # Expired attributes keep no previous value, so read it back.
+    model = type(instance)
+    return session.scalar(select(getattr(model, name)).where(model.id == instance.id))
+
+
+def _evaluation_of(
+    session: Session, annotation_id: int, previous: bool = False
+) -> int | None:
+    annotation = session.get(Annotation, annotation_id)
+    if annotation is None:
+        return None
+    if previous:
+        return int(_previous(session, annotation, "evaluationId"))
+    return annotation.evaluationId
+
+
+def _marking_key(
+    session: Session, marking: Marking, previous: bool = False
+) -> SummaryKey | None:
+    if previous:
+        annotation_id = _previous(session, marking, "annotationId")
+        values = [_previous(session, marking, name) for name in _MARKING_KEY]
+    else:
+        annotation_id = marking.annotationId
+        values = [getattr(marking, name) for name in _MARKING_KEY]
+    evaluation_id = _evaluation_of(session, annotation_id, previous)
+    if evaluation_id is None:
+        return None
+    return (evaluation_id, values[0], values[1], values[2])
+
+
+def _segment_key(
+    session: Session, annotation_system: AnnotationSystem, previous: bool = False
+) -> SegmentKey | None:
+    if previous:
+        annotation_id = _previous(session, annotation_system, "annotationId")
+        system_id = _previous(session, annotation_system, "systemId")
+    else:
+        annotation_id = annotation_system.annotationId
+        system_id = annotation_system.systemId
+    evaluation_id = _evaluation_of(session, annotation_id, previous)
+    if evaluation_id is None:
+        return None
+    return (evaluation_id, system_id)
+
+
+def _system_outputs(
+    session: Session, annotation_ids: set[int]
+) -> dict[OutputKey, set[int]]:
+    """Return the stored system output ids per (annotation, system) pair."""
+
+    outputs: dict[OutputKey, set[int]] = {}
+    if annotation_ids:
+        rows = session.execute(
+            select(
+                AnnotationSystem.id,
+                AnnotationSystem.annotationId,
+                AnnotationSystem.systemId,
+            ).where(AnnotationSystem.annotationId.in_(annotation_ids))
+        )
+        for output_id, annotation_id, system_id in rows:
+            outputs.setdefault((annotation_id, system_id), set()).add(output_id)
+    return outputs
+
+
+def _collect_deltas(
+    session: Session,
+) -> tuple[Counter[SummaryKey], Counter[SegmentKey], dict[int, Counter[str]], set[int]]:
+    markings: Counter[SummaryKey] = Counter()
+    segments: Counter[SegmentKey] = Counter()
+    progress: dict[int, Counter[str]] = {}
+    changed = (*session.dirty, *session.deleted)
+    handled = {instance.id for instance in changed if isinstance(instance, Marking)}
+    handled_systems = {
+        instance.id for instance in changed if isinstance(instance, AnnotationSystem)
+    }
+
+    def _progress(evaluation_id: int, annotations: int, annotated: int) -> None:
+        counter = progress.setdefault(evaluation_id, Counter())
+        counter["annotations"] += annotations
+        counter["annotated"] += annotated
+
+    for instance in session.new:
+        if isinstance(instance, AnnotationSystem):
+            segment = _segment_key(session, instance)
+            if segment is not None:
+                segments[segment] += 1
+        elif isinstance(instance, Annotation):
+            _progress(instance.evaluationId, 1, int(bool(instance.isAnnotated)))
+
+    for instance in session.deleted:
+        if isinstance(instance, AnnotationSystem):
+            segment = _segment_key(session, instance, previous=True)
+            if segment is not None:
+                segments[segment] -= 1
+        elif isinstance(instance, Annotation):
+            _progress(
+                _previous(session, instance, "evaluationId"),
+                -1,
+                -int(bool(_previous(session, instance, "isAnnotated"))),
+            )
+
+    moved: set[int] = set()
+    for instance in session.dirty:
+        if not session.is_modified(instance):
+            continue
+        if isinstance(instance, AnnotationSystem):
+            old_segment = _segment_key(session, instance, previous=True)
+            new_segment = _segment_key(session, instance)
+            if old_segment != new_segment:
+                if old_segment is not None:
+                    segments[old_segment] -= 1
+                if new_segment is not None:
+                    segments[new_segment] += 1
+        elif isinstance(instance, Annotation):
+            old_evaluation = _previous(session, instance, "evaluationId")
+            old_annotated = int(bool(_previous(session, instance, "isAnnotated")))
+            _progress(old_evaluation, -1, -old_annotated)
+            _progress(instance.evaluationId, 1, int(bool(instance.isAnnotated)))
+            if old_evaluation == instance.evaluationId:
+                continue
+            moved.add(instance.id)
+            # System outputs of a moved annotation follow it unless this flush
+            # already accounts for them.
+            moved_systems = session.execute(
+                select(AnnotationSystem.systemId, func.count(AnnotationSystem.id))
+                .where(
+                    AnnotationSystem.annotationId == instance.id,
+                    AnnotationSystem.id.not_in(handled_systems),
+                )
+                .group_by(AnnotationSystem.systemId)
+            )
+            for system_id, count in moved_systems:
+                segments[(old_evaluation, system_id)] -= count
+                segments[(instance.evaluationId, system_id)] += count
+
+    # Like the scores endpoint, a marking only counts while its annotation has
+    # a system output for the marking's system. ``before`` holds the stored
+    # outputs; ``leaving`` and ``arriving`` are what this flush changes.
+    modified = [
+        *session.new,
+        *session.deleted,
+        *(instance for instance in session.dirty if session.is_modified(instance)),
+    ]
+    changed_markings = [
+        instance for instance in modified if isinstance(instance, Marking)
+    ]
+    changed_outputs = [
+        instance for instance in modified if isinstance(instance, AnnotationSystem)
+    ]
+    pairs: set[OutputKey] = set()
+    rows: list[Marking | AnnotationSystem] = [*changed_markings, *changed_outputs]
+    for instance in rows:
+        if instance not in session.new:
+            pairs.add(
+                (
+                    _previous(session, instance, "annotationId"),
+                    _previous(session, instance, "systemId"),
+                )
+            )
+        pairs.add((instance.annotationId, instance.systemId))
+    before = _system_outputs(
+        session, {annotation_id for annotation_id, _ in pairs} | moved
+    )
+    leaving = {
+        instance.id for instance in changed_outputs if instance not in session.new
+    }
+    arriving = {
+        (instance.annotationId, instance.systemId)
+        for instance in changed_outputs
+        if instance not in session.deleted
+    }
+
+    def _scored_after(pair: OutputKey) -> bool:
+        return bool(before.get(pair, set()) - leaving) or pair in arriving
+
+    for instance in changed_markings:
+        if instance not in session.new:
+            old = _marking_key(session, instance, previous=True)
+            old_pair = (
+                _previous(session, instance, "annotationId"),
+                _previous(session, instance, "systemId"),
+            )
+            if old is not None and old_pair in before:
+                markings[old] -= 1
+        if instance not in session.deleted:
+            new = _marking_key(session, instance)
+            if new is not None and _scored_after(
+                (instance.annotationId, instance.systemId)
+            ):
+                markings[new] += 1
+
+    # Markings this flush leaves alone still move with their annotation, and
+    # start or stop counting when their system output appears or goes away.
+    toggled = [pair for pair in pairs if (pair in before) != _scored_after(pair)]
+    conditions = []
+    if toggled:
+        conditions.append(tuple_(Marking.annotationId, Marking.systemId).in_(toggled))
+    if moved:
+        conditions.append(Marking.annotationId.in_(moved))
+    if conditions:
+        untouched = session.execute(
+            select(
+                Marking.annotationId,
+                Marking.systemId,
+                Marking.errorCategory,
+                Marking.errorSeverity,
+                func.count(Marking.id),
+            )
+            .where(or_(*conditions), Marking.id.not_in(handled))
+            .group_by(
+                Marking.annotationId,
+                *(getattr(Marking, name) for name in _MARKING_KEY),
+            )
+        )
+        for annotation_id, system_id, category, severity, count in untouched:
+            pair = (annotation_id, system_id)
+            old_evaluation = _evaluation_of(session, annotation_id, previous=True)
+            new_evaluation = _evaluation_of(session, annotation_id)
+            if old_evaluation is not None and pair in before:
+                markings[(old_evaluation, system_id, category, severity)] -= count
+            if new_evaluation is not None and _scored_after(pair):
+                markings[(new_evaluation, system_id, category, severity)] += count
+
+    removed = {
+        instance.id for instance in session.deleted if isinstance(instance, Evaluation)
+    }
+    return markings, segments, progress, removed
+
+
+def _increment(
+    connection: Connection,
+    table: Table,
+    keys: dict[str, Any],
+    increments: dict[str, int],
+) -> None:
+    dialect = connection.dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(table).values(**keys, **increments)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={
+                    name: table.c[name] + statement.excluded[name]
+                    for name in increments
+                },
+            )
+        )
+        return
+
+    conditions = [table.c[name] == value for name, value in keys.items()]
+    updated = connection.execute(
+        table.update()
+        .where(*conditions)
+        .values({name: table.c[name] + value for name, value in increments.items()})
+    )
+    if not updated.rowcount:
+        connection.execute(table.insert().values(**keys, **increments))
+
+
+def _update_summaries(session: Session, *args: Any) -> None:
+    """Apply the marking and progress deltas of this flush to the summaries.
+
+    The counters are written through the session's connection, so they
+    commit or roll back together with the rows that changed them.
+    """
+
+    with session.no_autoflush:
+        markings, segments, progress, removed = _collect_deltas(session)
+    if not (markings or segments or progress or removed):
+        return
+
+    connection = session.connection()
+    summary: Table = MarkingSummary.__table__  # type: ignore[assignment]
+    systems: Table = SystemSegments.__table__  # type: ignore[assignment]
+    counters: Table = EvaluationProgress.__table__  # type: ignore[assignment]
+    for (evaluation_id, system_id, category, severity), delta in markings.items():
+        if delta and evaluation_id not in removed:
+            _increment(
+                connection,
+                summary,
+                {
+                    "evaluationId": evaluation_id,
+                    "systemId": system_id,
+                    "errorCategory": category,
+                    "errorSeverity": severity,
+                },
+                {"count": delta},
+            )
+    for (evaluation_id, system_id), delta in segments.items():
+        if delta and evaluation_id not in removed:
+            _increment(
+                connection,
+                systems,
+                {"evaluationId": evaluation_id, "systemId": system_id},
+                {"segments": delta},
+            )
+    for evaluation_id, counter in progress.items():
+        if any(counter.values()) and evaluation_id not in removed:
+            _increment(
+                connection,
+                counters,
+                {"evaluationId": evaluation_id},
+                {
+                    "annotations": counter["annotations"],
+                    "annotated": counter["annotated"],
+                },
+            )
+
+    touched = {key[0] for key in markings} | removed
+    if touched:
+        connection.execute(
+            delete(summary).where(
+                summary.c.evaluationId.in_(touched), summary.c.count == 0
+            )
+        )
+    touched_systems = {key[0] for key in segments} | removed
+    if touched_systems:
+        connection.execute(
+            delete(systems).where(
+                systems.c.evaluationId.in_(touched_systems), systems.c.segments == 0
+            )
+        )
+    if removed:
+        for table in (counters, summary, systems):
+            connection.execute(delete(table).where(table.c.evaluationId.in_(removed)))
+
+
+def register_summary_listener() -> None:
+    """Keep the summary tables in step with every flush of the shared session."""
+
+    if not event.contains(db.session, "before_flush", _update_summaries):
+        event.listen(db.session, "before_flush", _update_summaries)
+
+
+def expected_summaries(evaluation_ids: Iterable[int] | None = None) -> Summaries:
+    """Compute the summary rows from the markings and annotations themselves."""
+
+    marking_statement = (
+        select(
+            Annotation.evaluationId,
+            Marking.systemId,
+            Marking.errorCategory,
+            Marking.errorSeverity,
+            func.count(Marking.id),
+        )
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .where(
+            select(AnnotationSystem.id)
+            .where(
+                AnnotationSystem.annotationId == Marking.annotationId,
+                AnnotationSystem.systemId == Marking.systemId,
+            )
+            .exists()
+        )
+        .group_by(
+            Annotation.evaluationId,
+            Marking.systemId,
+            Marking.errorCategory,
+            Marking.errorSeverity,
+        )
+    )
+    segment_statement = (
+        select(
+            Annotation.evaluationId,
+            AnnotationSystem.systemId,
+            func.count(AnnotationSystem.id),
+        )
+        .join(Annotation, Annotation.id == AnnotationSystem.annotationId)
+        .group_by(Annotation.evaluationId, AnnotationSystem.systemId)
+    )
+    progress_statement = select(
+        Annotation.evaluationId,
+        func.count(Annotation.id),
+        func.coalesce(func.sum(case((Annotation.isAnnotated, 1), else_=0)), 0),
+    ).group_by(Annotation.evaluationId)
+    if evaluation_ids is not None:
+        ids = list(evaluation_ids)
+        marking_statement = marking_statement.where(Annotation.evaluationId.in_(ids))
+        segment_statement = segment_statement.where(Annotation.evaluationId.in_(ids))
+        progress_statement = progress_statement.where(Annotation.evaluationId.in_(ids))
+
+    markings = {
+        (row[0], row[1], row[2], row[3]): int(row[4])
+        for row in db.session.execute(marking_statement)
+    }
+    segments = {
+        (row[0], row[1]): int(row[2]) for row in db.session.execute(segment_statement)
+    }
+    progress = {
+        row[0]: (int(row[1]), int(row[2]))
+        for row in db.session.execute(progress_statement)
+    }
+    return Summaries(markings, segments, progress)
+
+
+def stored_summaries(evaluation_ids: Iterable[int] | None = None) -> Summaries:
+    """Return the non-zero rows currently held in the summary tables."""
+
+    marking_statement = select(MarkingSummary).where(MarkingSummary.count != 0)
+    segment_statement = select(SystemSegments).where(SystemSegments.segments != 0)
+    progress_statement = select(EvaluationProgress).where(
+        (EvaluationProgress.annotations != 0) | (EvaluationProgress.annotated != 0)
+    )
+    if evaluation_ids is not None:
+        ids = list(evaluation_ids)
+        marking_statement = marking_statement.where(
+            MarkingSummary.evaluationId.in_(ids)
+        )
+        segment_statement = segment_statement.where(
+            SystemSegments.evaluationId.in_(ids)
+        )
+        progress_statement = progress_statement.where(
+            EvaluationProgress.evaluationId.in_(ids)
+        )
+
+    markings = {
+        (row.evaluationId, row.systemId, row.errorCategory, row.errorSeverity): (
+            row.count
+        )
+        for row in db.session.execute(marking_statement).scalars()
+    }
+    segments = {
+        (row.evaluationId, row.systemId): row.segments
+        for row in db.session.execute(segment_statement).scalars()
+    }
+    progress = {
+        row.evaluationId: (row.annotations, row.annotated)
+        for row in db.session.execute(progress_statement).scalars()
+    }
+    return Summaries(markings, segments, progress)
+
+
+def summary_drift(evaluation_ids: Iterable[int] | None = None) -> list[str]:
+    """Describe every difference between the stored and recomputed summaries."""
+
+    ids = None if evaluation_ids is None else list(evaluation_ids)
+    expected_markings, expected_segments, expected_progress = expected_summaries(ids)
+    stored_markings, stored_segments, stored_progress = stored_summaries(ids)
+
+    drift = []
+    for key in sorted(expected_markings.keys() | stored_markings.keys()):
+        stored, expected = stored_markings.get(key, 0), expected_markings.get(key, 0)
+        if stored != expected:
+            evaluation_id, system_id, category, severity = key
+            drift.append(
+                f"evaluation {evaluation_id} system {system_id} "
+                f"{category}/{severity}: stored {stored}, expected {expected}"
+            )
+    for segment in sorted(expected_segments.keys() | stored_segments.keys()):
+        stored, expected = stored_segments.get(segment, 0), expected_segments.get(
+            segment, 0
+        )
+        if stored != expected:
+            drift.append(
+                f"evaluation {segment[0]} system {segment[1]} segments: "
+                f"stored {stored}, expected {expected}"
+            )
+    for evaluation_id in sorted(expected_progress.keys() | stored_progress.keys()):
+        stored_counts = stored_progress.get(evaluation_id, (0, 0))
+        expected_counts = expected_progress.get(evaluation_id, (0, 0))
+        if stored_counts != expected_counts:
+            drift.append(
+                f"evaluation {evaluation_id} progress: stored "
+                f"{stored_counts[0]}/{stored_counts[1]}, expected "
+                f"{expected_counts[0]}/{expected_counts[1]} (annotations/annotated)"
+            )
+    return drift
+
+
+def rebuild_summaries(evaluation_ids: Iterable[int] | None = None) -> int:
+    """Replace the summary rows with recomputed ones and return how many exist."""
+
+    ids = None if evaluation_ids is None else list(evaluation_ids)
+    markings, segments, progress = expected_summaries(ids)
+
+    for model in (MarkingSummary, SystemSegments, EvaluationProgress):
+        statement = delete(model)
+        if ids is not None:
+            statement = statement.where(model.evaluationId.in_(ids))
+        db.session.execute(statement)
+    db.session.add_all(
+        MarkingSummary(
+            evaluationId=evaluation_id,
+            systemId=system_id,
+            errorCategory=category,
+            errorSeverity=severity,
+            count=count,
+        )
+        for (evaluation_id, system_id, category, severity), count in markings.items()
+    )
+    db.session.add_all(
+        SystemSegments(evaluationId=evaluation_id, systemId=system_id, segments=count)
+        for (evaluation_id, system_id), count in segments.items()
+    )
+    db.session.add_all(
+        EvaluationProgress(
+            evaluationId=evaluation_id, annotations=annotations, annotated=annotated
+        )
+        for evaluation_id, (annotations, annotated) in progress.items()
+    )
+    db.session.commit()
+    return len(markings) + len(segments) + len(progress)
+
+
+def evaluation_summary(evaluation_id: int) -> dict[str, Any]:
+    """Return the stored progress, segment and marking counts of an evaluation."""
+
+    progress = db.session.get(EvaluationProgress, evaluation_id)
+    counts = db.session.execute(
+        select(MarkingSummary)
+        .where(MarkingSummary.evaluationId == evaluation_id, MarkingSummary.count != 0)
+        .order_by(
+            MarkingSummary.systemId,
+            MarkingSummary.errorCategory,
+            MarkingSummary.errorSeverity,
+        )
+    ).scalars()
+    rows = [
+        {
+            "systemId": row.systemId,
+            "errorCategory": row.errorCategory,
+            "errorSeverity": row.errorSeverity,
+            "count": row.count,
+        }
+        for row in counts
+    ]
+    segments = db.session.execute(
+        select(SystemSegments.systemId, SystemSegments.segments)
+        .where(
+            SystemSegments.evaluationId == evaluation_id, SystemSegments.segments != 0
+        )
+        .order_by(SystemSegments.systemId)
+    )
+    annotations = progress.annotations if progress is not None else 0
+    annotated = progress.annotated if progress is not None else 0
+    return {
+        "evaluationId": evaluation_id,
+        "annotations": annotations,
+        "annotated": annotated,
+        "pending": annotations - annotated,
+        "markings": sum(row["count"] for row in rows),
+        "systems": [
+            {"systemId": system_id, "segments": count} for system_id, count in segments
+        ],
+        "counts": rows,
+    }
@@ -0,0 +1,101 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, or_, select
+
+from . import db
+from .cursors import encode_time_cursor
+from .export import CURSOR_OVERLAP
+from .models import Annotation, AnnotationSystem, Marking, Tombstone
+from .tombstones import ENTITY_NAMES
+
+
+# Response keys of the synchronised entities, in the order clients apply them.
+SYNC_KEYS: dict[type[Any], str] = {
+    Annotation: "annotations",
+    AnnotationSystem: "annotationSystems",
+    Marking: "markings",
+}
+
+
+def _changed(model: type[Any], user_id: int, since: datetime | None) -> Select[Any]:
+    if model is Annotation:
+        stmt = select(Annotation).options(*Annotation.dict_loader_options())
+    else:
+        stmt = select(model).join(Annotation, Annotation.id == model.annotationId)
+    stmt = stmt.where(Annotation.userId == user_id)
+    if since is not None:
+        # Children follow their annotation, so a handed-over annotation brings
+        # its system outputs and markings along without touching them.
+        stmt = stmt.where(
+            model.updatedAt > since
+            if model is Annotation
+            else or_(model.updatedAt > since, Annotation.updatedAt > since)
+        )
+    return stmt.order_by(model.id)
+
+
+def user_changes(user_id: int, since: datetime | None) -> dict[str, Any]:
+    """Return the annotations, system outputs and markings of a user since ``since``.
+
+    Every entity is read by its indexed ``updatedAt`` column; system outputs
+    and markings are also resent when their annotation changed. Deletions
+    come from the tombstones recorded for the user. ``deleted`` lists, per
+    entity, the ids removed since the cursor, minus ids that are in the
+    changed lists (an annotation moved to another evaluation, or a reused
+    id). A deleted annotation is listed without its system outputs and
+    markings, which clients remove along with it. An annotation handed to
+    another user is deleted for the previous owner and sent with its
+    children to the new one. Clients apply ``deleted`` first, then upsert the
+    changed rows by id. Without ``since`` every row is returned and
+    ``deleted`` is empty.
+    """
+
+    cursor = encode_time_cursor(datetime.now() - CURSOR_OVERLAP)
+
+    changes: dict[str, list[dict[str, Any]]] = {}
+    for model, key in SYNC_KEYS.items():
+        rows = db.session.execute(_changed(model, user_id, since)).scalars()
+        changes[key] = [row.to_dict() for row in rows]
+
+    deleted: dict[str, set[int]] = {key: set() for key in SYNC_KEYS.values()}
+    if since is not None:
+        keys = {ENTITY_NAMES[model]: key for model, key in SYNC_KEYS.items()}
+        tombstones = db.session.execute(
+            select(Tombstone.entity, Tombstone.entityId).where(
+                Tombstone.userId == user_id, Tombstone.deletedAt > since
+            )
+        )
+        for entity, entity_id in tombstones:
+            deleted[keys[entity]].add(entity_id)
+        for key, ids in deleted.items():
+            ids.difference_update(row["id"] for row in changes[key])
+
+    return {
+        **changes,
+        "deleted": {key: sorted(ids) for key, ids in deleted.items()},
+        "cursor": cursor,
+    }
@@ -0,0 +1,195 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Final, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import ColumnElement, Select, select
+
+from . import db
+from .models import Annotation, Marking, User
+
+
+# Gaps between two actions longer than this count as idle time.
+DEFAULT_IDLE_SECONDS: Final[int] = 300
+
+_EPOCH: Final[datetime] = datetime(1970, 1, 1)
+
+
+def _in_range(
+    column: Any, start: datetime | None, end: datetime | None
+) -> list[ColumnElement[bool]]:
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+
+def _seconds(moments: Sequence[datetime]) -> npt.NDArray[np.float64]:
+    stamps = np.array(moments, dtype="datetime64[us]")
+    return stamps.astype(np.int64).astype(np.float64) / 1e6
+
+
+def _events(
+    statement: Select[Any],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    rows = db.session.execute(statement).all()
+    users = np.array([row[0] for row in rows], dtype=np.int64)
+    return users, _seconds([row[1] for row in rows])
+
+
+def _iso(seconds: float) -> str:
+    # Timestamps are naive local times, so count from a naive epoch.
+    return (_EPOCH + timedelta(microseconds=round(seconds * 1e6))).isoformat()
+
+
+def _rates(
+    segments: int, markings: int, active: float
+) -> tuple[float | None, float | None]:
+    per_segment = active / segments if segments else None
+    per_hour = markings * 3600 / active if active else None
+    return per_segment, per_hour
+
+
+def evaluation_throughput(
+    evaluation_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    idle_seconds: float = DEFAULT_IDLE_SECONDS,
+) -> dict[str, Any]:
+    """Estimate annotator speed from the timestamps of an evaluation.
+
+    An annotator's actions are the creation and edits of their markings and
+    the last update of each annotation they marked as annotated, restricted
+    to ``start <= t < end``. Sorted per annotator, consecutive actions up to
+    ``idle_seconds`` apart add to the active time; longer gaps are idle and
+    split the work into sessions. ``secondsPerSegment`` divides active time by
+    annotated segments and ``markingsPerHour`` divides created markings by it.
+    """
+
+    scope = Annotation.evaluationId == evaluation_id
+    marking_base = (
+        select(Annotation.userId)
+        .select_from(Marking)
+        .join(Annotation, Annotation.id == Marking.annotationId)
+        .where(scope)
+    )
+    created_users, created = _events(
+        marking_base.add_columns(Marking.createdAt).where(
+            *_in_range(Marking.createdAt, start, end)
+        )
+    )
+    edited_users, edited = _events(
+        marking_base.add_columns(Marking.updatedAt).where(
+            Marking.updatedAt != Marking.createdAt,
+            *_in_range(Marking.updatedAt, start, end),
+        )
+    )
+    annotated_users, annotated = _events(
+        select(Annotation.userId, Annotation.updatedAt).where(
+            scope,
+            Annotation.isAnnotated.is_(True),
+            *_in_range(Annotation.updatedAt, start, end),
+        )
+    )
+
+    all_users = np.concatenate([created_users, edited_users, annotated_users])
+    user_ids = np.unique(all_users)
+    emails = {
+        user_id: email
+        for user_id, email in db.session.execute(
+            select(User.id, User.email).where(User.id.in_(user_ids.tolist()))
+        )
+    }
+    count = len(user_ids)
+
+    # Sort every action by annotator, then time, and diff once.
+    user = np.searchsorted(user_ids, all_users)
+    times = np.concatenate([created, edited, annotated])
+    order = np.lexsort((times, user))
+    user, times = user[order], times[order]
+    gaps = np.diff(times)
+    same = user[1:] == user[:-1]
+    active_gap = same & (gaps <= idle_seconds)
+    idle_gap = same & (gaps > idle_seconds)
+    gap_user = user[1:]
+
+    active = np.bincount(
+        gap_user, weights=np.where(active_gap, gaps, 0), minlength=count
+    )
+    idle = np.bincount(gap_user, weights=np.where(idle_gap, gaps, 0), minlength=count)
+    idle_gaps = np.bincount(gap_user[idle_gap], minlength=count)
+    longest = np.zeros(count)
+    np.maximum.at(longest, gap_user[same], gaps[same])
+    first = np.full(count, np.inf)
+    last = np.full(count, -np.inf)
+    np.minimum.at(first, user, times)
+    np.maximum.at(last, user, times)
+    segments = np.bincount(np.searchsorted(user_ids, annotated_users), minlength=count)
+    markings = np.bincount(np.searchsorted(user_ids, created_users), minlength=count)
+
+    annotators = []
+    for index, user_id in enumerate(user_ids.tolist()):
+        per_segment, per_hour = _rates(
+            int(segments[index]), int(markings[index]), float(active[index])
+        )
+        annotators.append(
+            {
+                "id": user_id,
+                "email": emails.get(user_id),
+                "segments": int(segments[index]),
+                "markings": int(markings[index]),
+                "activeSeconds": float(active[index]),
+                "idleSeconds": float(idle[index]),
+                "idleGaps": int(idle_gaps[index]),
+                "longestGapSeconds": float(longest[index]),
+                "sessions": int(idle_gaps[index]) + 1,
+                "secondsPerSegment": per_segment,
+                "markingsPerHour": per_hour,
+                "firstActivity": _iso(first[index]),
+                "lastActivity": _iso(last[index]),
+            }
+        )
+
+    per_segment, per_hour = _rates(
+        int(segments.sum()), int(markings.sum()), float(active.sum())
+    )
+    return {
+        "evaluationId": evaluation_id,
+        "from": start.isoformat() if start is not None else None,
+        "to": end.isoformat() if end is not None else None,
+        "idleThresholdSeconds": idle_seconds,
+        "annotators": annotators,
+        "overall": {
+            "segments": int(segments.sum()),
+            "markings": int(markings.sum()),
+            "activeSeconds": float(active.sum()),
+            "idleSeconds": float(idle.sum()),
+            "secondsPerSegment": per_segment,
+            "markingsPerHour": per_hour,
+        },
+    }
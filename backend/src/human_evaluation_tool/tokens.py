@@ -0,0 +1,57 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Final
+
+
+TOKEN_INDEX_CACHE_SIZE: Final[int] = 16384
+
+
+@lru_cache(maxsize=TOKEN_INDEX_CACHE_SIZE)
+def token_index(text: str) -> tuple[str, ...]:
+    """Return the cached tokens of a source or translation segment.
+
+    Marking offsets address the space-separated tokens the front-end renders,
+    with newlines shown as ``<br>``.
+    """
+
+    return tuple(text.replace("\n", "<br>").split(" "))
+
+
+def highlight_span(text: str, start: int, end: int) -> str:
+    """Wrap tokens ``start`` to ``end`` (inclusive) of ``text`` in ``<v>`` tags."""
+
+    # Copying the cached tuple and inserting both tags is cheaper in CPython
+    # than joining slices, and keeps the historical insert rules for spans
+    # that fall outside the segment.
+    tokens = list(token_index(text))
+    tokens.insert(start, "<v>")
+    tokens.insert(end + 2, "</v>")
+    return " ".join(tokens)
+
+
+def is_valid_span(text: str, start: int, end: int) -> bool:
+    """Return whether ``start``/``end`` address an inclusive token range of text."""
+
+    return 0 <= start <= end < len(token_index(text))
@@ -0,0 +1,151 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, delete, event, inspect, select
+from sqlalchemy.orm import Session
+
+from . import db
+from .models import Annotation, AnnotationSystem, Marking, Tombstone
+
+
+ENTITY_NAMES: dict[type[Any], str] = {
+    Annotation: "annotation",
+    AnnotationSystem: "annotation_system",
+    Marking: "marking",
+}
+
+
+def _tombstone(
+    entity: Any,
+    annotation: Annotation,
+    evaluation_id: int,
+    user_id: int,
+    now: datetime,
+) -> Tombstone:
+    return Tombstone(
+        entity=ENTITY_NAMES[type(entity)],
+        entityId=entity.id,
+        evaluationId=evaluation_id,
+        userId=user_id,
+        annotationId=annotation.id,
+        systemId=getattr(entity, "systemId", None),
+        deletedAt=now,
+    )
+
+
+def _previous_value(session: Session, annotation: Annotation, name: str) -> Any:
+    """Return the value ``name`` had before this flush, or ``None`` if unchanged."""
+
+    history = getattr(inspect(annotation).attrs, name).history
+    if not history.added:
+        return None
+    # Expired attributes keep no previous value, so read it back.
+    previous = (
+        history.deleted[0]
+        if history.deleted
+        else session.scalar(
+            select(getattr(Annotation, name)).where(Annotation.id == annotation.id)
+        )
+    )
+    return previous if previous != getattr(annotation, name) else None
+
+
+def _record_tombstones(session: Session, *args: Any) -> None:
+    """Tombstone the annotations, annotation systems and markings being deleted.
+
+    Rows removed through ORM cascades are part of ``session.deleted`` as well,
+    so deleting a system leaves tombstones for its system outputs and markings.
+    A deleted annotation gets a single tombstone: clients cascade it to its
+    system outputs and markings, so deleting an evaluation, bitext or user
+    writes one row per annotation rather than one per marking.
+    """
+
+    now = datetime.now()
+    tombstones: list[Tombstone] = []
+    with session.no_autoflush:
+        deleted = session.deleted
+        for instance in deleted:
+            if type(instance) not in ENTITY_NAMES:
+                continue
+            annotation = (
+                instance
+                if isinstance(instance, Annotation)
+                else session.get(Annotation, instance.annotationId)
+            )
+            if annotation is None or (
+                annotation is not instance and annotation in deleted
+            ):
+                continue
+            tombstones.append(
+                _tombstone(
+                    instance,
+                    annotation,
+                    annotation.evaluationId,
+                    annotation.userId,
+                    now,
+                )
+            )
+
+        for instance in session.dirty:
+            if not isinstance(instance, Annotation):
+                continue
+
+            # An annotation moved to another evaluation disappears from the old one.
+            previous = _previous_value(session, instance, "evaluationId")
+            if previous is not None:
+                tombstones.append(
+                    _tombstone(instance, instance, previous, instance.userId, now)
+                )
+
+            # An annotation handed to another user disappears from the previous
+            # owner's synced copy, and clients cascade that to its children.
+            # Their timestamps are left alone: sync resends them to the new
+            # owner because the annotation itself was updated.
+            previous = _previous_value(session, instance, "userId")
+            if previous is not None:
+                tombstones.append(
+                    _tombstone(instance, instance, instance.evaluationId, previous, now)
+                )
+
+    session.add_all(tombstones)
+
+
+def register_tombstone_listener() -> None:
+    """Record tombstones whenever the shared session flushes deletions."""
+
+    if not event.contains(db.session, "before_flush", _record_tombstones):
+        event.listen(db.session, "before_flush", _record_tombstones)
+
+
+def prune_tombstones(before: datetime) -> int:
+    """Delete tombstones older than ``before`` and return how many were removed."""
+
+    result = cast(
+        CursorResult[Any],
+        db.session.execute(delete(Tombstone).where(Tombstone.deletedAt < before)),
+    )
+    db.session.commit()
+    return int(result.rowcount)
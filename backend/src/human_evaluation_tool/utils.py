@@ -64,3 +64,9 @@ SEVERITY_NAME: Final[dict[str, str]] = {
     "major": "Major",
     "not-judgeable": "NotJudgeable",
 }
+
+
+def rater_name(email: str) -> str:
+    """Return the label an annotator is shown under: the email's local part."""
+
+    return email.split("@")[0]
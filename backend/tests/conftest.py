@@ -38,6 +38,7 @@ os.environ.setdefault("DB_USER", "testuser")
 os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite:///:memory:")
 
 from human_evaluation_tool import bcrypt, create_app, db  # noqa: E402
+from human_evaluation_tool.cache import clear_caches  # noqa: E402
 from human_evaluation_tool.models import (  # noqa: E402
     Annotation,
     AnnotationSystem,
@@ -76,6 +77,7 @@ def app() -> Iterator[Flask]:
                 "poolclass": StaticPool,
             },
             "JWT_COOKIE_CSRF_PROTECT": False,
+            "STRICT_RELATIONSHIP_LOADING": True,
         }
     )
 
@@ -88,6 +90,7 @@ def app() -> Iterator[Flask]:
 @pytest.fixture(autouse=True)
 def _reset_database(app: Flask) -> Iterator[None]:
     with app.app_context():
+        clear_caches()
         db.drop_all()
         db.create_all()
         yield
@@ -287,3 +290,53 @@ def create_marking(
         return marking
 
     return _create_marking
+
+
+@pytest.fixture
+def scored_evaluation(
+    create_user: UserFactory,
+    create_system: SystemFactory,
+    create_document: DocumentFactory,
+    create_bitext: BitextFactory,
+    create_evaluation: EvaluationFactory,
+    create_annotation: AnnotationFactory,
+    create_annotation_system: AnnotationSystemFactory,
+    create_marking: MarkingFactory,
+) -> Evaluation:
+    evaluation = create_evaluation(name="Scored")
+    system_a = create_system(name="System A")
+    system_b = create_system(name="System B")
+    first = create_annotation(
+        user=create_user(email="first@example.com"),
+        evaluation=evaluation,
+        bitext=create_bitext(
+            document=create_document(name="Doc 1"), source="Hello world"
+        ),
+    )
+    second = create_annotation(
+        user=create_user(email="second@example.com"),
+        evaluation=evaluation,
+        bitext=create_bitext(
+            document=create_document(name="Doc 2"), source="Hello world"
+        ),
+    )
+    for annotation in (first, second):
+        create_annotation_system(annotation=annotation, system=system_a)
+        create_annotation_system(annotation=annotation, system=system_b)
+
+    create_marking(annotation=first, system=system_a, error_severity="critical")
+    create_marking(
+        annotation=first, system=system_a, error_category="F01", error_severity="minor"
+    )
+    create_marking(annotation=first, system=system_b, error_severity="major")
+    create_marking(
+        annotation=second, system=system_b, error_category="F01", error_severity="minor"
+    )
+    create_marking(
+        annotation=second,
+        system=system_b,
+        error_category="000",
+        error_severity="no-error",
+    )
+    create_marking(annotation=second, system=system_a, error_severity="not-judgeable")
+    return evaluation
@@ -0,0 +1,194 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+from flask.testing import FlaskClient
+
+from human_evaluation_tool.agreement import (
+    AgreementFrame,
+    compute_agreement,
+    load_agreement_frame,
+)
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+
+
+def _frame() -> AgreementFrame:
+    # Unit 0 is judged by a and b, unit 1 by a, b and c. Every unit has three
+    # source and two target tokens.
+    return AgreementFrame(
+        annotators=("a", "b", "c"),
+        categories=("A01", "F01"),
+        severities=("major", "minor"),
+        unit=np.array([0, 0, 1, 1, 1]),
+        annotator=np.array([0, 1, 0, 1, 2]),
+        source_length=np.full(5, 3),
+        target_length=np.full(5, 2),
+        judgment=np.array([0, 1, 1, 2, 3, 4]),
+        is_source=np.array([True, True, False, False, False, False]),
+        start=np.array([0, 0, 0, 0, 0, 1]),
+        end=np.array([1, 1, 1, 1, 0, 1]),
+        category=np.array([0, 0, 1, 1, 1, 0]),
+        severity=np.array([0, 1, 0, 0, 0, 1]),
+    )
+
+
+def test_compute_agreement_pairs() -> None:
+    agreement = compute_agreement(_frame())
+
+    assert agreement["units"] == 2
+    first, second, third = agreement["pairs"]
+    assert first["annotators"] == ["a", "b"]
+    assert first["units"] == 2
+    assert first["spans"] == [2, 3]
+    assert first["matches"] == 1
+    assert first["precision"] == pytest.approx(1 / 3)
+    assert first["recall"] == 0.5
+    assert first["f1"] == 0.4
+    assert first["tokens"] == 10
+    assert first["cohenKappa"] == pytest.approx(0.4)
+    assert second["annotators"] == ["a", "c"]
+    assert second["cohenKappa"] == pytest.approx(6 / 11)
+    assert third["annotators"] == ["b", "c"]
+    assert third["matches"] == 0
+
+
+def test_compute_agreement_totals() -> None:
+    agreement = compute_agreement(_frame())
+
+    assert agreement["spans"] == {"matches": 1, "f1": pytest.approx(2 / 9)}
+    assert agreement["tokens"]["items"] == 10
+    assert agreement["tokens"]["fleissKappa"] == pytest.approx(11 / 36)
+    assert agreement["severity"] == {
+        "matchedSpans": 1,
+        "agreement": 0.0,
+        "kappa": -1.0,
+    }
+    assert agreement["category"] == {
+        "matchedSpans": 1,
+        "agreement": 1.0,
+        "kappa": None,
+    }
+
+
+def test_duplicate_and_out_of_range_spans_are_ignored() -> None:
+    frame = _frame()._replace(
+        judgment=np.array([0, 0, 1, 1]),
+        is_source=np.array([True, True, True, False]),
+        start=np.array([0, 0, 0, 5]),
+        end=np.array([1, 1, 1, 6]),
+        category=np.zeros(4, dtype=np.intp),
+        severity=np.zeros(4, dtype=np.intp),
+    )
+
+    pair = compute_agreement(frame)["pairs"][0]
+
+    assert pair["spans"] == [1, 1]
+    assert pair["f1"] == 1.0
+    assert pair["cohenKappa"] == 1.0
+
+
+def test_compute_agreement_without_overlap() -> None:
+    frame = _frame()._replace(unit=np.array([0, 1, 2, 3, 4]))
+
+    agreement = compute_agreement(frame)
+
+    assert agreement["units"] == 0
+    assert agreement["pairs"] == []
+    assert agreement["tokens"]["fleissKappa"] is None
+    assert agreement["spans"]["f1"] is None
+
+
+@pytest.fixture
+def shared_evaluation(
+    create_user: Callable[..., User],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> Evaluation:
+    evaluation = create_evaluation(name="Shared")
+    system = create_system(name="Shared System")
+    bitext = create_bitext(source="Hello world")
+    first, second = (
+        create_annotation(
+            user=create_user(email=email), evaluation=evaluation, bitext=bitext
+        )
+        for email in ("one@example.com", "two@example.com")
+    )
+    for annotation in (first, second):
+        create_annotation_system(annotation=annotation, system=system)
+    create_marking(annotation=first, system=system, error_severity="major")
+    create_marking(annotation=second, system=system, error_severity="minor")
+    create_marking(
+        annotation=second,
+        system=system,
+        error_category="F01",
+        error_severity="minor",
+        is_source=False,
+    )
+    create_marking(
+        annotation=first,
+        system=system,
+        error_category="000",
+        error_severity="no-error",
+    )
+    return evaluation
+
+
+def test_load_agreement_frame(shared_evaluation: Evaluation) -> None:
+    frame = load_agreement_frame(shared_evaluation.id)
+
+    assert frame.annotators == ("one", "two")
+    assert frame.unit.tolist() == [0, 0]
+    assert frame.source_length.tolist() == [2, 2]
+    assert frame.target_length.tolist() == [1, 1]
+    assert frame.judgment.tolist() == [0, 1, 1]
+
+
+def test_agreement_endpoint(
+    auth_client: tuple[FlaskClient, User], shared_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+
+    response = client.get(f"/api/evaluations/{shared_evaluation.id}/agreement")
+
+    assert response.status_code == 200
+    agreement = response.get_json()
+    assert agreement["units"] == 1
+    pair = agreement["pairs"][0]
+    assert pair["spans"] == [1, 2]
+    assert pair["matches"] == 1
+    assert pair["cohenKappa"] == pytest.approx(0.4)
+    assert agreement["severity"]["agreement"] == 0.0
+    assert client.get("/api/evaluations/999/agreement").status_code == 404
@@ -0,0 +1,228 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from flask import Flask
+from flask.testing import FlaskClient
+
+from human_evaluation_tool.analytics import (
+    SPAN_LENGTH_LIMIT,
+    PositionFrame,
+    cached_marking_frame,
+    compute_breakdowns,
+    compute_positions,
+    evaluation_positions,
+    load_marking_frame,
+    load_position_frame,
+    pivot,
+)
+from human_evaluation_tool.models import Evaluation, User
+from human_evaluation_tool.scoring import evaluation_scores
+
+
+def test_load_marking_frame(scored_evaluation: Evaluation) -> None:
+    frame = load_marking_frame(scored_evaluation.id)
+
+    assert frame.systems == ("System A", "System B")
+    assert frame.documents == ("Doc 1", "Doc 2")
+    assert frame.annotators == ("first", "second")
+    assert frame.categories == ("A01", "F01")
+    assert frame.severities == ("critical", "major", "minor", "not-judgeable")
+    # The no-error marking is not scored and stays out of the frame.
+    assert frame.system.shape == (5,)
+    assert frame.segments.shape == (2, 2, 2)
+    assert frame.segments.sum() == 4
+
+
+def test_compute_breakdowns(scored_evaluation: Evaluation) -> None:
+    breakdowns = compute_breakdowns(load_marking_frame(scored_evaluation.id))
+
+    assert breakdowns["severities"] == ["Critical", "Major", "Minor", "NotJudgeable"]
+    assert breakdowns["categories"][1] == {
+        "category": "F01",
+        "name": "Fluency/Spelling",
+    }
+    assert breakdowns["systemCategorySeverity"]["errors"] == [
+        [[1, 0, 0, 1], [0, 0, 1, 0]],
+        [[0, 1, 0, 0], [0, 0, 1, 0]],
+    ]
+    annotator_system = breakdowns["annotatorSystem"]
+    assert annotator_system["segments"] == [[1, 1], [1, 1]]
+    assert annotator_system["errors"] == [[2, 1], [1, 1]]
+    assert annotator_system["penalty"] == [[11.0, 5.0], [0.0, 1.0]]
+    assert breakdowns["documentSystem"]["score"] == [[11.0, 5.0], [0.0, 1.0]]
+
+
+def test_breakdowns_agree_with_sql_scores(scored_evaluation: Evaluation) -> None:
+    weights = {"critical": 25.0, "not-judgeable": 2.0}
+    breakdowns = compute_breakdowns(load_marking_frame(scored_evaluation.id), weights)
+    scores = evaluation_scores(scored_evaluation.id, weights)
+
+    penalty = np.array(breakdowns["systemCategorySeverity"]["penalty"])
+    system_penalty = {row["name"]: row["penalty"] for row in scores["systems"]}
+    assert dict(zip(breakdowns["systems"], penalty.sum(axis=(1, 2)))) == (
+        system_penalty
+    )
+    assert penalty.sum() == scores["overall"]["penalty"]
+
+
+def test_compute_breakdowns_empty_evaluation(
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    breakdowns = compute_breakdowns(load_marking_frame(create_evaluation().id))
+
+    assert breakdowns["systems"] == breakdowns["categories"] == []
+    assert breakdowns["systemCategorySeverity"]["errors"] == []
+    assert breakdowns["annotatorSystem"]["score"] == []
+
+
+def test_pivot_counts_and_sums() -> None:
+    rows = np.array([0, 1, 1, 0])
+    columns = np.array([2, 0, 0, 2])
+
+    assert pivot((rows, columns), (2, 3)).tolist() == [[0, 0, 2], [2, 0, 0]]
+    assert pivot((rows, columns), (2, 3), np.array([1.0, 2.0, 3.0, 4.0])).tolist() == [
+        [0.0, 0.0, 5.0],
+        [5.0, 0.0, 0.0],
+    ]
+
+
+def test_marking_frame_is_cached(scored_evaluation: Evaluation) -> None:
+    assert cached_marking_frame(scored_evaluation.id) is cached_marking_frame(
+        scored_evaluation.id
+    )
+
+
+def test_breakdowns_endpoint(
+    auth_client: tuple[FlaskClient, User], scored_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+    url = f"/api/evaluations/{scored_evaluation.id}/breakdowns"
+
+    response = client.get(f"{url}?weights=minor:3")
+    assert response.status_code == 200
+    assert response.get_json()["annotatorSystem"]["penalty"] == [
+        [13.0, 5.0],
+        [0.0, 3.0],
+    ]
+    assert client.get(f"{url}?weights=minor").status_code == 422
+    assert client.get("/api/evaluations/999/breakdowns").status_code == 404
+
+
+def test_breakdowns_command(
+    app: Flask, scored_evaluation: Evaluation, tmp_path: Path
+) -> None:
+    runner = app.test_cli_runner()
+    output = tmp_path / "breakdowns.json"
+
+    result = runner.invoke(
+        args=[
+            "evaluation-breakdowns",
+            str(scored_evaluation.id),
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(output.read_text())["systems"] == ["System A", "System B"]
+    invalid = runner.invoke(
+        args=["evaluation-breakdowns", str(scored_evaluation.id), "--weights", "x:1"]
+    )
+    assert invalid.exit_code != 0
+
+
+def test_load_position_frame(scored_evaluation: Evaluation) -> None:
+    frame = load_position_frame(scored_evaluation.id)
+
+    assert frame.systems == ("System A", "System B")
+    assert frame.categories == ("A01", "F01")
+    # Every fixture marking covers the first of the two source tokens.
+    assert frame.length.tolist() == [2] * 5
+    assert frame.is_source.all()
+
+
+def test_compute_positions() -> None:
+    frame = PositionFrame(
+        systems=("a", "b"),
+        categories=("A01", "F01"),
+        system=np.array([0, 0, 1, 1]),
+        category=np.array([0, 1, 1, 0]),
+        is_source=np.array([True, False, False, True]),
+        start=np.array([0, 3, 0, 5]),
+        end=np.array([0, 29, 9, 5]),
+        length=np.array([4, 30, 10, 5]),
+    )
+
+    positions = compute_positions(frame, bins=4)
+
+    assert positions["edges"] == [0.0, 0.25, 0.5, 0.75, 1.0]
+    # The last span ends past its segment and is left out.
+    assert positions["skipped"] == 1
+    assert positions["positions"]["system"] == [
+        [[1, 0, 0, 0], [0, 0, 1, 0]],
+        [[0, 0, 0, 0], [0, 0, 1, 0]],
+    ]
+    assert positions["positions"]["category"][1] == [[0, 0, 0, 0], [0, 0, 2, 0]]
+    span_lengths = positions["spanLengths"]
+    assert span_lengths["system"][0][0] == 1
+    assert span_lengths["system"][0][SPAN_LENGTH_LIMIT - 1] == 1
+    assert span_lengths["systemMean"] == [14.0, 10.0]
+    assert span_lengths["categoryMean"] == [1.0, 18.5]
+
+
+def test_positions_are_cached(scored_evaluation: Evaluation) -> None:
+    assert evaluation_positions(scored_evaluation.id) is evaluation_positions(
+        scored_evaluation.id
+    )
+
+
+def test_positions_endpoint(
+    auth_client: tuple[FlaskClient, User], scored_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+    url = f"/api/evaluations/{scored_evaluation.id}/positions"
+
+    response = client.get(f"{url}?bins=4")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["positions"]["system"] == [
+        [[0, 3, 0, 0], [0, 0, 0, 0]],
+        [[0, 2, 0, 0], [0, 0, 0, 0]],
+    ]
+    assert body["spanLengths"]["systemMean"] == [1.0, 1.0]
+    assert client.get(f"{url}?bins=0").status_code == 422
+    assert client.get(f"{url}?bins=x").status_code == 422
+    assert client.get("/api/evaluations/999/positions").status_code == 404
+
+
+def test_compute_positions_empty_evaluation(
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    positions = compute_positions(load_position_frame(create_evaluation().id))
+
+    assert positions["systems"] == positions["categories"] == []
+    assert positions["positions"]["system"] == []
+    assert positions["skipped"] == 0
@@ -22,13 +22,23 @@ Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2025
 from collections.abc import Callable
 from typing import Any
 
+import pytest
 from flask.testing import FlaskClient
 from pytest import MonkeyPatch
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError
 from werkzeug.test import TestResponse
 
 from human_evaluation_tool import db
-from human_evaluation_tool.models import Annotation, Bitext, Evaluation, User
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
 
 
 def _request(client: FlaskClient, method: str, url: str, **kwargs: Any) -> TestResponse:
@@ -269,6 +279,61 @@ def test_read_annotations_missing_identity(
     assert response.status_code == 401
 
 
+def test_read_annotations_constant_queries(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_bitext: Callable[..., Bitext],
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    client, user = auth_client
+    bitext = create_bitext()
+    evaluations = [create_evaluation(name=f"Eval {index}") for index in range(2)]
+    for index in range(4):
+        create_annotation(
+            user=user,
+            evaluation=evaluations[index % 2],
+            bitext=create_bitext(document=bitext.document, source=f"Line {index}"),
+        )
+    db.session.expunge_all()
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = _request(client, "get", "/api/annotations")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert sorted(row["bitext"]["source"] for row in data) == [
+        f"Line {index}" for index in range(4)
+    ]
+    assert {row["evaluation"]["name"] for row in data} == {"Eval 0", "Eval 1"}
+    # The validator aggregate and the annotations with evaluation and bitext.
+    assert len(statements) == 2
+
+
+def test_annotation_strict_loader_options_raise(
+    create_annotation: Callable[..., Annotation],
+) -> None:
+    annotation_id = create_annotation().id
+    db.session.expunge_all()
+
+    annotation = db.session.execute(
+        select(Annotation)
+        .options(*Annotation.dict_loader_options(strict=True))
+        .filter_by(id=annotation_id)
+    ).scalar_one()
+
+    assert annotation.to_dict()["id"] == annotation_id
+    with pytest.raises(InvalidRequestError):
+        annotation.markings
+
+
 def test_annotation_create_database_error(
     auth_client: tuple[FlaskClient, User],
     create_evaluation: Callable[..., Evaluation],
@@ -335,3 +400,61 @@ def test_annotation_delete_database_error(
     monkeypatch.setattr(db.session, "commit", _raise_error)
     response = _request(client, "delete", f"/api/annotations/{annotation.id}")
     assert response.status_code == 500
+
+
+def test_annotation_bundle(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_bitext: Callable[..., Bitext],
+    create_system: Callable[..., System],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    client, user = auth_client
+    bitext = create_bitext()
+    create_bitext(document=bitext.document, source="Next sentence")
+    annotation = create_annotation(user=user, bitext=bitext)
+    systems = [create_system(name=f"Bundle {index}") for index in range(3)]
+    for system in systems:
+        create_annotation_system(annotation=annotation, system=system)
+        create_marking(annotation=annotation, system=system)
+    url = f"/api/annotations/{annotation.id}/bundle"
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = _request(client, "get", url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    bundle = response.get_json()
+    assert bundle["annotation"]["bitext"]["id"] == bitext.id
+    assert [row["source"] for row in bundle["bitexts"]] == [
+        "Hello",
+        "Next sentence",
+    ]
+    assert [row["name"] for row in bundle["systems"]] == [
+        "Bundle 0",
+        "Bundle 1",
+        "Bundle 2",
+    ]
+    assert len(bundle["markings"]) == 3
+    # Annotation with evaluation and bitext, bitexts, systems and markings.
+    assert len(statements) == 4
+
+
+def test_annotation_bundle_checks_owner(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+) -> None:
+    client, _ = auth_client
+    annotation = create_annotation()
+
+    response = _request(client, "get", f"/api/annotations/{annotation.id}/bundle")
+    assert response.status_code == 401
+    assert _request(client, "get", "/api/annotations/999/bundle").status_code == 404
@@ -0,0 +1,109 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+from human_evaluation_tool.cache import (
+    VersionedCache,
+    evaluation_version,
+    invalidate_evaluation,
+)
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Evaluation,
+    Marking,
+)
+
+
+def test_versioned_cache_requires_matching_version() -> None:
+    cache: VersionedCache[str] = VersionedCache(maxsize=4)
+    cache.set((1,), ("v1",), "rows")
+
+    assert cache.get((1,), ("v1",)) == "rows"
+    assert cache.get((1,), ("v2",)) is None
+    assert cache.get((2,), ("v1",)) is None
+
+
+def test_versioned_cache_evicts_least_recently_used() -> None:
+    cache: VersionedCache[int] = VersionedCache(maxsize=2)
+    cache.set((1,), (), 1)
+    cache.set((2,), (), 2)
+    assert cache.get((1,), ()) == 1
+    cache.set((3,), (), 3)
+
+    assert len(cache) == 2
+    assert cache.get((2,), ()) is None
+    assert cache.get((1,), ()) == 1
+    assert cache.get((3,), ()) == 3
+
+
+def test_versioned_cache_bounded_by_weight() -> None:
+    cache: VersionedCache[str] = VersionedCache(maxsize=8, max_weight=10, weigh=len)
+    cache.set((1,), (), "aaaa")
+    cache.set((2,), (), "bbbb")
+    cache.set((3,), (), "cccc")
+
+    assert cache.get((1,), ()) is None
+    assert cache.get((2,), ()) == "bbbb"
+    assert cache.weight == 8
+
+    cache.set((4,), (), "x" * 11)
+    assert cache.get((4,), ()) is None
+    assert cache.weight == 8
+
+    cache.set((2,), (), "b")
+    cache.invalidate(3)
+    assert cache.weight == 1
+
+
+def test_invalidate_evaluation_reaches_every_cache() -> None:
+    first: VersionedCache[str] = VersionedCache(maxsize=4)
+    second: VersionedCache[str] = VersionedCache(maxsize=4)
+    first.set((1,), (), "one")
+    first.set((2,), (), "two")
+    second.set((1, "extra"), (), "keyed")
+
+    invalidate_evaluation(1, None)
+
+    assert first.get((1,), ()) is None
+    assert first.get((2,), ()) == "two"
+    assert second.get((1, "extra"), ()) is None
+
+
+def test_evaluation_version_tracks_rows(
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    evaluation = create_evaluation(name="Version Eval")
+    empty_version = evaluation_version(evaluation.id)
+    assert empty_version == (None, 0, None, 0, None, 0, None, None, None, None)
+
+    annotation = create_annotation(evaluation=evaluation)
+    create_annotation_system(annotation=annotation)
+    create_marking(annotation=annotation)
+
+    version = evaluation_version(evaluation.id)
+    assert version[1:6:2] == (1, 1, 1)
+    assert None not in version
+    assert evaluation_version(evaluation.id) == version
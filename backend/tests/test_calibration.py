@@ -0,0 +1,153 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+from flask.testing import FlaskClient
+
+from human_evaluation_tool.agreement import AgreementFrame
+from human_evaluation_tool.calibration import (
+    compute_calibration,
+    evaluation_calibration,
+)
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+
+
+# Markings per unit of each annotator as (severity code, count).
+_HABITS = {
+    "a": (1, 1),
+    "b": (1, 1),
+    "c": (1, 4),
+    "d": (1, 1),
+    "e": (0, 1),
+}
+
+
+def _frame(units: int = 20) -> AgreementFrame:
+    names = tuple(_HABITS)
+    unit = np.repeat(np.arange(units), len(names))
+    annotator = np.tile(np.arange(len(names)), units)
+    judgment, severity = [], []
+    for index, user in enumerate(annotator):
+        code, count = _HABITS[names[user]]
+        judgment += [index] * count
+        severity += [code] * count
+    # One more unit judged by "a" alone, which has no peers to compare with.
+    unit = np.append(unit, units)
+    annotator = np.append(annotator, 0)
+    judgment += [len(unit) - 1] * 10
+    severity += [1] * 10
+    markings = len(judgment)
+    return AgreementFrame(
+        annotators=names,
+        categories=("A01",),
+        severities=("critical", "minor"),
+        unit=unit,
+        annotator=annotator,
+        source_length=np.full(len(unit), 3),
+        target_length=np.full(len(unit), 3),
+        judgment=np.array(judgment),
+        is_source=np.ones(markings, dtype=bool),
+        start=np.zeros(markings, dtype=np.int64),
+        end=np.zeros(markings, dtype=np.int64),
+        category=np.zeros(markings, dtype=np.intp),
+        severity=np.array(severity),
+    )
+
+
+def test_compute_calibration_flags_outliers() -> None:
+    calibration = compute_calibration(_frame())
+
+    assert calibration["severities"] == ["Critical", "Minor"]
+    assert calibration["sharedUnits"] == 20
+    rows = {row["annotator"]: row for row in calibration["annotators"]}
+    # The unit judged by "a" alone is ignored.
+    assert rows["a"]["segments"] == 20
+    assert rows["a"]["markings"] == 20
+    assert rows["c"]["expectedMarkings"] == pytest.approx(20)
+    assert rows["c"]["rateZ"] == pytest.approx(60 / np.sqrt(20))
+    assert "over-marking" in rows["c"]["flags"]
+    assert "severity:Critical" in rows["e"]["flags"]
+    assert rows["e"]["rateZ"] > -3
+    assert not rows["a"]["outlier"]
+    assert rows["b"]["severities"]["observed"] == [0, 20]
+
+
+def test_compute_calibration_threshold() -> None:
+    calibration = compute_calibration(_frame(), threshold=100)
+
+    assert not any(row["outlier"] for row in calibration["annotators"])
+
+
+def test_compute_calibration_without_shared_units() -> None:
+    calibration = compute_calibration(_frame(units=0))
+
+    (row,) = [row for row in calibration["annotators"] if row["annotator"] == "a"]
+    assert row["segments"] == row["markings"] == 0
+    assert row["rate"] is None
+    assert row["rateZ"] is None
+    assert calibration["sharedUnits"] == 0
+
+
+def test_calibration_endpoint(
+    auth_client: tuple[FlaskClient, User],
+    create_user: Callable[..., User],
+    create_evaluation: Callable[..., Evaluation],
+    create_bitext: Callable[..., Bitext],
+    create_system: Callable[..., System],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    client, _ = auth_client
+    evaluation = create_evaluation(name="Calibrated")
+    system = create_system(name="Calibrated System")
+    bitext = create_bitext()
+    for email, markings in (("light@example.com", 1), ("heavy@example.com", 3)):
+        annotation = create_annotation(
+            user=create_user(email=email), evaluation=evaluation, bitext=bitext
+        )
+        create_annotation_system(annotation=annotation, system=system)
+        for _ in range(markings):
+            create_marking(annotation=annotation, system=system)
+    url = f"/api/evaluations/{evaluation.id}/calibration"
+
+    response = client.get(f"{url}?threshold=1")
+    assert response.status_code == 200
+    rows = {row["annotator"]: row for row in response.get_json()["annotators"]}
+    assert rows["heavy"]["flags"] == ["over-marking"]
+    assert rows["light"]["expectedMarkings"] == 3
+    assert evaluation_calibration(evaluation.id, 1.0) is evaluation_calibration(
+        evaluation.id, 1.0
+    )
+    assert client.get(f"{url}?threshold=-1").status_code == 422
+    assert client.get(f"{url}?threshold=x").status_code == 422
+    assert client.get("/api/evaluations/999/calibration").status_code == 404
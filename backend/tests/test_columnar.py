@@ -0,0 +1,197 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from flask import Flask
+from flask.testing import FlaskClient
+
+from human_evaluation_tool.columnar import (
+    build_columns,
+    decode_dictionary,
+    evaluation_columns,
+    load_columns,
+    write_columns,
+)
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+
+
+def _seed(
+    user: User,
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> Evaluation:
+    evaluation = create_evaluation(name="Columnar Eval")
+    systems = [create_system(name="Alpha"), create_system(name="Beta")]
+    for index in range(2):
+        bitext = create_bitext(source=f"Quelle {index} ü", target="Ziel")
+        annotation = create_annotation(
+            user=user, evaluation=evaluation, bitext=bitext, comment="Hm"
+        )
+        for system in systems:
+            create_annotation_system(
+                annotation=annotation, system=system, translation="Out put"
+            )
+            create_marking(
+                annotation=annotation,
+                system=system,
+                error_start=index,
+                error_end=index + 1,
+                error_category="F03",
+                error_severity="major",
+                is_source=False,
+            )
+    return evaluation
+
+
+def test_build_columns_empty() -> None:
+    columns = build_columns([])
+
+    assert columns["markingId"].shape == (0,)
+    assert columns["system_offsets"].tolist() == [0]
+    assert decode_dictionary(columns, "system")[1] == []
+
+
+def test_columnar_round_trip(
+    tmp_path: Path,
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    _, user = auth_client
+    evaluation = _seed(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+
+    path = tmp_path / "results.npz"
+    write_columns(path, evaluation_columns(evaluation.id))
+    columns = load_columns(path)
+
+    assert isinstance(columns["markingId"], np.memmap)
+    assert columns["markingId"].dtype == np.int64
+    assert columns["errorStart"].tolist() == [0, 0, 1, 1]
+    assert columns["isSource"].tolist() == [False] * 4
+    codes, systems = decode_dictionary(columns, "system")
+    assert [systems[code] for code in codes] == ["Alpha", "Beta", "Alpha", "Beta"]
+    codes, sources = decode_dictionary(columns, "source")
+    assert sources == ["Quelle 0 ü", "Quelle 1 ü"]
+    assert codes.tolist() == [0, 0, 1, 1]
+    assert decode_dictionary(columns, "category")[1] == ["Fluency/Grammar"]
+    assert decode_dictionary(columns, "rater")[1] == ["user"]
+
+
+def test_columnar_results_endpoint(
+    tmp_path: Path,
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = _seed(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+
+    response = client.get(f"/api/evaluations/{evaluation.id}/results?format=npz")
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+    path = tmp_path / "download.npz"
+    path.write_bytes(response.get_data())
+    assert len(load_columns(path)["annotationId"]) == 4
+
+
+def test_export_results_command(
+    app: Flask,
+    tmp_path: Path,
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    _, user = auth_client
+    evaluation = _seed(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    runner = app.test_cli_runner()
+
+    npz_path = tmp_path / "cli.npz"
+    result = runner.invoke(args=["export-results", str(evaluation.id), str(npz_path)])
+    assert result.exit_code == 0, result.output
+    assert len(load_columns(npz_path)["markingId"]) == 4
+
+    tsv_path = tmp_path / "cli.tsv"
+    result = runner.invoke(
+        args=[
+            "export-results",
+            str(evaluation.id),
+            str(tsv_path),
+            "--format",
+            "tsv",
+        ]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(tsv_path.read_text(encoding="utf-8").splitlines()) == 4
+
+    missing = runner.invoke(args=["export-results", "999", str(npz_path)])
+    assert missing.exit_code != 0
+    assert "not found" in missing.output
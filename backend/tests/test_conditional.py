@@ -0,0 +1,181 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from human_evaluation_tool import db
+from human_evaluation_tool.models import Annotation, Bitext, Document, System, User
+
+
+def _statements(client: FlaskClient, url: str, **kwargs: Any) -> tuple[Any, int]:
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = client.get(url, **kwargs)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+    return response, len(statements)
+
+
+def test_single_resource_validators(
+    auth_client: tuple[FlaskClient, User],
+    create_system: Callable[..., System],
+) -> None:
+    client, _ = auth_client
+    system = create_system()
+    url = f"/api/systems/{system.id}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.last_modified == datetime(2023, 1, 1, 12).astimezone()
+
+    cached, statements = _statements(client, url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    assert statements == 1
+
+    response = client.put(url, json={"name": "Renamed"})
+    assert response.status_code == 200
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+    assert client.get("/api/systems/999").status_code == 404
+
+
+def test_if_modified_since(
+    auth_client: tuple[FlaskClient, User],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    document = create_document()
+    url = f"/api/documents/{document.id}"
+
+    last_modified = client.get(url).headers["Last-Modified"]
+    response = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    earlier = "Sat, 01 Jan 2000 00:00:00 GMT"
+    response = client.get(url, headers={"If-Modified-Since": earlier})
+    assert response.status_code == 200
+
+
+def test_collection_validators(
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    document = create_document()
+    bitexts = [create_bitext(document=document) for _ in range(3)]
+
+    response = client.get("/api/bitexts?limit=2")
+    etag = response.headers["ETag"]
+    assert "X-Next-Cursor" in response.headers
+
+    cached, statements = _statements(
+        client, "/api/bitexts?limit=2", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert statements == 1
+
+    assert client.delete(f"/api/bitexts/{bitexts[2].id}").status_code == 204
+    response = client.get("/api/bitexts?limit=2", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_collection_etag_varies_by_representation(
+    auth_client: tuple[FlaskClient, User],
+    create_system: Callable[..., System],
+) -> None:
+    client, _ = auth_client
+    systems = [create_system(name=f"System {index}") for index in range(3)]
+
+    urls = [
+        "/api/systems",
+        "/api/systems?fields=name",
+        "/api/systems?limit=1",
+        f"/api/systems?limit=1&after={systems[0].id}",
+        f"/api/systems?ids={systems[0].id},{systems[1].id}",
+        f"/api/systems?ids={systems[1].id},{systems[0].id}",
+    ]
+    etags = [client.get(url).headers["ETag"] for url in urls]
+    assert len(set(etags)) == len(urls)
+
+    response = client.get(urls[1], headers={"If-None-Match": etags[0]})
+    assert response.status_code == 200
+    assert response.get_json()[0] == {"name": "System 0"}
+    response = client.get(urls[1], headers={"If-None-Match": etags[1]})
+    assert response.status_code == 304
+
+
+def test_collection_ignores_if_modified_since(
+    auth_client: tuple[FlaskClient, User],
+    create_system: Callable[..., System],
+) -> None:
+    client, _ = auth_client
+    systems = [create_system(name=f"System {index}") for index in range(2)]
+
+    response = client.get("/api/systems")
+    assert "Last-Modified" not in response.headers
+
+    assert client.delete(f"/api/systems/{systems[0].id}").status_code == 204
+    response = client.get(
+        "/api/systems", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+    assert [row["id"] for row in response.get_json()] == [systems[1].id]
+
+
+def test_annotation_validators_follow_embedded_objects(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(user=user)
+    single_url = f"/api/annotations/{annotation.id}"
+    collection_etag = client.get("/api/annotations").headers["ETag"]
+    single_etag = client.get(single_url).headers["ETag"]
+
+    annotation.bitext.target = "Edited"
+    annotation.bitext.updatedAt = datetime(2024, 1, 1)
+    db.session.commit()
+
+    response = client.get(
+        "/api/annotations", headers={"If-None-Match": collection_etag}
+    )
+    assert response.status_code == 200
+    assert response.get_json()[0]["bitext"]["target"] == "Edited"
+    response = client.get(single_url, headers={"If-None-Match": single_etag})
+    assert response.status_code == 200
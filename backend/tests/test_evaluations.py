@@ -19,19 +19,24 @@ Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
 Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2025
 """
 
+import json
 from collections.abc import Callable
 from typing import Any
 
+from flask import Flask
 from flask.testing import FlaskClient
 from pytest import MonkeyPatch
+from sqlalchemy import delete, event, select
 from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.test import TestResponse
 
 from human_evaluation_tool import db
+from human_evaluation_tool.export import results_cache
 from human_evaluation_tool.models import (
     Annotation,
     AnnotationSystem,
     Bitext,
+    Document,
     Evaluation,
     Marking,
     System,
@@ -125,6 +130,42 @@ def test_evaluation_annotations(
     assert len(data) == 1
 
 
+def test_evaluation_annotations_constant_queries(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = create_evaluation(name="Eager Eval")
+    bitext = create_bitext()
+    for index in range(3):
+        create_annotation(
+            user=user,
+            evaluation=evaluation,
+            bitext=create_bitext(document=bitext.document, source=f"Line {index}"),
+        )
+    url = f"/api/evaluations/{evaluation.id}/annotations"
+    db.session.expunge_all()
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = _request(client, "get", url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+    # The evaluation lookup, the validator aggregate and the annotations with
+    # evaluation and bitext.
+    assert len(statements) == 3
+
+
 def test_evaluation_annotations_missing_identity(
     auth_client: tuple[FlaskClient, User],
     create_evaluation: Callable[..., Evaluation],
@@ -208,25 +249,22 @@ def test_evaluation_results_skip_missing_bitext(
     auth_client: tuple[FlaskClient, User],
     create_evaluation: Callable[..., Evaluation],
     create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
     create_marking: Callable[..., Marking],
     create_system: Callable[..., System],
     create_bitext: Callable[..., Bitext],
-    monkeypatch: MonkeyPatch,
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Skip Bitext Eval")
     bitext = create_bitext()
     annotation = create_annotation(user=user, evaluation=evaluation, bitext=bitext)
-    create_marking(annotation=annotation, system=create_system())
-
-    original_get: Callable[..., Any] = db.session.get
+    system = create_system()
+    create_annotation_system(annotation=annotation, system=system)
+    create_marking(annotation=annotation, system=system)
 
-    def _fake_get(model: type[Any], identity: int, *args: Any, **kwargs: Any) -> Any:
-        if model.__name__ == "Bitext":
-            return None
-        return original_get(model, identity, *args, **kwargs)
+    db.session.execute(delete(Bitext).where(Bitext.id == bitext.id))
+    db.session.commit()
 
-    monkeypatch.setattr(db.session, "get", _fake_get)
     response = _request(client, "get", f"/api/evaluations/{evaluation.id}/results")
     assert response.status_code == 200
     assert response.get_json() == []
@@ -236,30 +274,114 @@ def test_evaluation_results_skip_missing_document(
     auth_client: tuple[FlaskClient, User],
     create_evaluation: Callable[..., Evaluation],
     create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
     create_marking: Callable[..., Marking],
     create_system: Callable[..., System],
     create_bitext: Callable[..., Bitext],
-    monkeypatch: MonkeyPatch,
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Skip Document Eval")
     bitext = create_bitext()
     annotation = create_annotation(user=user, evaluation=evaluation, bitext=bitext)
-    create_marking(annotation=annotation, system=create_system())
-
-    original_get: Callable[..., Any] = db.session.get
+    system = create_system()
+    create_annotation_system(annotation=annotation, system=system)
+    create_marking(annotation=annotation, system=system)
 
-    def _fake_get(model: type[Any], identity: int, *args: Any, **kwargs: Any) -> Any:
-        if model.__name__ == "Document":
-            return None
-        return original_get(model, identity, *args, **kwargs)
+    db.session.execute(delete(Document).where(Document.id == bitext.documentId))
+    db.session.commit()
 
-    monkeypatch.setattr(db.session, "get", _fake_get)
     response = _request(client, "get", f"/api/evaluations/{evaluation.id}/results")
     assert response.status_code == 200
     assert response.get_json() == []
 
 
+def test_evaluation_results_rows_match_export_format(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = create_evaluation(name="Format Eval")
+    bitext = create_bitext(source="One two\nthree four", target="Target")
+    annotation = create_annotation(
+        user=user, evaluation=evaluation, bitext=bitext, comment="Note"
+    )
+    system = create_system(name="Format System")
+    create_annotation_system(
+        annotation=annotation, system=system, translation="Uno dos\ntres"
+    )
+    create_marking(
+        annotation=annotation,
+        system=system,
+        error_start=1,
+        error_end=2,
+        error_category="A01",
+        error_severity="major",
+        is_source=True,
+    )
+    create_marking(
+        annotation=annotation,
+        system=system,
+        error_start=0,
+        error_end=0,
+        error_category="F03",
+        error_severity="minor",
+        is_source=False,
+    )
+
+    response = _request(client, "get", f"/api/evaluations/{evaluation.id}/results")
+    assert response.status_code == 200
+    assert response.get_json() == [
+        f"Format System\tDoc A\t{bitext.id}\t{bitext.id}\tuser\t"
+        "One <v> two<br>three four </v>\tUno dos<br>tres\t"
+        "Accuracy/Mistranslation\tMajor\tNote\n",
+        f"Format System\tDoc A\t{bitext.id}\t{bitext.id}\tuser\t"
+        "One two<br>three four\t<v> Uno </v> dos<br>tres\t"
+        "Fluency/Grammar\tMinor\tNote\n",
+    ]
+
+
+def test_evaluation_results_query_count_is_constant(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = create_evaluation(name="Query Count Eval")
+    systems = [create_system(name=f"System {index}") for index in range(3)]
+    for _ in range(5):
+        annotation = create_annotation(
+            user=user, evaluation=evaluation, bitext=create_bitext()
+        )
+        for system in systems:
+            create_annotation_system(annotation=annotation, system=system)
+            create_marking(annotation=annotation, system=system)
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = _request(client, "get", f"/api/evaluations/{evaluation.id}/results")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 15
+    # The evaluation lookup, the cache version probe and the joined export.
+    assert len(statements) == 3
+
+
 def test_evaluation_results_without_annotation_system(
     auth_client: tuple[FlaskClient, User],
     create_evaluation: Callable[..., Evaluation],
@@ -365,3 +487,360 @@ def test_evaluation_update_delete_database_errors(
 
     delete_response = _request(client, "delete", f"/api/evaluations/{evaluation.id}")
     assert delete_response.status_code == 500
+
+
+def _seed_results_evaluation(
+    user: User,
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> Evaluation:
+    evaluation = create_evaluation(name="Stream Eval")
+    system = create_system(name="Stream System")
+    for index in range(3):
+        bitext = create_bitext(source=f"Source {index}", target="Target")
+        annotation = create_annotation(user=user, evaluation=evaluation, bitext=bitext)
+        create_annotation_system(annotation=annotation, system=system)
+        create_marking(annotation=annotation, system=system, error_severity="minor")
+    return evaluation
+
+
+def test_evaluation_results_stream_formats(
+    app: Flask,
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    monkeypatch.setitem(app.config, "EXPORT_STREAM_BATCH_SIZE", 2)
+    url = f"/api/evaluations/{evaluation.id}/results"
+
+    expected = _request(client, "get", url).get_json()
+    assert len(expected) == 3
+
+    json_response = _request(client, "get", f"{url}?stream=1")
+    assert json_response.status_code == 200
+    assert "Content-Length" not in json_response.headers
+    assert json.loads(json_response.get_data(as_text=True)) == expected
+
+    tsv_response = _request(client, "get", f"{url}?format=tsv&stream=1")
+    assert tsv_response.status_code == 200
+    assert tsv_response.mimetype == "text/tab-separated-values"
+    assert tsv_response.get_data(as_text=True) == "".join(expected)
+
+    buffered_tsv = _request(client, "get", f"{url}?format=tsv")
+    assert "Content-Length" in buffered_tsv.headers
+    assert buffered_tsv.get_data(as_text=True) == "".join(expected)
+
+    ndjson_response = _request(client, "get", f"{url}?format=ndjson&stream=true")
+    assert ndjson_response.mimetype == "application/x-ndjson"
+    lines = ndjson_response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["source"] for line in lines] == [
+        "<v> Source </v> 0",
+        "<v> Source </v> 1",
+        "<v> Source </v> 2",
+    ]
+    assert json.loads(lines[0])["severity"] == "Minor"
+
+
+def test_evaluation_results_stream_empty(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    client, _ = auth_client
+    evaluation = create_evaluation(name="Empty Stream Eval")
+    response = _request(
+        client, "get", f"/api/evaluations/{evaluation.id}/results?stream=1"
+    )
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_evaluation_results_invalid_format(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    client, _ = auth_client
+    evaluation = create_evaluation(name="Invalid Format Eval")
+    response = _request(
+        client, "get", f"/api/evaluations/{evaluation.id}/results?format=xml"
+    )
+    assert response.status_code == 422
+
+
+def test_evaluation_results_cached_until_marking_changes(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    url = f"/api/evaluations/{evaluation.id}/results"
+    first = _request(client, "get", url).get_json()
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        second = _request(client, "get", url).get_json()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert second == first
+    # Only the version probe runs; the joined export query is not rebuilt.
+    assert len(statements) <= 2
+    assert not any("JOIN document" in statement for statement in statements)
+
+    annotation = db.session.execute(
+        select(Annotation).filter_by(evaluationId=evaluation.id)
+    ).scalars()
+    annotation_id = next(iter(annotation)).id
+    system = db.session.execute(select(System)).scalars().one()
+    create_response = _request(
+        client,
+        "post",
+        f"/api/annotations/{annotation_id}/systems/{system.id}/markings",
+        json={
+            "errorStart": 1,
+            "errorEnd": 1,
+            "errorCategory": "F01",
+            "errorSeverity": "major",
+            "isSource": True,
+        },
+    )
+    assert create_response.status_code == 201
+
+    third = _request(client, "get", url).get_json()
+    assert len(third) == len(first) + 1
+    assert any("Fluency/Spelling" in row for row in third)
+
+
+def test_evaluation_results_too_large_to_cache(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    results_cache.clear()
+    monkeypatch.setattr(results_cache, "max_weight", 100)
+
+    response = _request(client, "get", f"/api/evaluations/{evaluation.id}/results")
+
+    assert len(response.get_json()) == 3
+    assert len(results_cache) == 0
+
+
+def test_evaluation_results_refresh_after_rename(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    url = f"/api/evaluations/{evaluation.id}/results"
+    first = _request(client, "get", url).get_json()
+    assert all("Stream System" in row for row in first)
+
+    system = db.session.execute(select(System)).scalars().one()
+    response = _request(
+        client, "put", f"/api/systems/{system.id}", json={"name": "Renamed"}
+    )
+    assert response.status_code == 200
+
+    renamed = _request(client, "get", url).get_json()
+    assert all("Renamed" in row for row in renamed)
+
+    document = db.session.execute(select(Document)).scalars().first()
+    assert document is not None
+    response = _request(
+        client,
+        "put",
+        f"/api/documents/{document.id}",
+        json={"name": "Renamed Doc", "documentId": document.id},
+    )
+    assert response.status_code == 200
+
+    documents = _request(client, "get", url).get_json()
+    assert any("Renamed Doc" in row for row in documents)
+
+
+def test_evaluation_results_since_cursor(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    url = f"/api/evaluations/{evaluation.id}/results"
+
+    unchanged = _request(client, "get", f"{url}?since=2024-01-01T00:00:00")
+    assert unchanged.status_code == 200
+    assert unchanged.get_json()["rows"] == []
+    assert unchanged.get_json()["deleted"] == {"markings": [], "annotations": []}
+
+    annotations = db.session.execute(
+        select(Annotation).filter_by(evaluationId=evaluation.id).order_by(Annotation.id)
+    ).scalars()
+    first, second, third = annotations
+    system = db.session.execute(select(System)).scalars().one()
+    deleted_marking_id = first.markings[0].id
+    hidden_marking_id = second.markings[0].id
+
+    created = _request(
+        client,
+        "post",
+        f"/api/annotations/{third.id}/systems/{system.id}/markings",
+        json={
+            "errorStart": 1,
+            "errorEnd": 1,
+            "errorCategory": "F01",
+            "errorSeverity": "major",
+            "isSource": True,
+        },
+    )
+    assert created.status_code == 201
+    assert (
+        _request(
+            client,
+            "delete",
+            f"/api/annotations/{first.id}/systems/{system.id}"
+            f"/markings/{deleted_marking_id}",
+        ).status_code
+        == 204
+    )
+    assert (
+        _request(
+            client, "delete", f"/api/annotations/{second.id}/systems/{system.id}"
+        ).status_code
+        == 204
+    )
+
+    response = _request(client, "get", f"{url}?since={unchanged.get_json()['cursor']}")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [row["markingId"] for row in payload["rows"]] == [created.get_json()["id"]]
+    assert payload["rows"][0]["severity"] == "Major"
+    assert payload["deleted"]["annotations"] == []
+    # The second marking still exists but left the export with its system row.
+    assert payload["deleted"]["markings"] == sorted(
+        [deleted_marking_id, hidden_marking_id]
+    )
+
+    invalid = _request(client, "get", f"{url}?since=yesterday")
+    assert invalid.status_code == 422
+    assert invalid.get_json() == {"message": "Invalid cursor"}
+
+
+def test_evaluation_scores(
+    app: Flask,
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, user = auth_client
+    evaluation = _seed_results_evaluation(
+        user,
+        create_evaluation,
+        create_annotation,
+        create_annotation_system,
+        create_marking,
+        create_system,
+        create_bitext,
+    )
+    url = f"/api/evaluations/{evaluation.id}/scores"
+
+    response = _request(client, "get", url)
+    assert response.status_code == 200
+    scores = response.get_json()
+    assert scores["overall"]["segments"] == 3
+    assert scores["overall"]["score"] == 1.0
+    assert [row["name"] for row in scores["systems"]] == ["Stream System"]
+    assert scores["annotators"][0]["name"] == user.email.split("@")[0]
+    assert scores["categories"][0]["errors"] == {"Minor": 3}
+
+    monkeypatch.setitem(app.config, "MQM_SEVERITY_WEIGHTS", {"minor": 2})
+    assert _request(client, "get", url).get_json()["overall"]["score"] == 2.0
+    overridden = _request(client, "get", f"{url}?weights=minor:0.5").get_json()
+    assert overridden["overall"]["score"] == 0.5
+
+    invalid = _request(client, "get", f"{url}?weights=minor:heavy")
+    assert invalid.status_code == 422
+    assert invalid.get_json() == {"message": "Invalid weights"}
+    monkeypatch.setitem(app.config, "MQM_SEVERITY_WEIGHTS", {"minor": "inf"})
+    assert _request(client, "get", url).status_code == 422
+    assert _request(client, "get", "/api/evaluations/999/scores").status_code == 404
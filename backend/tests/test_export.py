@@ -0,0 +1,76 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from pytest import MonkeyPatch
+
+from human_evaluation_tool import export
+from human_evaluation_tool.export import (
+    ResultRecord,
+    render_result_row,
+    render_results,
+    split_annotation_ranges,
+)
+
+
+def _record(annotation_id: int, error_start: int = 0) -> ResultRecord:
+    return ResultRecord(
+        annotationId=annotation_id,
+        markingId=annotation_id * 10 + error_start,
+        systemName="System",
+        documentName="Document",
+        bitextId=annotation_id,
+        source="one two three",
+        email="rater@example.com",
+        translation="uno dos tres",
+        comment=None,
+        errorStart=error_start,
+        errorEnd=error_start,
+        errorCategory="A01",
+        errorSeverity="minor",
+        isSource=False,
+    )
+
+
+def test_split_annotation_ranges_keeps_annotations_together() -> None:
+    records = [_record(1), _record(1), _record(1), _record(2), _record(3), _record(3)]
+
+    ranges = split_annotation_ranges(records, 3)
+
+    assert [[record.annotationId for record in chunk] for chunk in ranges] == [
+        [1, 1, 1],
+        [2, 3, 3],
+    ]
+    assert split_annotation_ranges(records, 1) == [records]
+
+
+def test_render_results_parallel_matches_serial(monkeypatch: MonkeyPatch) -> None:
+    records = [
+        _record(annotation_id, error_start)
+        for annotation_id in range(1, 20)
+        for error_start in range(3)
+    ]
+    monkeypatch.setattr(export, "MIN_RECORDS_PER_WORKER", 1)
+
+    serial = render_results(records, workers=1)
+    parallel = render_results(records, workers=2)
+
+    assert parallel == serial
+    assert serial == [render_result_row(record) for record in records]
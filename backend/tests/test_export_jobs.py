@@ -0,0 +1,381 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+import gzip
+import json
+import socket
+import subprocess
+import sys
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+from sqlalchemy import delete, update
+from werkzeug.test import TestResponse
+
+from human_evaluation_tool import db, export_jobs
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    ExportJob,
+    Marking,
+    System,
+    User,
+)
+
+
+def _request(client: FlaskClient, method: str, url: str, **kwargs: Any) -> TestResponse:
+    request_callable: Callable[..., TestResponse] = getattr(client, method)
+    return request_callable(url, **kwargs)
+
+
+@pytest.fixture
+def export_dir(app: Flask, tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    monkeypatch.setitem(app.config, "EXPORT_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def evaluation(
+    auth_client: tuple[FlaskClient, User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> Evaluation:
+    _, user = auth_client
+    evaluation = create_evaluation(name="Export Eval")
+    system = create_system(name="Export System")
+    for index in range(3):
+        bitext = create_bitext(source=f"Source {index} text", target="Target")
+        annotation = create_annotation(user=user, evaluation=evaluation, bitext=bitext)
+        create_annotation_system(annotation=annotation, system=system)
+        create_marking(annotation=annotation, system=system, error_severity="minor")
+    return evaluation
+
+
+def _wait_for_job(job_id: int) -> None:
+    future = export_jobs._futures.get(job_id)
+    if future is not None:
+        future.result(timeout=30)
+
+
+def _run_job(client: FlaskClient, evaluation_id: int, **body: Any) -> dict[str, Any]:
+    response = _request(
+        client, "post", f"/api/evaluations/{evaluation_id}/exports", json=body
+    )
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers["Location"] == job["url"]
+    _wait_for_job(job["id"])
+
+    status = _request(client, "get", job["url"])
+    assert status.status_code == 200
+    payload: dict[str, Any] = status.get_json()
+    return payload
+
+
+def test_export_job_writes_compressed_artifact(
+    auth_client: tuple[FlaskClient, User], evaluation: Evaluation, export_dir: Path
+) -> None:
+    client, _ = auth_client
+    expected = _request(
+        client, "get", f"/api/evaluations/{evaluation.id}/results"
+    ).get_json()
+
+    job = _run_job(client, evaluation.id)
+
+    assert job["status"] == "finished"
+    assert job["error"] is None
+    assert (export_dir / job["fileName"]).stat().st_size == job["size"]
+    assert not list(export_dir.glob("*.part"))
+
+    download = _request(client, "get", job["downloadUrl"])
+    assert download.status_code == 200
+    assert download.mimetype == "application/gzip"
+    assert download.headers["Accept-Ranges"] == "bytes"
+    body = download.get_data()
+    assert json.loads(gzip.decompress(body)) == expected
+
+    partial = _request(
+        client, "get", job["downloadUrl"], headers={"Range": "bytes=10-19"}
+    )
+    assert partial.status_code == 206
+    assert partial.get_data() == body[10:20]
+
+
+def test_export_job_npz_artifact(
+    auth_client: tuple[FlaskClient, User], evaluation: Evaluation, export_dir: Path
+) -> None:
+    client, _ = auth_client
+
+    job = _run_job(client, evaluation.id, format="npz")
+
+    assert job["status"] == "finished"
+    download = _request(client, "get", job["downloadUrl"])
+    with np.load(BytesIO(download.get_data())) as archive:
+        assert archive["markingId"].shape == (3,)
+
+
+def test_export_job_failure_is_reported(
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    export_dir: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+
+    def _fail(*args: Any, **kwargs: Any) -> int:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(export_jobs, "write_artifact", _fail)
+
+    job = _run_job(client, evaluation.id, format="tsv")
+
+    assert job["status"] == "failed"
+    assert job["error"] == "disk full"
+    assert "downloadUrl" not in job
+    download = _request(
+        client, "get", f"/api/evaluations/{evaluation.id}/exports/{job['id']}/download"
+    )
+    assert download.status_code == 409
+
+
+def test_export_job_validation(
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    create_evaluation: Callable[..., Evaluation],
+    export_dir: Path,
+) -> None:
+    client, _ = auth_client
+    url = f"/api/evaluations/{evaluation.id}/exports"
+
+    invalid = _request(client, "post", url, json={"format": "xlsx"})
+    assert invalid.status_code == 422
+    assert invalid.get_json() == {"message": "Invalid format"}
+
+    missing = _request(client, "post", "/api/evaluations/999/exports", json={})
+    assert missing.status_code == 404
+
+    job = _run_job(client, evaluation.id, format="ndjson")
+    other = create_evaluation(name="Other Eval")
+    wrong_evaluation = _request(
+        client, "get", f"/api/evaluations/{other.id}/exports/{job['id']}"
+    )
+    assert wrong_evaluation.status_code == 404
+
+    listed = _request(client, "get", url).get_json()
+    assert [item["id"] for item in listed] == [job["id"]]
+
+
+def test_delete_export_job_removes_artifact(
+    auth_client: tuple[FlaskClient, User], evaluation: Evaluation, export_dir: Path
+) -> None:
+    client, _ = auth_client
+    job = _run_job(client, evaluation.id)
+    artifact = export_dir / job["fileName"]
+    assert artifact.exists()
+
+    response = _request(client, "delete", job["url"])
+
+    assert response.status_code == 204
+    assert not artifact.exists()
+    assert db.session.get(ExportJob, job["id"]) is None
+
+
+def test_delete_evaluation_removes_export_artifacts(
+    auth_client: tuple[FlaskClient, User], evaluation: Evaluation, export_dir: Path
+) -> None:
+    client, _ = auth_client
+    job = _run_job(client, evaluation.id, format="tsv")
+    artifact = export_dir / job["fileName"]
+
+    response = _request(client, "delete", f"/api/evaluations/{evaluation.id}")
+
+    assert response.status_code == 204
+    assert not artifact.exists()
+
+
+def test_export_job_deleted_while_running_removes_artifact(
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    export_dir: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+
+    def _write_then_delete(
+        evaluation_id: int, result_format: str, path: Path, *args: Any
+    ) -> int:
+        path.write_bytes(b"rows")
+        db.session.execute(
+            delete(ExportJob).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return 4
+
+    monkeypatch.setattr(export_jobs, "write_artifact", _write_then_delete)
+
+    response = _request(
+        client, "post", f"/api/evaluations/{evaluation.id}/exports", json={}
+    )
+    assert response.status_code == 202
+    _wait_for_job(response.get_json()["id"])
+
+    assert not list(export_dir.iterdir())
+    listed = _request(client, "get", f"/api/evaluations/{evaluation.id}/exports")
+    assert listed.get_json() == []
+
+
+def test_stale_export_job_is_failed_and_deletable(
+    app: Flask,
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    export_dir: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+    monkeypatch.setitem(app.config, "EXPORT_JOB_TIMEOUT", 60)
+    now = datetime.now()
+    fresh = ExportJob(
+        evaluationId=evaluation.id,
+        format="json",
+        status="running",
+        createdAt=now,
+        updatedAt=now,
+    )
+    stale = ExportJob(
+        evaluationId=evaluation.id,
+        format="tsv",
+        status="running",
+        createdAt=now - timedelta(hours=2),
+        updatedAt=now - timedelta(hours=2),
+    )
+    db.session.add_all([fresh, stale])
+    db.session.commit()
+    partial = export_dir / f"evaluation-{evaluation.id}-export-{stale.id}.tsv.gz.part"
+    partial.write_bytes(b"partial")
+    url = f"/api/evaluations/{evaluation.id}/exports"
+
+    listed = {job["id"]: job for job in _request(client, "get", url).get_json()}
+    assert listed[fresh.id]["status"] == "running"
+    assert listed[stale.id]["status"] == "failed"
+    assert listed[stale.id]["error"] == "Export job was interrupted"
+    assert not partial.exists()
+
+    busy = _request(client, "delete", f"{url}/{fresh.id}")
+    assert busy.status_code == 409
+    deleted = _request(client, "delete", f"{url}/{stale.id}")
+    assert deleted.status_code == 204
+
+
+def _job(evaluation: Evaluation, owner: str, updated_at: datetime) -> ExportJob:
+    job = ExportJob(
+        evaluationId=evaluation.id,
+        format="json",
+        status="running",
+        owner=owner,
+        createdAt=updated_at,
+        updatedAt=updated_at,
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def test_export_jobs_of_other_processes_expire_by_owner_or_heartbeat(
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    export_dir: Path,
+) -> None:
+    client, _ = auth_client
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    now = datetime.now()
+    other_host = _job(evaluation, "other-host:1", now)
+    silent = _job(evaluation, "other-host:2", now - timedelta(hours=1))
+    exited_here = _job(evaluation, f"{socket.gethostname()}:{exited.pid}", now)
+    alive_here = _job(evaluation, export_jobs.process_owner(), now)
+
+    url = f"/api/evaluations/{evaluation.id}/exports"
+    listed = {
+        job["id"]: job["status"] for job in _request(client, "get", url).get_json()
+    }
+    assert listed == {
+        other_host.id: "running",
+        silent.id: "failed",
+        exited_here.id: "failed",
+        alive_here.id: "running",
+    }
+
+
+def test_touch_jobs_bumps_only_active_jobs(evaluation: Evaluation) -> None:
+    earlier = datetime.now() - timedelta(minutes=10)
+    running = _job(evaluation, "other-host:1", earlier)
+    finished = _job(evaluation, "other-host:1", earlier)
+    finished.status = "finished"
+    db.session.commit()
+
+    export_jobs.touch_jobs([running.id, finished.id])
+    db.session.expire_all()
+
+    assert running.updatedAt > earlier
+    assert finished.updatedAt == earlier
+
+
+def test_export_job_expired_while_running_keeps_failed_status(
+    auth_client: tuple[FlaskClient, User],
+    evaluation: Evaluation,
+    export_dir: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+
+    def _write_then_expire(
+        evaluation_id: int, result_format: str, path: Path, *args: Any
+    ) -> int:
+        path.write_bytes(b"rows")
+        db.session.execute(
+            update(ExportJob)
+            .values(status="failed", error="Export job was interrupted")
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return 4
+
+    monkeypatch.setattr(export_jobs, "write_artifact", _write_then_expire)
+
+    job = _run_job(client, evaluation.id)
+
+    assert job["status"] == "failed"
+    assert job["fileName"] is None
+    assert not list(export_dir.iterdir())
@@ -87,6 +87,18 @@ def test_missing_database_variables_raise(monkeypatch: MonkeyPatch) -> None:
         create_app({})
 
 
+def test_invalid_severity_weights_raise(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("JWT_SECRET_KEY", "secret")
+    for weights in ({"major": "heavy"}, {"minor": float("inf")}, [1, 2]):
+        with pytest.raises(RuntimeError, match="MQM_SEVERITY_WEIGHTS"):
+            create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+                    "MQM_SEVERITY_WEIGHTS": weights,
+                }
+            )
+
+
 def test_config_file_missing_is_tolerated(monkeypatch: MonkeyPatch) -> None:
     monkeypatch.setenv("JWT_SECRET_KEY", "secret")
     monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", "sqlite://")
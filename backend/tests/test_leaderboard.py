@@ -0,0 +1,180 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from human_evaluation_tool import db
+from human_evaluation_tool.leaderboard import leaderboard, system_leaderboard
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+from human_evaluation_tool.scoring import evaluation_scores
+
+
+@pytest.fixture
+def second_evaluation(
+    scored_evaluation: Evaluation,
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> Evaluation:
+    system_a, system_b = sorted(
+        {row.system for row in scored_evaluation.annotations[0].annotation_systems},
+        key=lambda system: system.name,
+    )
+    evaluation = create_evaluation(name="Second")
+    annotation = create_annotation(
+        user=scored_evaluation.annotations[0].user, evaluation=evaluation
+    )
+    create_annotation_system(annotation=annotation, system=system_a)
+    create_annotation_system(annotation=annotation, system=system_b)
+    create_marking(annotation=annotation, system=system_b, error_severity="critical")
+    return evaluation
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    captured: list[str] = []
+
+    def _capture(*args: Any) -> None:
+        captured.append(args[2])
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def test_leaderboard_matches_evaluation_scores(scored_evaluation: Evaluation) -> None:
+    weights = {"critical": 25.0}
+    board = leaderboard(weights)
+    scores = evaluation_scores(scored_evaluation.id, weights)
+
+    assert [row["name"] for row in board["systems"]] == ["System B", "System A"]
+    assert {row["name"]: row["score"] for row in board["systems"]} == {
+        row["name"]: row["score"] for row in scores["systems"]
+    }
+    assert board["systems"][1]["errors"] == {
+        "Critical": 1,
+        "Minor": 1,
+        "NotJudgeable": 1,
+    }
+
+
+def test_leaderboard_and_scores_count_the_same_markings(
+    scored_evaluation: Evaluation,
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    first, second = scored_evaluation.annotations
+    output = next(
+        row for row in second.annotation_systems if row.system.name == "System B"
+    )
+    system = output.system
+    db.session.delete(output)
+    db.session.commit()
+    create_marking(annotation=second, system=system, error_severity="critical")
+
+    def _totals(rows: list[dict[str, Any]]) -> dict[str, tuple[Any, ...]]:
+        return {
+            row["name"]: (row["segments"], row["penalty"], row["errors"])
+            for row in rows
+        }
+
+    scores = evaluation_scores(scored_evaluation.id, {})["systems"]
+    assert _totals(leaderboard()["systems"]) == _totals(scores)
+    assert _totals(scores)["System B"] == (1, 5.0, {"Major": 1})
+
+    create_annotation_system(annotation=second, system=system)
+    scores = evaluation_scores(scored_evaluation.id, {})["systems"]
+    assert _totals(leaderboard()["systems"]) == _totals(scores)
+    assert _totals(scores)["System B"][1] == 16.0
+
+
+def test_leaderboard_pools_evaluations(
+    second_evaluation: Evaluation, statements: list[str]
+) -> None:
+    board = leaderboard()
+
+    system_a, system_b = sorted(board["systems"], key=lambda row: row["name"])
+    assert system_a["evaluations"] == system_b["evaluations"] == 2
+    assert system_a["score"] == pytest.approx(11 / 3)
+    assert system_b["score"] == pytest.approx(16 / 3)
+    assert (system_a["rank"], system_b["rank"]) == (1, 2)
+    # Rollups come from the summary tables, never from the markings.
+    assert not any("FROM marking " in statement for statement in statements)
+
+
+def test_system_leaderboard(
+    scored_evaluation: Evaluation, second_evaluation: Evaluation
+) -> None:
+    system_id = leaderboard()["systems"][0]["id"]
+
+    board = system_leaderboard(system_id)
+
+    assert board["system"]["name"] == "System A"
+    assert board["system"]["segments"] == 3
+    assert [(row["name"], row["rank"]) for row in board["evaluations"]] == [
+        ("Scored", 2),
+        ("Second", 1),
+    ]
+    assert board["evaluations"][1]["systems"] == 2
+
+
+def test_leaderboard_follows_marking_changes(
+    second_evaluation: Evaluation,
+) -> None:
+    for marking in list(second_evaluation.annotations[0].markings):
+        db.session.delete(marking)
+    db.session.commit()
+
+    scores = {row["name"]: row["score"] for row in leaderboard()["systems"]}
+    assert scores["System B"] == pytest.approx(6 / 3)
+
+
+def test_leaderboard_endpoints(
+    auth_client: tuple[FlaskClient, User],
+    second_evaluation: Evaluation,
+    create_system: Callable[..., System],
+) -> None:
+    client, _ = auth_client
+    unused = create_system(name="Unused")
+
+    response = client.get("/api/leaderboard?weights=major:0")
+    assert response.status_code == 200
+    assert response.get_json()["weights"]["major"] == 0
+    assert client.get("/api/leaderboard?weights=bogus:1").status_code == 422
+
+    system_response = client.get(f"/api/systems/{unused.id}/leaderboard")
+    assert system_response.status_code == 200
+    assert system_response.get_json()["evaluations"] == []
+    assert client.get("/api/systems/999/leaderboard").status_code == 404
@@ -28,7 +28,14 @@ from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.test import TestResponse
 
 from human_evaluation_tool import db
-from human_evaluation_tool.models import Annotation, Bitext, Evaluation, System, User
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    System,
+    User,
+)
 
 
 def _request(client: FlaskClient, method: str, url: str, **kwargs: Any) -> TestResponse:
@@ -48,17 +55,21 @@ def _create_annotation_for_user(
 def test_marking_flow(
     auth_client: tuple[FlaskClient, User],
     create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
     create_system: Callable[..., System],
     create_evaluation: Callable[..., Evaluation],
     create_bitext: Callable[..., Bitext],
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Mark Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
     system = create_system(name="Mark System")
+    create_annotation_system(
+        annotation=annotation, system=system, translation="Hallo schöne Welt"
+    )
 
     list_empty = _request(client, "get", f"/api/annotations/{annotation.id}/markings")
     assert list_empty.status_code == 200
@@ -153,7 +164,7 @@ def test_marking_checks_authorization(
     client, user = auth_client
     other_user = create_user(email="other@example.com")
     evaluation = create_evaluation(name="Other Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, other_user, evaluation, bitext
     )
@@ -213,7 +224,7 @@ def test_marking_requires_existing_system(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="System Missing Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -296,7 +307,7 @@ def test_marking_system_not_found_for_operations(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="System Missing Eval 2")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -338,7 +349,7 @@ def test_marking_create_missing_fields(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Missing Fields Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -362,7 +373,7 @@ def test_marking_update_missing_fields(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Update Missing Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -399,7 +410,7 @@ def test_marking_update_not_found(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Update Missing Eval 2")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -429,7 +440,7 @@ def test_marking_delete_not_found(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="Delete Missing Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -453,7 +464,7 @@ def test_marking_database_errors(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="DB Eval")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -488,7 +499,7 @@ def test_marking_update_delete_database_errors(
 ) -> None:
     client, user = auth_client
     evaluation = create_evaluation(name="DB Eval 2")
-    bitext = create_bitext()
+    bitext = create_bitext(source="Hello world")
     annotation = _create_annotation_for_user(
         create_annotation, user, evaluation, bitext
     )
@@ -531,3 +542,100 @@ def test_marking_update_delete_database_errors(
         f"/api/annotations/{annotation.id}/systems/{system.id}/markings/{marking_id}",
     )
     assert delete_response.status_code == 500
+
+
+def test_create_marking_validates_error_span(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    bitext = create_bitext(source="one two three")
+    annotation = create_annotation(user=user, bitext=bitext)
+    system = create_system(name="Span System")
+    create_annotation_system(annotation=annotation, system=system, translation="uno")
+    url = f"/api/annotations/{annotation.id}/systems/{system.id}/markings"
+    payload = {
+        "errorStart": 1,
+        "errorEnd": 2,
+        "errorCategory": "A01",
+        "errorSeverity": "minor",
+        "isSource": True,
+    }
+
+    assert _request(client, "post", url, json=payload).status_code == 201
+
+    out_of_range = {**payload, "errorEnd": 3}
+    assert _request(client, "post", url, json=out_of_range).status_code == 422
+
+    reversed_span = {**payload, "errorStart": 2, "errorEnd": 1}
+    assert _request(client, "post", url, json=reversed_span).status_code == 422
+
+    not_a_number = {**payload, "errorStart": "1"}
+    assert _request(client, "post", url, json=not_a_number).status_code == 422
+
+    translation_span = {**payload, "isSource": False}
+    response = _request(client, "post", url, json=translation_span)
+    assert response.status_code == 422
+    assert response.get_json()["message"] == "Invalid error span"
+    marking_id = _request(
+        client, "post", url, json={**translation_span, "errorStart": 0, "errorEnd": 0}
+    ).get_json()["id"]
+
+    update_response = _request(
+        client, "put", f"{url}/{marking_id}", json=translation_span
+    )
+    assert update_response.status_code == 422
+
+
+def test_create_marking_rejects_span_past_one_token_segment(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_system: Callable[..., System],
+    create_bitext: Callable[..., Bitext],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(user=user, bitext=create_bitext(source="Hello"))
+    system = create_system(name="Short System")
+    url = f"/api/annotations/{annotation.id}/systems/{system.id}/markings"
+    payload = {
+        "errorStart": 0,
+        "errorEnd": 1,
+        "errorCategory": "A01",
+        "errorSeverity": "critical",
+        "isSource": True,
+    }
+
+    response = _request(client, "post", url, json=payload)
+    assert response.status_code == 422
+    assert response.get_json() == {"message": "Invalid error span"}
+    single = {**payload, "errorEnd": 0}
+    assert _request(client, "post", url, json=single).status_code == 201
+
+
+def test_create_marking_requires_segment(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_system: Callable[..., System],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(user=user)
+    system = create_system(name="Missing Output System")
+    url = f"/api/annotations/{annotation.id}/systems/{system.id}/markings"
+
+    response = _request(
+        client,
+        "post",
+        url,
+        json={
+            "errorStart": 0,
+            "errorEnd": 0,
+            "errorCategory": "A01",
+            "errorSeverity": "critical",
+            "isSource": False,
+        },
+    )
+    assert response.status_code == 422
+    assert response.get_json() == {"message": "Segment not found"}
@@ -0,0 +1,297 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+from sqlalchemy import event
+
+from human_evaluation_tool import db
+from human_evaluation_tool.cursors import decode_id_cursor, encode_id_cursor
+from human_evaluation_tool.models import (
+    Annotation,
+    Bitext,
+    Document,
+    Evaluation,
+    System,
+    User,
+)
+
+
+def test_id_cursor_round_trip() -> None:
+    assert decode_id_cursor(encode_id_cursor(42)) == 42
+    assert decode_id_cursor("42") == 42
+    for value in ("", "-1", "not a cursor", encode_id_cursor(1)[:-1] + "!"):
+        with pytest.raises(ValueError):
+            decode_id_cursor(value)
+
+
+def _create_bitexts(
+    create_bitext: Callable[..., Bitext], document: Document, count: int
+) -> list[int]:
+    return [
+        create_bitext(document=document, source=f"Line {index}").id
+        for index in range(count)
+    ]
+
+
+def test_bitexts_follow_next_cursor(
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    ids = _create_bitexts(create_bitext, create_document(), 5)
+
+    seen: list[int] = []
+    url = "/api/bitexts?limit=2"
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page) <= 2
+        seen.extend(row["id"] for row in page)
+        if "X-Next-Cursor" not in response.headers:
+            assert "Link" not in response.headers
+            break
+        cursor = response.headers["X-Next-Cursor"]
+        assert response.headers["Link"] == (
+            f'</api/bitexts?limit=2&after={cursor}>; rel="next"'
+        )
+        url = f"/api/bitexts?limit=2&after={cursor}"
+
+    assert seen == ids
+    assert len(client.get(f"/api/bitexts?after={ids[2]}").get_json()) == 2
+
+
+def test_nested_collection_paginates(
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    document = create_document()
+    ids = _create_bitexts(create_bitext, document, 3)
+
+    response = client.get(f"/api/documents/{document.id}/bitexts?limit=2")
+    assert [row["id"] for row in response.get_json()] == ids[:2]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/api/documents/{document.id}/bitexts?after={cursor}")
+    assert [row["id"] for row in response.get_json()] == ids[2:]
+
+
+def test_unpaginated_calls_are_capped(
+    app: Flask,
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+    ids = _create_bitexts(create_bitext, create_document(), 3)
+    monkeypatch.setitem(app.config, "PAGINATION_MAX_LIMIT", 2)
+
+    response = client.get("/api/bitexts")
+    assert [row["id"] for row in response.get_json()] == ids[:2]
+    assert decode_id_cursor(response.headers["X-Next-Cursor"]) == ids[1]
+    assert client.get("/api/bitexts?limit=3").status_code == 422
+
+    monkeypatch.setitem(app.config, "PAGINATION_LEGACY_UNBOUNDED", True)
+    response = client.get("/api/bitexts")
+    assert [row["id"] for row in response.get_json()] == ids
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize(
+    ("query", "message"),
+    [
+        ("after=bogus", "Invalid cursor"),
+        ("limit=0", "Invalid limit"),
+        ("limit=ten", "Invalid limit"),
+    ],
+)
+def test_invalid_pagination_arguments(
+    auth_client: tuple[FlaskClient, User], query: str, message: str
+) -> None:
+    client, _ = auth_client
+
+    for url in ("/api/users", "/api/evaluations", "/api/annotations"):
+        response = client.get(f"{url}?{query}")
+        assert response.status_code == 422
+        assert response.get_json() == {"message": message}
+
+
+def test_fields_project_columns_in_sql(
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    document = create_document()
+    ids = _create_bitexts(create_bitext, document, 3)
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = client.get("/api/bitexts?fields=source,documentId&limit=2")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    assert response.get_json() == [
+        {"source": "Line 0", "documentId": document.id},
+        {"source": "Line 1", "documentId": document.id},
+    ]
+    assert decode_id_cursor(response.headers["X-Next-Cursor"]) == ids[1]
+    # The validator aggregate, then the projected page.
+    assert len(statements) == 2
+    assert "target" not in statements[1]
+    assert "createdAt" not in statements[1]
+
+
+def test_fields_on_annotations(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(user=user, is_annotated=True)
+
+    response = client.get("/api/annotations?fields=id,isAnnotated,bitextId")
+    assert response.get_json() == [
+        {"id": annotation.id, "isAnnotated": True, "bitextId": annotation.bitextId}
+    ]
+    url = f"/api/evaluations/{annotation.evaluationId}/annotations?fields=userId"
+    assert client.get(url).get_json() == [{"userId": user.id}]
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        ("", "Invalid fields"),
+        ("id,password", "Unknown fields: password"),
+        ("email,name,bogus", "Unknown fields: name, bogus"),
+    ],
+)
+def test_invalid_fields(
+    auth_client: tuple[FlaskClient, User], fields: str, message: str
+) -> None:
+    client, _ = auth_client
+
+    response = client.get(f"/api/users?fields={fields}")
+    assert response.status_code == 422
+    assert response.get_json() == {"message": message}
+
+
+def test_ids_resolve_in_request_order(
+    auth_client: tuple[FlaskClient, User],
+    create_bitext: Callable[..., Bitext],
+    create_document: Callable[..., Document],
+) -> None:
+    client, _ = auth_client
+    ids = _create_bitexts(create_bitext, create_document(), 3)
+    missing = ids[-1] + 1
+
+    statements: list[str] = []
+
+    def _count(*args: Any) -> None:
+        statements.append(args[2])
+
+    query = f"{ids[2]},{missing},{ids[0]},{ids[2]}"
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        response = client.get(f"/api/bitexts?ids={query}&fields=id,source")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "items": [
+            {"id": ids[2], "source": "Line 2"},
+            {"id": ids[0], "source": "Line 0"},
+        ],
+        "missing": [missing],
+    }
+    assert len(statements) == 2
+
+
+def test_lookup_by_post_body(
+    auth_client: tuple[FlaskClient, User],
+    create_system: Callable[..., System],
+) -> None:
+    client, _ = auth_client
+    systems = [create_system(name=f"System {index}") for index in range(3)]
+
+    response = client.post(
+        "/api/systems/lookup",
+        json={"ids": [systems[1].id, systems[0].id, 999]},
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["System 1", "System 0"]
+    assert data["missing"] == [999]
+
+
+def test_annotation_lookup_hides_other_users(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_evaluation: Callable[..., Evaluation],
+    create_user: Callable[..., User],
+) -> None:
+    client, user = auth_client
+    evaluation = create_evaluation()
+    own = create_annotation(user=user, evaluation=evaluation)
+    other = create_annotation(
+        user=create_user(email="other@example.com"), evaluation=evaluation
+    )
+
+    response = client.post("/api/annotations/lookup", json={"ids": [other.id, own.id]})
+    data = response.get_json()
+    assert [item["id"] for item in data["items"]] == [own.id]
+    assert data["missing"] == [other.id]
+
+
+def test_invalid_ids(
+    app: Flask,
+    auth_client: tuple[FlaskClient, User],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    client, _ = auth_client
+
+    for query in ("", "1,,2", "1,x", "-1"):
+        response = client.get(f"/api/documents?ids={query}")
+        assert response.status_code == 422
+        assert response.get_json() == {"message": "Invalid ids"}
+    bodies: list[Any] = [{}, {"ids": []}, {"ids": [True]}, {"ids": ["1"]}, [1]]
+    for body in bodies:
+        response = client.post("/api/evaluations/lookup", json=body)
+        assert response.status_code == 422
+
+    monkeypatch.setitem(app.config, "PAGINATION_MAX_LIMIT", 2)
+    response = client.post("/api/users/lookup", json={"ids": [1, 2, 3]})
+    assert response.get_json() == {"message": "Too many ids"}
@@ -0,0 +1,163 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from typing import Any, Callable
+
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from human_evaluation_tool import db
+from human_evaluation_tool.models import Evaluation, Marking, System, User
+from human_evaluation_tool.queries import compile_query, run_query
+
+
+def test_group_by_system_and_severity(scored_evaluation: Evaluation) -> None:
+    result = run_query(
+        {
+            "groupBy": ["system", "severity"],
+            "filters": {"evaluation": scored_evaluation.id},
+            "measures": ["count", "penalty"],
+        }
+    )
+
+    assert result["columns"] == ["systemId", "system", "severity", "count", "penalty"]
+    rows = {(row["system"], row["severity"]): row for row in result["rows"]}
+    assert rows[("System A", "critical")]["penalty"] == 10.0
+    assert rows[("System B", "no-error")]["count"] == 1
+    assert rows[("System B", "no-error")]["penalty"] == 0.0
+    assert sum(row["count"] for row in result["rows"]) == 6
+    assert result["truncated"] is False
+
+
+def test_filters_segments_and_ordering(scored_evaluation: Evaluation) -> None:
+    result = run_query(
+        {
+            "groupBy": ["nativeLanguage", "user"],
+            "filters": {"category": ["A01", "F01"], "isSource": True},
+            "measures": ["segments", "count"],
+            "orderBy": "-count",
+        },
+        {"critical": 25.0},
+    )
+
+    assert [(row["user"], row["count"], row["segments"]) for row in result["rows"]] == [
+        ("first", 3, 2),
+        ("second", 2, 2),
+    ]
+    assert {row["nativeLanguage"] for row in result["rows"]} == {"en"}
+
+
+def test_count_does_not_depend_on_segments_measure(
+    scored_evaluation: Evaluation,
+    create_system: Callable[..., System],
+    create_marking: Callable[..., Marking],
+) -> None:
+    annotation = scored_evaluation.annotations[0]
+    create_marking(annotation=annotation, system=create_system(name="Unscored"))
+    spec = {"groupBy": ["system"], "filters": {"evaluation": scored_evaluation.id}}
+
+    counts = run_query({**spec, "measures": ["count"]})["rows"]
+    with_segments = run_query({**spec, "measures": ["count", "segments"]})["rows"]
+
+    assert [row["count"] for row in counts] == [3, 3]
+    assert [row["count"] for row in with_segments] == [3, 3]
+    assert [row["system"] for row in counts] == ["System A", "System B"]
+
+
+def test_query_is_one_statement_without_orm_objects(
+    scored_evaluation: Evaluation,
+) -> None:
+    statements: list[str] = []
+
+    def _capture(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _capture)
+    try:
+        result = run_query({"groupBy": ["document", "category"], "limit": 2})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture)
+
+    assert len(statements) == 1
+    assert "GROUP BY" in statements[0]
+    assert len(result["rows"]) == 2
+    assert result["truncated"] is True
+    assert all(type(row) is dict for row in result["rows"])
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"groupBy": ["password"]},
+        {"groupBy": "system"},
+        {"measures": ["max"]},
+        {"measures": []},
+        {"filters": {"severity": []}},
+        {"filters": {"severity": [{"$ne": 1}]}},
+        {"filters": ["system"]},
+        {"filters": {"system": "abc"}},
+        {"filters": {"severity": 5}},
+        {"filters": {"user": True}},
+        {"filters": {"isSource": 1}},
+        {"filters": {"evaluation": [1, "2"]}},
+        {"groupBy": ["system"], "orderBy": "createdAt"},
+    ],
+)
+def test_compile_query_rejects_invalid_specs(spec: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        compile_query(spec)
+
+
+def test_query_endpoint(
+    auth_client: tuple[FlaskClient, User], scored_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+
+    response = client.post(
+        "/api/analytics/query",
+        json={
+            "groupBy": ["category"],
+            "measures": ["penalty"],
+            "weights": {"minor": 3},
+            "filters": {"evaluation": [scored_evaluation.id]},
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["rows"] == [
+        {"category": "000", "penalty": 0.0},
+        {"category": "A01", "penalty": 15.0},
+        {"category": "F01", "penalty": 6.0},
+    ]
+
+    invalid = client.post("/api/analytics/query", json={"groupBy": ["secret"]})
+    assert invalid.status_code == 422
+    assert invalid.get_json()["message"] == "Unknown fields: secret"
+    assert client.post("/api/analytics/query", json=[]).status_code == 422
+    mistyped = client.post("/api/analytics/query", json={"filters": {"system": "abc"}})
+    assert mistyped.status_code == 422
+    assert mistyped.get_json() == {
+        "message": "Invalid filter value for system: expected int"
+    }
+    assert (
+        client.post("/api/analytics/query", json={"weights": {"minor": -1}})
+    ).status_code == 422
+    assert client.post("/api/analytics/query", json={"limit": 0}).status_code == 422
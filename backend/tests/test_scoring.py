@@ -0,0 +1,153 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+import pytest
+from flask import Flask
+from pytest import MonkeyPatch
+
+from human_evaluation_tool.models import Evaluation
+from human_evaluation_tool.scoring import (
+    DEFAULT_SEVERITY_WEIGHTS,
+    cached_evaluation_scores,
+    configured_weights,
+    evaluation_scores,
+    parse_weights,
+    scores_cache,
+    severity_weights,
+)
+
+
+def _by_name(rows: list[dict[str, object]]) -> dict[object, dict[str, object]]:
+    return {row["name"]: row for row in rows}
+
+
+def test_evaluation_scores_breakdowns(scored_evaluation: Evaluation) -> None:
+    scores = evaluation_scores(scored_evaluation.id)
+
+    assert scores["weights"] == DEFAULT_SEVERITY_WEIGHTS
+    assert scores["overall"] == {
+        "segments": 4,
+        "penalty": 17.0,
+        "score": 4.25,
+        "errors": {"Critical": 1, "Minor": 2, "Major": 1, "NotJudgeable": 1},
+    }
+
+    systems = _by_name(scores["systems"])
+    assert systems["System A"]["score"] == 5.5
+    assert systems["System A"]["errors"] == {
+        "Critical": 1,
+        "Minor": 1,
+        "NotJudgeable": 1,
+    }
+    assert systems["System B"]["score"] == 3.0
+
+    documents = _by_name(scores["documents"])
+    assert documents["Doc 1"]["penalty"] == 16.0
+    assert documents["Doc 2"]["score"] == 0.5
+    annotators = _by_name(scores["annotators"])
+    assert annotators["first"]["score"] == 8.0
+    assert annotators["second"]["segments"] == 2
+
+    assert scores["categories"] == [
+        {
+            "category": "A01",
+            "name": "Accuracy/Mistranslation",
+            "segments": 4,
+            "penalty": 15.0,
+            "score": 3.75,
+            "errors": {"Critical": 1, "Major": 1, "NotJudgeable": 1},
+        },
+        {
+            "category": "F01",
+            "name": "Fluency/Spelling",
+            "segments": 4,
+            "penalty": 2.0,
+            "score": 0.5,
+            "errors": {"Minor": 2},
+        },
+    ]
+
+
+def test_evaluation_scores_custom_weights(scored_evaluation: Evaluation) -> None:
+    scores = evaluation_scores(scored_evaluation.id, {"major": 25, "minor": 0})
+
+    systems = _by_name(scores["systems"])
+    assert systems["System A"]["penalty"] == 10.0
+    assert systems["System B"]["score"] == 12.5
+
+
+def test_evaluation_scores_empty_evaluation(
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    scores = evaluation_scores(create_evaluation().id)
+
+    assert scores["overall"]["segments"] == 0
+    assert scores["overall"]["score"] == 0.0
+    assert scores["systems"] == scores["categories"] == []
+
+
+def test_cached_scores_are_keyed_by_weights(scored_evaluation: Evaluation) -> None:
+    default = cached_evaluation_scores(scored_evaluation.id)
+    heavy = cached_evaluation_scores(scored_evaluation.id, {"critical": 25})
+
+    assert len(scores_cache) == 2
+    assert cached_evaluation_scores(scored_evaluation.id) is default
+    assert heavy["overall"]["penalty"] == 32.0
+
+
+def test_parse_weights() -> None:
+    assert parse_weights("") == {}
+    assert parse_weights("major:5, minor:0.5") == {"major": 5.0, "minor": 0.5}
+    for invalid in ("major", "major:heavy", "fatal:3", "minor:-1", "major:inf"):
+        with pytest.raises(ValueError):
+            parse_weights(invalid)
+
+
+def test_severity_weights_rejects_unknown_severity() -> None:
+    with pytest.raises(ValueError):
+        severity_weights({"blocker": 1})
+    with pytest.raises(ValueError, match="never penalised"):
+        severity_weights({"no-error": 1})
+
+
+def test_configured_weights_layers_request_over_config(
+    app: Flask, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setitem(app.config, "MQM_SEVERITY_WEIGHTS", {"major": 4, "minor": 2})
+
+    assert configured_weights() == {"major": 4, "minor": 2}
+    assert configured_weights("minor:0.5") == {"major": 4, "minor": 0.5}
+    with pytest.raises(ValueError):
+        configured_weights("fatal:3")
+
+
+def test_configured_weights_validates_config(
+    app: Flask, monkeypatch: MonkeyPatch
+) -> None:
+    for invalid in ({"major": "heavy"}, {"major": None}, {"minor": float("nan")}):
+        monkeypatch.setitem(app.config, "MQM_SEVERITY_WEIGHTS", invalid)
+        with pytest.raises(ValueError):
+            configured_weights()
+
+    monkeypatch.setitem(app.config, "MQM_SEVERITY_WEIGHTS", {"minor": "inf"})
+    assert configured_weights("minor:2") == {"minor": 2.0}
@@ -0,0 +1,134 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+from sqlalchemy import select
+
+from human_evaluation_tool import db, significance
+from human_evaluation_tool.models import Evaluation, System, User
+from human_evaluation_tool.significance import (
+    compare_systems,
+    paired_bootstrap,
+    segment_penalties,
+)
+
+
+def _system_ids() -> tuple[int, int]:
+    ids = db.session.execute(select(System.id).order_by(System.name)).scalars().all()
+    return ids[0], ids[1]
+
+
+def test_segment_penalties(scored_evaluation: Evaluation) -> None:
+    bitext_ids, penalties = segment_penalties(scored_evaluation.id, _system_ids())
+
+    assert len(bitext_ids) == 2
+    assert penalties.tolist() == [[11.0, 5.0], [0.0, 1.0]]
+
+    _, swapped = segment_penalties(scored_evaluation.id, _system_ids()[::-1])
+    assert swapped.tolist() == [[5.0, 11.0], [1.0, 0.0]]
+
+
+def test_paired_bootstrap_detects_a_clear_difference() -> None:
+    rng = np.random.default_rng(1)
+    penalties = np.column_stack(
+        [rng.uniform(4, 6, size=200), rng.uniform(0, 2, size=200)]
+    )
+
+    result = paired_bootstrap(penalties, samples=500, seed=3)
+
+    assert result["pValue"] == 0.0
+    assert result["deltaInterval"][0] > 0
+    low, high = result["intervals"][0]
+    assert low <= result["scores"][0] <= high
+
+
+def test_paired_bootstrap_identical_systems() -> None:
+    penalties = np.repeat(np.arange(10, dtype=np.float64)[:, None], 2, axis=1)
+
+    result = paired_bootstrap(penalties, samples=200)
+
+    assert result["delta"] == 0.0
+    assert result["pValue"] == 1.0
+
+
+def test_paired_bootstrap_is_seeded_and_chunk_independent(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    penalties = np.random.default_rng(0).uniform(0, 5, size=(30, 2))
+    expected = paired_bootstrap(penalties, samples=100, seed=7)
+
+    assert paired_bootstrap(penalties, samples=100, seed=7) == expected
+    monkeypatch.setattr(significance, "BOOTSTRAP_CHUNK_CELLS", 45)
+    assert paired_bootstrap(penalties, samples=100, seed=7) == expected
+
+
+def test_compare_systems_without_shared_segments(
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    result = compare_systems(create_evaluation().id, (1, 2))
+
+    assert result["segments"] == 0
+    assert result["pValue"] is None
+    assert [system["score"] for system in result["systems"]] == [None, None]
+
+
+def test_significance_endpoint(
+    auth_client: tuple[FlaskClient, User], scored_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+    first, second = _system_ids()
+    url = f"/api/evaluations/{scored_evaluation.id}/significance"
+
+    response = client.get(f"{url}?systems={first},{second}&samples=300&seed=5")
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["segments"] == 2
+    assert result["samples"] == 300
+    assert [system["name"] for system in result["systems"]] == [
+        "System A",
+        "System B",
+    ]
+    assert result["delta"] == 2.5
+    assert 0.0 <= result["pValue"] <= 1.0
+    again = client.get(f"{url}?systems={first},{second}&samples=300&seed=5")
+    assert again.get_json() == result
+    assert len(significance.significance_cache) == 1
+
+    for query, message in (
+        ("", "Invalid systems"),
+        (f"systems={first},{first}", "Invalid systems"),
+        (f"systems={first},x", "Invalid systems"),
+        (f"systems={first},{second}&samples=0", "Invalid samples"),
+        (f"systems={first},{second}&samples=many", "Invalid samples"),
+        (f"systems={first},{second}&seed=-1", "Invalid seed"),
+        (f"systems={first},{second}&confidence=1.5", "Invalid confidence"),
+        (f"systems={first},{second}&weights=major", "Invalid weights"),
+    ):
+        invalid = client.get(f"{url}?{query}")
+        assert invalid.status_code == 422, query
+        assert invalid.get_json() == {"message": message}
+
+    missing = client.get("/api/evaluations/999/significance?systems=1,2")
+    assert missing.status_code == 404
@@ -0,0 +1,210 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from human_evaluation_tool import db
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Bitext,
+    Evaluation,
+    EvaluationProgress,
+    Marking,
+    System,
+    User,
+)
+from human_evaluation_tool.summaries import (
+    expected_summaries,
+    stored_summaries,
+    summary_drift,
+)
+
+
+def _assert_in_sync() -> None:
+    assert stored_summaries() == expected_summaries()
+    assert summary_drift() == []
+
+
+def test_factories_keep_summaries_in_sync(scored_evaluation: Evaluation) -> None:
+    markings, segments, progress = stored_summaries([scored_evaluation.id])
+
+    assert sum(markings.values()) == 6
+    assert sum(segments.values()) == 4
+    assert progress == {scored_evaluation.id: (2, 0)}
+    _assert_in_sync()
+
+
+def test_marking_api_updates_summaries(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_bitext: Callable[..., Bitext],
+    create_system: Callable[..., System],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(
+        user=user, bitext=create_bitext(source="Hello world")
+    )
+    system = create_system()
+    create_annotation_system(annotation=annotation, system=system)
+    url = f"/api/annotations/{annotation.id}/systems/{system.id}/markings"
+    payload = {
+        "errorStart": 0,
+        "errorEnd": 1,
+        "errorCategory": "A01",
+        "errorSeverity": "major",
+        "isSource": True,
+    }
+
+    marking_id = client.post(url, json=payload).get_json()["id"]
+    client.post(url, json=payload)
+    _assert_in_sync()
+
+    client.put(f"{url}/{marking_id}", json={**payload, "errorSeverity": "minor"})
+    markings = stored_summaries().markings
+    assert markings == {
+        (annotation.evaluationId, system.id, "A01", "major"): 1,
+        (annotation.evaluationId, system.id, "A01", "minor"): 1,
+    }
+    _assert_in_sync()
+
+    assert client.delete(f"{url}/{marking_id}").status_code == 204
+    _assert_in_sync()
+
+
+def test_markings_count_only_with_a_system_output(
+    scored_evaluation: Evaluation,
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+) -> None:
+    annotation = scored_evaluation.annotations[0]
+    system = create_system(name="Pending")
+    create_marking(annotation=annotation, system=system)
+    assert sum(stored_summaries().markings.values()) == 6
+    _assert_in_sync()
+
+    output = create_annotation_system(annotation=annotation, system=system)
+    assert sum(stored_summaries().markings.values()) == 7
+    _assert_in_sync()
+
+    db.session.delete(output)
+    db.session.commit()
+    assert sum(stored_summaries().markings.values()) == 6
+    _assert_in_sync()
+
+
+def test_annotation_updates_move_progress_and_markings(
+    auth_client: tuple[FlaskClient, User],
+    scored_evaluation: Evaluation,
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    client, _ = auth_client
+    other = create_evaluation(name="Other")
+    annotation = scored_evaluation.annotations[0]
+    payload = {
+        "userId": annotation.userId,
+        "evaluationId": scored_evaluation.id,
+        "bitextId": annotation.bitextId,
+        "isAnnotated": True,
+    }
+
+    client.put(f"/api/annotations/{annotation.id}", json=payload)
+    assert stored_summaries().progress[scored_evaluation.id] == (2, 1)
+    _assert_in_sync()
+
+    client.put(
+        f"/api/annotations/{annotation.id}",
+        json={**payload, "evaluationId": other.id},
+    )
+    _, segments, progress = stored_summaries()
+    assert progress == {scored_evaluation.id: (1, 0), other.id: (1, 1)}
+    assert sum(count for key, count in segments.items() if key[0] == other.id) == 2
+    _assert_in_sync()
+
+
+def test_deletes_remove_summary_rows(
+    auth_client: tuple[FlaskClient, User], scored_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+    annotation = scored_evaluation.annotations[0]
+
+    assert client.delete(f"/api/annotations/{annotation.id}").status_code == 204
+    _assert_in_sync()
+
+    evaluation_id = scored_evaluation.id
+    assert client.delete(f"/api/evaluations/{evaluation_id}").status_code == 204
+    assert stored_summaries() == ({}, {}, {})
+    assert db.session.get(EvaluationProgress, evaluation_id) is None
+
+
+def test_rebuild_summaries_command_repairs_drift(
+    app: Flask, scored_evaluation: Evaluation
+) -> None:
+    progress = db.session.get(EvaluationProgress, scored_evaluation.id)
+    assert progress is not None
+    progress.annotated = 5
+    db.session.commit()
+    runner = app.test_cli_runner()
+
+    check = runner.invoke(args=["rebuild-summaries", "--check"])
+    assert check.exit_code == 1
+    assert f"evaluation {scored_evaluation.id} progress" in check.output
+
+    rebuild = runner.invoke(args=["rebuild-summaries", str(scored_evaluation.id)])
+    assert rebuild.exit_code == 0
+    assert runner.invoke(args=["rebuild-summaries", "--check"]).exit_code == 0
+    _assert_in_sync()
+
+
+def test_read_evaluation_summary(
+    auth_client: tuple[FlaskClient, User],
+    scored_evaluation: Evaluation,
+) -> None:
+    client, _ = auth_client
+
+    response = client.get(f"/api/evaluations/{scored_evaluation.id}/summary")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["annotations"] == 2
+    assert body["annotated"] == 0
+    assert body["pending"] == 2
+    assert body["markings"] == 6
+    assert [row["segments"] for row in body["systems"]] == [2, 2]
+    assert sum(row["count"] for row in body["counts"]) == 6
+    assert client.get("/api/evaluations/999/summary").status_code == 404
+
+
+def test_system_outputs_update_segments(scored_evaluation: Evaluation) -> None:
+    system = scored_evaluation.annotations[0].annotation_systems[0].system
+
+    db.session.delete(system)
+    db.session.commit()
+
+    segments = stored_summaries().segments
+    assert list(segments.values()) == [2]
+    assert (scored_evaluation.id, system.id) not in segments
+    _assert_in_sync()
@@ -0,0 +1,175 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+from sqlalchemy import inspect
+
+from human_evaluation_tool import db
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Evaluation,
+    Marking,
+    System,
+    User,
+)
+from human_evaluation_tool.sync import user_changes
+
+
+def test_sync_returns_changes_and_deletions(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_evaluation: Callable[..., Evaluation],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_user: Callable[..., User],
+) -> None:
+    client, user = auth_client
+    evaluation = create_evaluation()
+    system = create_system()
+    annotation = create_annotation(user=user, evaluation=evaluation)
+    output = create_annotation_system(annotation=annotation, system=system)
+    kept, removed = (
+        create_marking(annotation=annotation, system=system) for _ in range(2)
+    )
+    other = create_annotation(
+        user=create_user(email="other@example.com"), evaluation=evaluation
+    )
+    create_marking(annotation=other, system=system)
+
+    response = client.get("/api/sync")
+    assert response.status_code == 200
+    snapshot = response.get_json()
+    assert [row["id"] for row in snapshot["annotations"]] == [annotation.id]
+    assert snapshot["annotations"][0]["evaluation"]["id"] == evaluation.id
+    assert [row["id"] for row in snapshot["annotationSystems"]] == [output.id]
+    assert [row["id"] for row in snapshot["markings"]] == [kept.id, removed.id]
+    assert snapshot["deleted"] == {
+        "annotations": [],
+        "annotationSystems": [],
+        "markings": [],
+    }
+
+    kept.errorSeverity = "minor"
+    kept.updatedAt = datetime.now()
+    db.session.delete(removed)
+    db.session.commit()
+
+    response = client.get(f"/api/sync?since={snapshot['cursor']}")
+    delta = response.get_json()
+    assert delta["annotations"] == []
+    assert delta["annotationSystems"] == []
+    assert [row["errorSeverity"] for row in delta["markings"]] == ["minor"]
+    assert delta["deleted"]["markings"] == [removed.id]
+    assert delta["cursor"] != snapshot["cursor"]
+
+
+def test_sync_skips_deletions_of_rows_sent_again(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    client, user = auth_client
+    annotation = create_annotation(user=user)
+    cursor = client.get("/api/sync").get_json()["cursor"]
+
+    annotation.evaluationId = create_evaluation(name="Moved").id
+    annotation.updatedAt = datetime.now()
+    db.session.commit()
+
+    delta = client.get(f"/api/sync?since={cursor}").get_json()
+    assert [row["id"] for row in delta["annotations"]] == [annotation.id]
+    assert delta["deleted"]["annotations"] == []
+
+
+def test_sync_moves_annotation_between_users(
+    auth_client: tuple[FlaskClient, User],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+    create_user: Callable[..., User],
+) -> None:
+    client, user = auth_client
+    new_owner = create_user(email="new-owner@example.com")
+    system = create_system()
+    annotation = create_annotation(user=user)
+    output = create_annotation_system(annotation=annotation, system=system)
+    marking = create_marking(annotation=annotation, system=system)
+    touched = marking.updatedAt
+    since = datetime.now()
+
+    response = client.put(
+        f"/api/annotations/{annotation.id}",
+        json={
+            "userId": new_owner.id,
+            "evaluationId": annotation.evaluationId,
+            "bitextId": annotation.bitextId,
+        },
+    )
+    assert response.status_code == 200
+
+    previous = user_changes(user.id, since)
+    assert previous["annotations"] == []
+    assert previous["deleted"] == {
+        "annotations": [annotation.id],
+        "annotationSystems": [],
+        "markings": [],
+    }
+
+    current = user_changes(new_owner.id, since)
+    assert [row["id"] for row in current["annotations"]] == [annotation.id]
+    assert [row["id"] for row in current["annotationSystems"]] == [output.id]
+    assert [row["id"] for row in current["markings"]] == [marking.id]
+    assert current["deleted"]["annotations"] == []
+    db.session.refresh(marking)
+    assert marking.updatedAt == touched
+
+
+def test_sync_rejects_invalid_cursor(auth_client: tuple[FlaskClient, User]) -> None:
+    client, _ = auth_client
+
+    response = client.get("/api/sync?since=not-a-cursor")
+    assert response.status_code == 422
+    assert response.get_json() == {"message": "Invalid cursor"}
+
+
+def test_sync_missing_identity(
+    auth_client: tuple[FlaskClient, User], monkeypatch: MonkeyPatch
+) -> None:
+    client, _ = auth_client
+
+    monkeypatch.setattr(
+        "human_evaluation_tool.resources.sync.get_jwt_identity", lambda: None
+    )
+    assert client.get("/api/sync").status_code == 401
+
+
+def test_updated_at_columns_are_indexed() -> None:
+    inspector = inspect(db.engine)
+    for table in ("annotation", "annotation_system", "marking"):
+        indexed = [index["column_names"] for index in inspector.get_indexes(table)]
+        assert ["updatedAt"] in indexed
@@ -0,0 +1,122 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from human_evaluation_tool import db
+from human_evaluation_tool.models import Annotation, Evaluation, Marking, System, User
+from human_evaluation_tool.throughput import evaluation_throughput
+
+
+def _at(minute: int) -> datetime:
+    return datetime(2026, 10, 1, 10, 0) + timedelta(minutes=minute)
+
+
+@pytest.fixture
+def timed_evaluation(
+    create_user: Callable[..., User],
+    create_evaluation: Callable[..., Evaluation],
+    create_annotation: Callable[..., Annotation],
+    create_marking: Callable[..., Marking],
+    create_system: Callable[..., System],
+) -> Evaluation:
+    evaluation = create_evaluation(name="Timed")
+    user = create_user(email="timed@example.com")
+    system = create_system(name="Timed System")
+    first = create_annotation(user=user, evaluation=evaluation, is_annotated=True)
+    second = create_annotation(user=user, evaluation=evaluation, is_annotated=True)
+    first.updatedAt = _at(5)
+    second.updatedAt = _at(62)
+    for annotation, created, updated in (
+        (first, 0, 0),
+        (first, 1, 1),
+        (first, 3, 4),
+        (second, 60, 60),
+    ):
+        marking = create_marking(annotation=annotation, system=system)
+        marking.createdAt, marking.updatedAt = _at(created), _at(updated)
+    db.session.commit()
+    return evaluation
+
+
+def test_evaluation_throughput(timed_evaluation: Evaluation) -> None:
+    statistics = evaluation_throughput(timed_evaluation.id)
+
+    (annotator,) = statistics["annotators"]
+    assert annotator["email"] == "timed@example.com"
+    assert annotator["segments"] == 2
+    assert annotator["markings"] == 4
+    # Gaps of 1, 2, 1, 1 and 2 minutes are active; the 55 minute gap is idle.
+    assert annotator["activeSeconds"] == 420
+    assert annotator["idleSeconds"] == 3300
+    assert annotator["longestGapSeconds"] == 3300
+    assert annotator["sessions"] == 2
+    assert annotator["secondsPerSegment"] == 210
+    assert annotator["markingsPerHour"] == pytest.approx(4 * 3600 / 420)
+    assert annotator["firstActivity"] == _at(0).isoformat()
+    assert annotator["lastActivity"] == _at(62).isoformat()
+    assert statistics["overall"]["activeSeconds"] == 420
+
+
+def test_evaluation_throughput_time_range(timed_evaluation: Evaluation) -> None:
+    statistics = evaluation_throughput(timed_evaluation.id, start=_at(30))
+    (annotator,) = statistics["annotators"]
+    assert (annotator["segments"], annotator["markings"]) == (1, 1)
+    assert annotator["activeSeconds"] == 120
+
+    generous = evaluation_throughput(timed_evaluation.id, idle_seconds=3600)
+    assert generous["annotators"][0]["sessions"] == 1
+
+    empty = evaluation_throughput(timed_evaluation.id, end=_at(0))
+    assert empty["annotators"] == []
+    assert empty["overall"]["secondsPerSegment"] is None
+
+
+def test_throughput_endpoint(
+    auth_client: tuple[FlaskClient, User], timed_evaluation: Evaluation
+) -> None:
+    client, _ = auth_client
+    url = f"/api/evaluations/{timed_evaluation.id}/throughput"
+
+    response = client.get(f"{url}?from={_at(30).isoformat()}&idle=60")
+    assert response.status_code == 200
+    assert response.get_json()["annotators"][0]["idleGaps"] == 1
+    assert client.get(f"{url}?from=yesterday").status_code == 422
+    assert (
+        client.get(f"{url}?from={_at(5).isoformat()}&to={_at(0).isoformat()}")
+    ).status_code == 422
+    assert client.get(f"{url}?idle=0").status_code == 422
+    assert client.get("/api/evaluations/999/throughput").status_code == 404
+
+
+def test_throughput_command(app: Flask, timed_evaluation: Evaluation) -> None:
+    result = app.test_cli_runner().invoke(
+        args=["annotator-throughput", str(timed_evaluation.id), "--to", "2026-10-01"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["annotators"] == []
@@ -0,0 +1,53 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from human_evaluation_tool.tokens import highlight_span, is_valid_span, token_index
+
+
+def _legacy_highlight(text: str, start: int, end: int) -> str:
+    tokens = text.replace("\n", "<br>").split(" ")
+    tokens.insert(start, "<v>")
+    tokens.insert(end + 2, "</v>")
+    return " ".join(tokens)
+
+
+def test_token_index_is_cached() -> None:
+    first = token_index("Line one\nline two")
+
+    assert first == ("Line", "one<br>line", "two")
+    assert token_index("Line one\nline two") is first
+
+
+def test_highlight_span_matches_legacy_insertions() -> None:
+    text = "a bb  c\nd eee"
+    for start in range(-3, 8):
+        for end in range(-3, 8):
+            assert highlight_span(text, start, end) == _legacy_highlight(
+                text, start, end
+            )
+
+
+def test_is_valid_span() -> None:
+    assert is_valid_span("one two three", 0, 2)
+    assert is_valid_span("one two three", 1, 1)
+    assert not is_valid_span("one two three", 2, 1)
+    assert not is_valid_span("one two three", 0, 3)
+    assert not is_valid_span("one two three", -1, 0)
@@ -0,0 +1,164 @@
+"""
+Copyright (C) 2023-2025 Yaraku, Inc.
+
+This file is part of Human Evaluation Tool.
+
+Human Evaluation Tool is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License,
+or (at your option) any later version.
+
+Human Evaluation Tool is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+
+Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+from sqlalchemy import select
+
+from human_evaluation_tool import db
+from human_evaluation_tool.cursors import decode_time_cursor, encode_time_cursor
+from human_evaluation_tool.models import (
+    Annotation,
+    AnnotationSystem,
+    Evaluation,
+    Marking,
+    System,
+    Tombstone,
+    User,
+)
+from human_evaluation_tool.tombstones import prune_tombstones
+
+
+def _tombstones() -> set[tuple[str, int, int]]:
+    rows = db.session.execute(
+        select(Tombstone.entity, Tombstone.entityId, Tombstone.evaluationId)
+    )
+    return {tuple(row) for row in rows}
+
+
+def test_deleting_a_marking_records_a_tombstone(
+    create_marking: Callable[..., Marking],
+) -> None:
+    marking = create_marking()
+    marking_id, evaluation_id = marking.id, marking.annotation.evaluationId
+
+    db.session.delete(marking)
+    db.session.commit()
+
+    assert _tombstones() == {("marking", marking_id, evaluation_id)}
+
+
+def test_cascaded_deletes_record_tombstones(
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    annotation = create_annotation()
+    annotation_system = create_annotation_system(annotation=annotation)
+    marking = create_marking(annotation=annotation, system=annotation_system.system)
+    expected = {
+        ("annotation_system", annotation_system.id, annotation.evaluationId),
+        ("marking", marking.id, annotation.evaluationId),
+    }
+
+    db.session.delete(annotation_system.system)
+    db.session.commit()
+
+    assert _tombstones() == expected
+
+
+def test_deleted_annotations_record_one_tombstone(
+    create_evaluation: Callable[..., Evaluation],
+    create_user: Callable[..., User],
+    create_system: Callable[..., System],
+    create_annotation: Callable[..., Annotation],
+    create_annotation_system: Callable[..., AnnotationSystem],
+    create_marking: Callable[..., Marking],
+) -> None:
+    evaluation = create_evaluation()
+    system = create_system()
+    annotations = [
+        create_annotation(
+            user=create_user(email=f"{name}@example.com"), evaluation=evaluation
+        )
+        for name in ("first", "second")
+    ]
+    for annotation in annotations:
+        create_annotation_system(annotation=annotation, system=system)
+        for _ in range(3):
+            create_marking(annotation=annotation, system=system)
+    expected = {
+        ("annotation", annotation.id, evaluation.id) for annotation in annotations
+    }
+
+    db.session.delete(evaluation)
+    db.session.commit()
+
+    assert _tombstones() == expected
+
+
+def test_moving_an_annotation_tombstones_it_in_the_old_evaluation(
+    create_annotation: Callable[..., Annotation],
+    create_evaluation: Callable[..., Evaluation],
+) -> None:
+    annotation = create_annotation()
+    previous = annotation.evaluationId
+    annotation.evaluationId = create_evaluation(name="Other").id
+    db.session.commit()
+
+    assert _tombstones() == {("annotation", annotation.id, previous)}
+
+
+def test_prune_tombstones_removes_old_entries(
+    create_marking: Callable[..., Marking],
+) -> None:
+    db.session.delete(create_marking())
+    db.session.commit()
+
+    assert prune_tombstones(datetime.now() - timedelta(days=1)) == 0
+    assert prune_tombstones(datetime.now() + timedelta(seconds=1)) == 1
+    assert _tombstones() == set()
+
+
+def test_prune_tombstones_command(
+    app: Flask, create_marking: Callable[..., Marking]
+) -> None:
+    db.session.delete(create_marking())
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["prune-tombstones", "--days", "0"])
+
+    assert result.exit_code == 0
+    assert "Removed 1 tombstones" in result.output
+
+
+def test_time_cursor_round_trip() -> None:
+    moment = datetime(2024, 5, 1, 8, 30, 15, 250)
+
+    assert decode_time_cursor(encode_time_cursor(moment)) == moment
+    assert decode_time_cursor("2024-05-01T08:30:15") == moment.replace(microsecond=0)
+
+
+def test_time_cursor_converts_aware_timestamps_to_local_time() -> None:
+    moment = datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+
+    assert decode_time_cursor(moment.isoformat()) == moment.astimezone().replace(
+        tzinfo=None
+    )
+
+
+@pytest.mark.parametrize("value", ["", "not a cursor", "%%%", "bm9wZQ"])
+def test_time_cursor_rejects_garbage(value: str) -> None:
+    with pytest.raises(ValueError):
+        decode_time_cursor(value)
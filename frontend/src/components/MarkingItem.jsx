@@ -73,8 +73,11 @@ export default function MarkingItem({
       isSource,
       onSuccess: (data) => {
         queryClient.setQueryData(
-          ["annotationMarkings", annotationId],
-          (markings) => [...markings, data],
+          ["annotationBundle", annotationId],
+          (bundle) => ({
+            ...bundle,
+            markings: [...bundle.markings, data],
+          }),
         );
       },
       onError: (_) => {
@@ -84,7 +87,7 @@ export default function MarkingItem({
       },
       onSettled: () => {
         queryClient.invalidateQueries({
-          queryKey: ["annotationMarkings", annotationId],
+          queryKey: ["annotationBundle", annotationId],
         });
       },
     });
@@ -99,8 +102,11 @@ export default function MarkingItem({
       markingId: marking.id,
       onSuccess: () => {
         queryClient.setQueryData(
-          ["annotationMarkings", annotationId],
-          (markings) => markings.filter((m) => m.id !== marking.id),
+          ["annotationBundle", annotationId],
+          (bundle) => ({
+            ...bundle,
+            markings: bundle.markings.filter((m) => m.id !== marking.id),
+          }),
         );
       },
       onError: () => {
@@ -110,7 +116,7 @@ export default function MarkingItem({
       },
       onSettled: () => {
         queryClient.invalidateQueries({
-          queryKey: ["annotationMarkings", annotationId],
+          queryKey: ["annotationBundle", annotationId],
         });
       },
     });
@@ -128,9 +134,10 @@ export default function MarkingItem({
       isSource,
       onSuccess: () => {
         queryClient.setQueryData(
-          ["annotationMarkings", annotationId],
-          (markings) =>
-            markings.map((m) => {
+          ["annotationBundle", annotationId],
+          (bundle) => ({
+            ...bundle,
+            markings: bundle.markings.map((m) => {
               if (m.id === marking.id) {
                 return {
                   ...m,
@@ -141,6 +148,7 @@ export default function MarkingItem({
 
               return m;
             }),
+          }),
         );
       },
       onError: () => {
@@ -150,7 +158,7 @@ export default function MarkingItem({
       },
       onSettled: () => {
         queryClient.invalidateQueries({
-          queryKey: ["annotationMarkings", annotationId],
+          queryKey: ["annotationBundle", annotationId],
         });
       },
     });
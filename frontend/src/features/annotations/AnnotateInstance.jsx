@@ -26,9 +26,7 @@ import Marking from "../../components/Marking";
 import Spinner from "../../components/Spinner";
 import SpinnerMini from "../../components/SpinnerMini";
 import { updateAnnotation as updateAnnotationApi } from "../../services/apiAnnotations";
-import { useAnnotationMarkings } from "./useAnnotationMarkings";
-import { useAnnotationSystems } from "./useAnnotationSystems";
-import { useDocumentBitexts } from "./useDocumentBitexts";
+import { useAnnotationBundle } from "./useAnnotationBundle";
 
 export default function AnnotateInstance({
   containerRef,
@@ -36,16 +34,8 @@ export default function AnnotateInstance({
   done,
   total,
 }) {
-  const { annotationMarkings, isLoading: areMarkingsLoading } =
-    useAnnotationMarkings({
-      id: annotation["id"],
-    });
-  const { annotationSystems, isLoading: areSystemsLoading } =
-    useAnnotationSystems({
-      id: annotation["id"],
-    });
-  const { documentBitexts, isLoading: areBitextsLoading } = useDocumentBitexts({
-    id: annotation["bitext"]["documentId"],
+  const { annotationBundle, isLoading: isBundleLoading } = useAnnotationBundle({
+    id: annotation["id"],
   });
   const queryClient = useQueryClient();
 
@@ -91,7 +81,7 @@ export default function AnnotateInstance({
     });
   }
 
-  if (areBitextsLoading || areMarkingsLoading || areSystemsLoading) {
+  if (isBundleLoading) {
     return (
       <div>
         <Spinner />
@@ -99,6 +89,12 @@ export default function AnnotateInstance({
     );
   }
 
+  const {
+    bitexts: documentBitexts,
+    markings: annotationMarkings,
+    systems: annotationSystems,
+  } = annotationBundle;
+
   return (
     <div className="container">
       <div className="tw-mb-6 tw-flex tw-justify-between">
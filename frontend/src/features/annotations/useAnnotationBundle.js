@@ -1,5 +1,5 @@
 /*
- * Copyright (C) 2023 Yaraku, Inc.
+ * Copyright (C) 2023-2025 Yaraku, Inc.
  *
  * This file is part of Human Evaluation Tool.
  *
@@ -16,22 +16,22 @@
  * You should have received a copy of the GNU General Public License along with
  * Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
  *
- * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
+ * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
  */
 
 import { useQuery } from "@tanstack/react-query";
 
-import { getAnnotationSystems } from "../../services/apiSystems";
+import { getAnnotationBundle } from "../../services/apiAnnotations";
 
-export function useAnnotationSystems({ id }) {
+export function useAnnotationBundle({ id }) {
   const {
-    data: annotationSystems,
+    data: annotationBundle,
     error,
     isLoading,
   } = useQuery({
-    queryKey: ["annotationSystems", id],
-    queryFn: () => getAnnotationSystems({ id }),
+    queryKey: ["annotationBundle", id],
+    queryFn: () => getAnnotationBundle({ id }),
   });
 
-  return { annotationSystems, error, isLoading };
+  return { annotationBundle, error, isLoading };
 }
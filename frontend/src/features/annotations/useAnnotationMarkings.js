@@ -19,28 +19,14 @@
  * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
  */
 
-import { useMutation, useQuery } from "@tanstack/react-query";
+import { useMutation } from "@tanstack/react-query";
 
 import {
   createAnnotationMarking as createAnnotationMarkingApi,
   deleteAnnotationMarking as deleteAnnotationMarkingApi,
-  getAnnotationMarkings as getAnnotationMarkingsApi,
   updateAnnotationMarking as updateAnnotationMarkingApi,
 } from "../../services/apiMarkings";
 
-export function useAnnotationMarkings({ id }) {
-  const {
-    data: annotationMarkings,
-    error,
-    isLoading,
-  } = useQuery({
-    queryKey: ["annotationMarkings", id],
-    queryFn: () => getAnnotationMarkingsApi({ id }),
-  });
-
-  return { annotationMarkings, error, isLoading };
-}
-
 export function useCreateAnnotationMarking() {
   const { mutate: createAnnotationMarking, isLoading } = useMutation({
     mutationFn: (data) => createAnnotationMarkingApi(data),
@@ -19,16 +19,23 @@
  * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
  */
 
+import { fetchAllPages } from "./pagination";
 import { getCookie } from "./utils";
 
 export async function getAnnotations() {
-  const response = await fetch("/api/annotations", {
+  return await fetchAllPages("/api/annotations", "Get annotations");
+}
+
+export async function getAnnotationBundle({ id }) {
+  const response = await fetch(`/api/annotations/${id}/bundle`, {
     method: "GET",
     credentials: "include",
   });
 
   if (!response.ok) {
-    throw new Error(`Get annotations failed: ${response.status}`);
+    throw new Error(
+      `Get bundle for annotation ${id} failed: ${response.status}`,
+    );
   }
 
   return await response.json();
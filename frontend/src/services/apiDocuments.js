@@ -19,30 +19,8 @@
  * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, August 2023
  */
 
-export async function getDocuments() {
-  const response = await fetch("/api/documents", {
-    method: "GET",
-    credentials: "include",
-  });
-
-  if (!response.ok) {
-    throw new Error(`Get documents failed: ${response.status}`);
-  }
-
-  return await response.json();
-}
+import { fetchAllPages } from "./pagination";
 
-export async function getDocumentBitexts({ id }) {
-  const response = await fetch(`/api/documents/${id}/bitexts`, {
-    method: "GET",
-    credentials: "include",
-  });
-
-  if (!response.ok) {
-    throw new Error(
-      `Get bitexts for document ${id} failed: ${response.status}`,
-    );
-  }
-
-  return await response.json();
+export async function getDocuments() {
+  return await fetchAllPages("/api/documents", "Get documents");
 }
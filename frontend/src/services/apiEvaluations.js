@@ -19,32 +19,17 @@
  * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, September 2023
  */
 
-export async function getEvaluations() {
-  const response = await fetch("/api/evaluations", {
-    method: "GET",
-    credentials: "include",
-  });
-
-  if (!response.ok) {
-    throw new Error(`Get evaluations failed: ${response.status}`);
-  }
+import { fetchAllPages } from "./pagination";
 
-  return await response.json();
+export async function getEvaluations() {
+  return await fetchAllPages("/api/evaluations", "Get evaluations");
 }
 
 export async function getEvaluationAnnotations({ id }) {
-  const response = await fetch(`/api/evaluations/${id}/annotations`, {
-    method: "GET",
-    credentials: "include",
-  });
-
-  if (!response.ok) {
-    throw new Error(
-      `Get annotations for evaluation ${id} failed: ${response.status}`,
-    );
-  }
-
-  return await response.json();
+  return await fetchAllPages(
+    `/api/evaluations/${id}/annotations`,
+    `Get annotations for evaluation ${id}`,
+  );
 }
 
 export async function getEvaluationResults({ id }) {
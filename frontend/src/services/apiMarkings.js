@@ -21,21 +21,6 @@
 
 import { getCookie } from "./utils";
 
-export async function getAnnotationMarkings({ id }) {
-  const response = await fetch(`/api/annotations/${id}/markings`, {
-    method: "GET",
-    credentials: "include",
-  });
-
-  if (!response.ok) {
-    throw new Error(
-      `Get markings for annotation ${id} failed: ${response.status}`,
-    );
-  }
-
-  return await response.json();
-}
-
 export async function createAnnotationMarking({
   annotationId,
   systemId,
@@ -0,0 +1,45 @@
+/*
+ * Copyright (C) 2023 Yaraku, Inc.
+ *
+ * This file is part of Human Evaluation Tool.
+ *
+ * Human Evaluation Tool is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by the
+ * Free Software Foundation, either version 3 of the License,
+ * or (at your option) any later version.
+ *
+ * Human Evaluation Tool is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+ * or FITNESS FOR A PARTICULAR PURPOSE.
+ * See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * Human Evaluation Tool. If not, see <https://www.gnu.org/licenses/>.
+ *
+ * Written by Giovanni G. De Giacomo <giovanni@yaraku.com>, October 2026
+ */
+
+// Collection endpoints return one page at a time and announce the next page
+// through the X-Next-Cursor header. Follow it until the collection ends.
+export async function fetchAllPages(url, description) {
+  const separator = url.includes("?") ? "&" : "?";
+  const items = [];
+  let pageUrl = url;
+
+  while (pageUrl) {
+    const response = await fetch(pageUrl, {
+      method: "GET",
+      credentials: "include",
+    });
+
+    if (!response.ok) {
+      throw new Error(`${description} failed: ${response.status}`);
+    }
+
+    items.push(...(await response.json()));
+    const cursor = response.headers.get("X-Next-Cursor");
+    pageUrl = cursor ? `${url}${separator}after=${cursor}` : null;
+  }
+
+  return items;
+}